@@ -0,0 +1,282 @@
+"""
+Cache Module
+Contains a bounded LRU cache for loan payments and amortization schedules
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+from NumericalMethods.loan_calculations import (calculate_monthly_payment, generate_amortization_schedule,
+                                                generate_amortization_schedule_batch)
+from NumericalMethods.schedule import AmortizationSchedule
+from NumericalMethods.fixed_point import generate_amortization_schedule_cents
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by entry count and memory.
+
+    Every entry carries a size in bytes; the least recently used entries are
+    evicted until both the entry limit and the byte budget are respected.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Look up a key and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or default
+        """
+        with self._lock:
+            try:
+                value, size = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, size=None):
+        """
+        Store a value, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            size (int): Size of the value in bytes (estimated when omitted)
+        """
+        size = _estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, size=None):
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Args:
+            key: Cache key
+            compute (callable): Called with no arguments to produce the value
+            size (callable): Optional function returning the value's size in bytes
+
+        Returns:
+            The cached or freshly computed value
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value, size(value) if size else None)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Return cache counters.
+
+        Returns:
+            dict: 'hits', 'misses', 'evictions', 'entries', 'bytes' and 'hit_rate'
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _estimate_size(value):
+    if isinstance(value, AmortizationSchedule):
+        return value.nbytes
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+def make_loan_key(principal, annual_rate, years, payments_per_year=12, day_count='nominal'):
+    """
+    Build a normalized cache key for a loan.
+
+    Principal is rounded to cents and the rate to 1e-6 percent, and the term
+    is expressed as a whole number of payments, so equivalent inputs typed
+    differently (250000 vs 250000.00, 30 years vs 30.0) share an entry.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate as percentage
+        years (float): Loan term in years
+        payments_per_year (int): Payment frequency
+        day_count (str): Interest accrual convention
+
+    Returns:
+        tuple: Hashable key
+    """
+    return (round(float(principal), 2), round(float(annual_rate), 6),
+            int(round(float(years) * payments_per_year)), int(payments_per_year), day_count)
+
+
+payment_cache = LRUCache(max_entries=100000, max_bytes=16 * 1024 * 1024)
+schedule_cache = LRUCache(max_entries=512, max_bytes=64 * 1024 * 1024)
+
+
+def cached_monthly_payment(principal, annual_rate, years, payments_per_year=12, day_count='nominal'):
+    """
+    calculate_monthly_payment backed by the shared payment cache.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate as percentage
+        years (float): Loan term in years
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention
+
+    Returns:
+        float: Monthly payment amount
+    """
+    key = make_loan_key(principal, annual_rate, years, payments_per_year, day_count)
+    return payment_cache.get_or_compute(
+        key, lambda: calculate_monthly_payment(principal, annual_rate, years, payments_per_year, day_count),
+        size=lambda value: 64)
+
+
+def cached_amortization_schedule(principal, annual_rate, years, rounding=None, payments_per_year=12,
+                                 day_count='nominal'):
+    """
+    generate_amortization_schedule backed by the shared schedule cache.
+
+    Schedules are read-only, so the cached object is returned directly.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate as percentage
+        years (float): Loan term in years
+        rounding (str): None for the exact floating-point engine, or
+            'half_even'/'half_up' for the integer-cents engine
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention
+
+    Returns:
+        AmortizationSchedule: Column-oriented schedule
+    """
+    key = make_loan_key(principal, annual_rate, years, payments_per_year, day_count) + (rounding,)
+    if rounding is None:
+        compute = lambda: generate_amortization_schedule(principal, annual_rate, years, payments_per_year, day_count)
+    else:
+        compute = lambda: generate_amortization_schedule_cents(principal, annual_rate, years, rounding,
+                                                               payments_per_year, day_count)
+    return schedule_cache.get_or_compute(key, compute)
+
+
+def cached_amortization_schedule_batch(principals, annual_rates, years, payments_per_year=12, day_count='nominal'):
+    """
+    generate_amortization_schedule_batch with duplicate loans computed once.
+
+    The batch is de-duplicated on the normalized loan key; unique loans are
+    looked up in the shared schedule cache and only the misses are computed,
+    in a single vectorized pass.
+
+    Args:
+        principals (array-like): Loan amounts
+        annual_rates (array-like): Annual interest rates as percentages
+        years (array-like): Loan terms in years
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention
+
+    Returns:
+        dict: Same layout as generate_amortization_schedule_batch
+    """
+    principals, annual_rates, years = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principals, dtype=float)),
+        np.atleast_1d(np.asarray(annual_rates, dtype=float)),
+        np.atleast_1d(np.asarray(years, dtype=float)))
+
+    loans = np.column_stack([principals, annual_rates, years])
+    unique_loans, first_rows, inverse = np.unique(loans, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    if len(unique_loans) > schedule_cache.max_entries:
+        # Too many distinct loans to benefit from the cache: de-duplicate only
+        unique_batch = generate_amortization_schedule_batch(*unique_loans.T, payments_per_year, day_count)
+        return _expand_batch(unique_batch, inverse)
+
+    unique_keys = [make_loan_key(*loan, payments_per_year, day_count) + (None,) for loan in unique_loans.tolist()]
+
+    schedules = [schedule_cache.get(key) for key in unique_keys]
+    missing = [i for i, schedule in enumerate(schedules) if schedule is None]
+    if missing:
+        rows = first_rows[missing]
+        computed = generate_amortization_schedule_batch(principals[rows], annual_rates[rows], years[rows],
+                                                        payments_per_year, day_count)
+        for position, i in enumerate(missing):
+            schedule = AmortizationSchedule.from_batch(computed, position).copy()
+            schedule_cache.put(unique_keys[i], schedule)
+            schedules[i] = schedule
+
+    num_payments = np.array([len(schedule) for schedule in schedules], dtype=np.int64)
+    max_payments = int(num_payments.max()) if len(num_payments) else 0
+    unique_batch = {'month': np.arange(1, max_payments + 1), 'num_payments': num_payments}
+    for column in ('payment', 'interest', 'principal', 'balance'):
+        values = np.zeros((len(schedules), max_payments))
+        for i, schedule in enumerate(schedules):
+            values[i, :len(schedule)] = schedule[column]
+        unique_batch[column] = values
+
+    return _expand_batch(unique_batch, inverse)
+
+
+def _expand_batch(unique_batch, inverse):
+    """Map a batch of unique loans back onto the original (duplicated) rows"""
+    batch = {'month': unique_batch['month'], 'num_payments': unique_batch['num_payments'][inverse]}
+    for column in ('payment', 'interest', 'principal', 'balance'):
+        batch[column] = unique_batch[column][inverse]
+    return batch
+
+
+def cache_stats():
+    """
+    Return the counters of the shared caches.
+
+    Returns:
+        dict: {'payment': {...}, 'schedule': {...}} as returned by LRUCache.stats
+    """
+    return {'payment': payment_cache.stats(), 'schedule': schedule_cache.stats()}
@@ -0,0 +1,205 @@
+"""
+Fixed-Point Module
+Contains an integer-cents amortization engine that matches how servicing systems book payments
+"""
+
+from math import gcd
+import numpy as np
+from NumericalMethods.loan_calculations import (DAY_COUNT_BASES, PERIOD_DAYS, calculate_monthly_payment_batch,
+                                                count_payments, periodic_rate)
+from NumericalMethods.schedule import AmortizationSchedule
+from NumericalMethods.profiling import timed
+
+ROUNDING_MODES = {
+    'half_even': "Banker's rounding (round half to even)",
+    'half_up': "Round half up (away from zero)",
+}
+
+# Annual rates are taken to this many decimal places of a percent when
+# interest is computed exactly (5.5% -> 5500000 / 10**6)
+RATE_DECIMALS = 6
+
+
+def round_half(values, rounding='half_even'):
+    """
+    Round an array of fractional cents to whole cents.
+
+    Args:
+        values (array-like): Amounts in cents (may have fractional parts)
+        rounding (str): 'half_even' (banker's) or 'half_up' (half away from zero)
+
+    Returns:
+        numpy.ndarray: Rounded amounts as int64 cents
+    """
+    values = np.asarray(values, dtype=float)
+    if rounding == 'half_even':
+        rounded = np.rint(values)
+    elif rounding == 'half_up':
+        rounded = np.copysign(np.floor(np.abs(values) + 0.5), values)
+    else:
+        raise ValueError(f"Unknown rounding mode: {rounding!r}")
+    return rounded.astype(np.int64)
+
+
+def divide_half(numerators, denominator, rounding='half_even'):
+    """
+    Exact integer division rounded to the nearest integer.
+
+    Args:
+        numerators (numpy.ndarray): Non-negative integer dividends (int64 or
+            object arrays of Python ints)
+        denominator (int or numpy.ndarray): Positive integer divisors
+        rounding (str): 'half_even' (banker's) or 'half_up' (half away from zero)
+
+    Returns:
+        numpy.ndarray: Rounded quotients
+    """
+    quotients, remainders = numerators // denominator, numerators % denominator
+    twice = remainders * 2
+    if rounding == 'half_even':
+        round_up = (twice > denominator) | ((twice == denominator) & (quotients % 2 == 1))
+    elif rounding == 'half_up':
+        round_up = twice >= denominator
+    else:
+        raise ValueError(f"Unknown rounding mode: {rounding!r}")
+    return quotients + round_up
+
+
+def periodic_rate_fraction(annual_rates, payments_per_year=12, day_count='nominal'):
+    """
+    Periodic rates as exact integer fractions.
+
+    The annual rate is read to RATE_DECIMALS places of a percent, so the
+    fraction is what the decimal rate a user typed means, not its float.
+
+    Args:
+        annual_rates (array-like): Annual interest rates as percentages
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        tuple: (numerators, denominator) - int64 array and a Python int, with
+            numerators / denominator == periodic_rate(annual_rates, ...)
+    """
+    periodic_rate(1.0, payments_per_year, day_count)  # validates day_count
+    basis = DAY_COUNT_BASES[day_count]
+    rate_units = np.rint(np.asarray(annual_rates, dtype=float) * 10 ** RATE_DECIMALS).astype(np.int64)
+    # rate / 100 per year, times the fraction of a year in one period
+    scale, denominator = 1, 100 * 10 ** RATE_DECIMALS * payments_per_year
+    if basis is not None:
+        # period_days as a fraction: whole days, or 365 / payments_per_year
+        days, per = (PERIOD_DAYS[payments_per_year], 1) if payments_per_year in PERIOD_DAYS else (365, payments_per_year)
+        scale, denominator = days, 100 * 10 ** RATE_DECIMALS * per * basis
+    common = gcd(scale, denominator)
+    return rate_units * (scale // common), denominator // common
+
+
+def to_cents(amounts, rounding='half_even'):
+    """
+    Convert dollar amounts to int64 cents.
+
+    Args:
+        amounts (array-like): Amounts in dollars
+        rounding (str): 'half_even' or 'half_up'
+
+    Returns:
+        numpy.ndarray: Amounts in cents
+    """
+    return round_half(np.asarray(amounts, dtype=float) * 100, rounding)
+
+
+@timed()
+def generate_amortization_schedule_cents_batch(principals, annual_rates, years, rounding='half_even',
+                                               payments_per_year=12, day_count='nominal'):
+    """
+    Generate cent-exact amortization schedules for many loans.
+
+    Balances, payments and interest are int64 cents. Each month's interest is
+    computed as an exact fraction of cents and rounded with the chosen rule,
+    and the final payment is trued up to clear the remaining balance exactly.
+    The recurrence runs once per month but every step is a single array
+    operation across all loans.
+
+    Args:
+        principals (array-like): Loan amounts in dollars
+        annual_rates (array-like): Annual interest rates as percentages
+        years (array-like): Loan terms in years
+        rounding (str): 'half_even' (banker's) or 'half_up'
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        dict: Same layout as generate_amortization_schedule_batch, with the
+            'payment', 'interest', 'principal' and 'balance' arrays in int64 cents
+    """
+    principals, annual_rates, years = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principals, dtype=float)),
+        np.atleast_1d(np.asarray(annual_rates, dtype=float)),
+        np.atleast_1d(np.asarray(years, dtype=float)))
+
+    rate_numerators, rate_denominator = periodic_rate_fraction(annual_rates, payments_per_year, day_count)
+    num_payments = count_payments(years, payments_per_year)
+    level_payments = to_cents(calculate_monthly_payment_batch(principals, annual_rates, years, payments_per_year,
+                                                              day_count), rounding)
+
+    n_loans = len(principals)
+    max_payments = int(num_payments.max()) if n_loans else 0
+    payment = np.zeros((n_loans, max_payments), dtype=np.int64)
+    interest = np.zeros((n_loans, max_payments), dtype=np.int64)
+    principal_paid = np.zeros((n_loans, max_payments), dtype=np.int64)
+    balance = np.zeros((n_loans, max_payments), dtype=np.int64)
+
+    current = to_cents(principals, rounding)
+    if n_loans and int(current.max()) * int(rate_numerators.max()) >= 2 ** 62:
+        # Balance x rate numerator would overflow int64: fall back to Python ints
+        current, rate_numerators = current.astype(object), rate_numerators.astype(object)
+    for month in range(max_payments):
+        active = month < num_payments
+        final = month == num_payments - 1
+
+        # Interest is balance x rate in exact integers, so ties round by the rule, not by float noise
+        month_interest = divide_half(current * rate_numerators, rate_denominator, rounding)
+        # Principal never exceeds what is owed, and the last payment clears the balance
+        month_principal = np.minimum(level_payments - month_interest, current)
+        month_principal = np.where(final, current, month_principal)
+        month_principal = np.where(active, month_principal, 0)
+        month_interest = np.where(active, month_interest, 0)
+
+        current = current - month_principal
+        payment[:, month] = month_principal + month_interest
+        interest[:, month] = month_interest
+        principal_paid[:, month] = month_principal
+        balance[:, month] = np.where(active, current, 0)
+
+    return {
+        'month': np.arange(1, max_payments + 1),
+        'payment': payment,
+        'interest': interest,
+        'principal': principal_paid,
+        'balance': balance,
+        'num_payments': num_payments
+    }
+
+
+@timed()
+def generate_amortization_schedule_cents(principal, annual_rate, years, rounding='half_even', payments_per_year=12,
+                                         day_count='nominal'):
+    """
+    Generate a cent-exact amortization schedule for one loan.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate as percentage
+        years (float): Loan term in years
+        rounding (str): 'half_even' (banker's) or 'half_up'
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        AmortizationSchedule: Schedule in dollars, every value a whole number of cents
+    """
+    batch = generate_amortization_schedule_cents_batch([principal], [annual_rate], [years], rounding,
+                                                       payments_per_year, day_count)
+    n = int(batch['num_payments'][0])
+    return AmortizationSchedule(batch['month'][:n],
+                                *(batch[column][0, :n] / 100 for column in ('payment', 'interest', 'principal', 'balance')))
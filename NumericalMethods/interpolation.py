@@ -1,10 +1,17 @@
 """
 Interpolation Module
-Contains functions for polynomial interpolation using Newton's Divided Difference method
+Contains functions for polynomial interpolation using Newton's Divided Difference method,
+plus barycentric Lagrange and cubic spline engines for larger point sets
 """
 
+import time
 import numpy as np
+from NumericalMethods.profiling import timed
 
+# Up to this many points, newton_divided_difference_interpolation runs on plain floats
+SMALL_INTERPOLATION_POINTS = 40
+
+@timed()
 def newton_divided_difference_interpolation(months, balances, target_month):
     """
     Perform polynomial interpolation using Newton's Divided Difference method.
@@ -17,32 +24,56 @@ def newton_divided_difference_interpolation(months, balances, target_month):
     Returns:
         float: Interpolated balance value
     """
-    months = np.array(months, dtype=float)
-    balances = np.array(balances, dtype=float)
+    if len(months) == 0:
+        raise ValueError("No interpolation points have been added")
+    if len(months) <= SMALL_INTERPOLATION_POINTS and np.ndim(target_month) == 0:
+        # Few points: plain floats beat array overhead, and the coefficients
+        # are updated in place instead of building the whole table
+        x = [float(month) for month in months]
+        coefficients = [float(balance) for balance in balances]
+        n = len(x)
+        try:
+            for j in range(1, n):
+                for i in range(n - 1, j - 1, -1):
+                    coefficients[i] = (coefficients[i] - coefficients[i - 1]) / (x[i] - x[i - j])
+        except ZeroDivisionError:
+            raise ValueError("Duplicate months in interpolation points") from None
+        target = float(target_month)
+        result = coefficients[-1]
+        for k in range(n - 2, -1, -1):
+            result = result * (target - x[k]) + coefficients[k]
+        return result
 
-    n = len(months)
-    dd_table = np.zeros((n, n))
-    dd_table[:, 0] = balances
+    months = np.asarray(months, dtype=float)
+    # Sorted input (the usual case) proves the months are distinct without np.unique
+    if np.any(np.diff(months) <= 0) and len(np.unique(months)) != len(months):
+        raise ValueError("Duplicate months in interpolation points")
+    return evaluate_newton_polynomial(newton_coefficients(months, balances), months, target_month)
 
-    # Build divided difference table
-    for j in range(1, n):
-        for i in range(n - j):
-            dd_table[i, j] = (dd_table[i + 1, j - 1] - dd_table[i, j - 1]) / (months[i + j] - months[i])
 
-    # Calculate interpolated value
-    result = dd_table[0, 0]
-    term = 1
-    for i in range(1, n):
-        term *= (target_month - months[i - 1])
-        result += dd_table[0, i] * term
+def _divided_difference_columns(months, balances):
+    """
+    Yield each order of divided differences as a single array.
 
-    return result
+    Order j holds f[x_i, ..., x_{i+j}] for every i, shape (..., n - j).
+    Leading axes are treated as a batch of independent point sets.
+    """
+    months = np.asarray(months, dtype=float)
+    differences = np.asarray(balances, dtype=float)
+    yield differences
+    for j in range(1, months.shape[-1]):
+        differences = (differences[..., 1:] - differences[..., :-1]) / (months[..., j:] - months[..., :-j])
+        yield differences
 
 
+@timed()
 def get_divided_difference_table(months, balances):
     """
     Generate the divided difference table for Newton's interpolation method.
 
+    Each column is computed as one array expression. Passing 2-D inputs of
+    shape (batch, n) builds every table at once as a (batch, n, n) array.
+
     Args:
         months (list): List of month values
         balances (list): List of balance values
@@ -50,20 +81,656 @@ def get_divided_difference_table(months, balances):
     Returns:
         numpy.ndarray: Divided difference table
     """
-    months = np.array(months, dtype=float)
-    balances = np.array(balances, dtype=float)
+    months = np.asarray(months, dtype=float)
+    n = months.shape[-1]
 
-    n = len(months)
-    dd_table = np.zeros((n, n))
-    dd_table[:, 0] = balances
+    dd_table = np.zeros(months.shape + (n,))
+    for j, column in enumerate(_divided_difference_columns(months, balances)):
+        dd_table[..., :n - j, j] = column
+
+    return dd_table
+
+
+@timed()
+def get_divided_difference_table_packed(months, balances):
+    """
+    Generate divided difference tables storing only the upper triangle.
 
-    for j in range(1, n):
-        for i in range(n - j):
-            dd_table[i, j] = (dd_table[i + 1, j - 1] - dd_table[i, j - 1]) / (months[i + j] - months[i])
+    Columns are stored one after another (column j has n - j entries), so a
+    table takes n(n+1)/2 values instead of n^2. Use packed_table_offsets to
+    locate a column, or unpack_divided_difference_table to expand it.
 
+    Args:
+        months (array-like): Month values, shape (n,) or (batch, n)
+        balances (array-like): Balance values with the same shape as months
+
+    Returns:
+        numpy.ndarray: Packed tables, shape (n(n+1)/2,) or (batch, n(n+1)/2)
+    """
+    return np.concatenate(list(_divided_difference_columns(months, balances)), axis=-1)
+
+
+def packed_table_offsets(n):
+    """
+    Return where each column starts in a packed divided difference table.
+
+    Args:
+        n (int): Number of data points
+
+    Returns:
+        numpy.ndarray: Start offset of columns 0..n (the last entry is the total size)
+    """
+    lengths = np.arange(n, 0, -1)
+    return np.concatenate(([0], np.cumsum(lengths)))
+
+
+def unpack_divided_difference_table(packed, n):
+    """
+    Expand packed divided difference tables into full square tables.
+
+    Args:
+        packed (numpy.ndarray): Packed tables, shape (..., n(n+1)/2)
+        n (int): Number of data points
+
+    Returns:
+        numpy.ndarray: Tables of shape (..., n, n) with zeros below the anti-diagonal
+    """
+    packed = np.asarray(packed, dtype=float)
+    offsets = packed_table_offsets(n)
+    dd_table = np.zeros(packed.shape[:-1] + (n, n))
+    for j in range(n):
+        dd_table[..., :n - j, j] = packed[..., offsets[j]:offsets[j + 1]]
     return dd_table
 
 
+@timed()
+def newton_coefficients(months, balances):
+    """
+    Compute Newton coefficients f[x0], f[x0,x1], ... for one or many point sets.
+
+    Each order of divided differences is computed as one array expression,
+    so a batch of point sets costs n array operations in total.
+
+    Args:
+        months (array-like): Month values, shape (n,) or (batch, n)
+        balances (array-like): Balance values with the same shape as months
+
+    Returns:
+        numpy.ndarray: Coefficients with the same shape as months
+    """
+    months = np.asarray(months, dtype=float)
+    coefficients = np.empty(months.shape)
+    for j, column in enumerate(_divided_difference_columns(months, balances)):
+        coefficients[..., j] = column[..., 0]
+
+    return coefficients
+
+
+def evaluate_newton_polynomial(coefficients, months, targets):
+    """
+    Evaluate Newton-form polynomials at many targets using nested multiplication.
+
+    Args:
+        coefficients (array-like): Newton coefficients, shape (n,) or (batch, n)
+        months (array-like): Interpolation nodes with the same shape as coefficients
+        targets (float or array-like): Target months, shape (m,) shared by every
+            polynomial, or (batch, m) for per-polynomial targets
+
+    Returns:
+        float or numpy.ndarray: Interpolated values, shape (m,) for a single
+            polynomial or (batch, m) for a batch
+    """
+    # Append a target axis to the per-polynomial arrays so they broadcast
+    # against every target at once
+    coefficients = np.asarray(coefficients, dtype=float)[..., None]
+    months = np.asarray(months, dtype=float)[..., None]
+    targets = np.asarray(targets, dtype=float)
+    scalar_target = targets.ndim == 0
+    targets = np.atleast_1d(targets)
+    n = coefficients.shape[-2]
+
+    result = np.empty(np.broadcast_shapes(coefficients.shape[:-2] + (1,), targets.shape))
+    result[...] = coefficients[..., n - 1, :]
+    for k in range(n - 2, -1, -1):
+        result *= targets - months[..., k, :]
+        result += coefficients[..., k, :]
+
+    if scalar_target:
+        result = result[..., 0]
+    return float(result) if result.ndim == 0 else result
+
+
+@timed()
+def newton_interpolate_batch(months, balances, targets):
+    """
+    Interpolate many point sets at many target months in vectorized form.
+
+    Args:
+        months (array-like): Month values, shape (batch, n)
+        balances (array-like): Balance values, shape (batch, n)
+        targets (array-like): Target months, shape (m,) or (batch, m)
+
+    Returns:
+        numpy.ndarray: Interpolated balances, shape (batch, m)
+    """
+    months = np.asarray(months, dtype=float)
+    return evaluate_newton_polynomial(newton_coefficients(months, balances), months, targets)
+
+
+class NewtonInterpolator:
+    """
+    Stateful Newton divided-difference interpolator.
+
+    The divided difference table is built once and kept. Adding a point only
+    appends one new diagonal to the table (O(n)), and evaluating new targets
+    uses the nested (Horner-style) Newton form (O(n) per target), so repeated
+    what-if queries never rebuild the table.
+    """
+    method_name = "Newton's Divided Difference"
+
+    def __init__(self, months=(), balances=()):
+        months = np.array(months, dtype=float)
+        if len(np.unique(months)) != len(months):
+            raise ValueError("Duplicate months in interpolation points")
+        # Initial points are tabulated column-wise in one pass
+        self._x = months
+        self._table = get_divided_difference_table(months, balances) if len(months) else np.zeros((0, 0))
+        self._n = len(months)
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def nodes(self):
+        """numpy.ndarray: Month values (x-coordinates) in insertion order"""
+        return self._x[:self._n]
+
+    @property
+    def values(self):
+        """numpy.ndarray: Balance values (y-coordinates) in insertion order"""
+        return self._table[:self._n, 0]
+
+    @property
+    def coefficients(self):
+        """numpy.ndarray: Newton coefficients f[x0], f[x0,x1], ..."""
+        return self._table[0, :self._n]
+
+    @property
+    def table(self):
+        """numpy.ndarray: Divided difference table (view of the cached table)"""
+        return self._table[:self._n, :self._n]
+
+    def _grow(self):
+        capacity = max(8, 2 * len(self._x))
+        x = np.zeros(capacity)
+        x[:self._n] = self.nodes
+        table = np.zeros((capacity, capacity))
+        table[:self._n, :self._n] = self.table
+        self._x, self._table = x, table
+
+    def add_point(self, month, balance):
+        """
+        Add a data point by extending the table with one new diagonal.
+
+        Args:
+            month (float): Month value of the new point
+            balance (float): Balance value of the new point
+        """
+        month = float(month)
+        n = self._n
+        if np.any(self.nodes == month):
+            raise ValueError(f"Duplicate month {month:g} in interpolation points")
+        if n == len(self._x):
+            self._grow()
+
+        x, table = self._x, self._table
+        x[n] = month
+        table[n, 0] = balance
+        for j in range(1, n + 1):
+            i = n - j
+            table[i, j] = (table[i + 1, j - 1] - table[i, j - 1]) / (month - x[i])
+        self._n = n + 1
+
+    def evaluate(self, target_month):
+        """
+        Evaluate the interpolating polynomial using nested multiplication.
+
+        Args:
+            target_month (float or array-like): Month(s) to interpolate
+
+        Returns:
+            float or numpy.ndarray: Interpolated balance value(s)
+        """
+        if self._n == 0:
+            raise ValueError("No interpolation points have been added")
+        return evaluate_newton_polynomial(self.coefficients, self.nodes, target_month)
+
+    __call__ = evaluate
+
+
+class BarycentricInterpolator:
+    """
+    Polynomial interpolation in barycentric Lagrange form.
+
+    The barycentric weights are computed once (O(n^2), vectorized); each
+    target then costs O(n). This is the same interpolating polynomial as
+    Newton's method but evaluated in a numerically stable form, so it holds
+    up better for large point sets. It does not remove Runge oscillation;
+    use the cubic spline engine for that.
+    """
+    method_name = "Barycentric Lagrange"
+
+    def __init__(self, months=(), balances=()):
+        self._x = np.array(months, dtype=float)
+        self._y = np.array(balances, dtype=float)
+        if len(np.unique(self._x)) != len(self._x):
+            raise ValueError("Duplicate months in interpolation points")
+        self._weights = _barycentric_weights(self._x)
+
+    def __len__(self):
+        return len(self._x)
+
+    @property
+    def nodes(self):
+        return self._x
+
+    @property
+    def values(self):
+        return self._y
+
+    @property
+    def weights(self):
+        return self._weights
+
+    def add_point(self, month, balance):
+        """
+        Add a data point, updating the existing weights in O(n).
+
+        Args:
+            month (float): Month value of the new point
+            balance (float): Balance value of the new point
+        """
+        month = float(month)
+        if np.any(self._x == month):
+            raise ValueError(f"Duplicate month {month:g} in interpolation points")
+        scale = _node_scale(np.append(self._x, month))
+        # Rescale so the weights stay consistent with the widened node range
+        old_scale = _node_scale(self._x) if len(self._x) else scale
+        differences = (self._x - month) / scale
+        weights = self._weights * (scale / old_scale) ** max(len(self._x) - 1, 0) / differences
+        new_weight = 1.0 / np.prod(-differences) if len(differences) else 1.0
+        self._x = np.append(self._x, month)
+        self._y = np.append(self._y, float(balance))
+        self._weights = np.append(weights, new_weight)
+
+    def evaluate(self, target_month):
+        """
+        Evaluate the interpolating polynomial with the second barycentric formula.
+
+        Args:
+            target_month (float or array-like): Month(s) to interpolate
+
+        Returns:
+            float or numpy.ndarray: Interpolated balance value(s)
+        """
+        if len(self._x) == 0:
+            raise ValueError("No interpolation points have been added")
+        return _barycentric_evaluate(self._x, self._y, self._weights, target_month)
+
+    __call__ = evaluate
+
+
+def _node_scale(months):
+    """Spread of the nodes divided by 4, used to keep barycentric weights in range"""
+    spread = np.ptp(months, axis=-1, keepdims=True) if np.size(months) else 1.0
+    return np.where(spread > 0, spread / 4, 1.0)
+
+
+def _barycentric_weights(months):
+    """
+    Compute barycentric weights w_j = 1 / prod_{k != j} (x_j - x_k).
+
+    Nodes are rescaled by a common factor first; the factor cancels in the
+    barycentric formula but keeps the products from overflowing.
+    Leading axes are treated as a batch of point sets.
+    """
+    months = np.asarray(months, dtype=float)
+    if months.shape[-1] == 0:
+        return np.zeros(months.shape)
+    scaled = months / _node_scale(months)
+    differences = scaled[..., :, None] - scaled[..., None, :]
+    n = months.shape[-1]
+    differences[..., np.arange(n), np.arange(n)] = 1.0
+    return 1.0 / np.prod(differences, axis=-1)
+
+
+def _barycentric_evaluate(months, balances, weights, targets):
+    months = np.asarray(months, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+    scalar_target = targets.ndim == 0
+    targets = np.atleast_1d(targets)
+
+    differences = targets[..., :, None] - months[..., None, :]
+    exact = differences == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = weights[..., None, :] / differences
+        result = (terms @ balances[..., :, None])[..., 0] / terms.sum(axis=-1)
+
+    # Targets that land exactly on a node take the node value
+    hits = exact.any(axis=-1)
+    if hits.any():
+        node_values = np.broadcast_to(balances[..., None, :], exact.shape)
+        result = np.where(hits, np.where(exact, node_values, 0).sum(axis=-1), result)
+
+    if scalar_target:
+        result = result[..., 0]
+    return float(result) if np.ndim(result) == 0 else result
+
+
+class CubicSplineInterpolator:
+    """
+    Natural cubic spline through the data points.
+
+    A piecewise cubic avoids the oscillation of a single high-degree
+    polynomial. The second derivatives are solved once with the tridiagonal
+    (Thomas) algorithm in O(n); each target is located with a binary search
+    (O(log n)) and evaluated on its segment in O(1).
+    """
+    method_name = "Natural Cubic Spline"
+
+    def __init__(self, months=(), balances=()):
+        order = np.argsort(np.asarray(months, dtype=float), kind='stable')
+        self._x = np.asarray(months, dtype=float)[order]
+        self._y = np.asarray(balances, dtype=float)[order]
+        if np.any(np.diff(self._x) == 0):
+            raise ValueError("Duplicate months in interpolation points")
+        self._second_derivatives = _natural_spline_second_derivatives(self._x, self._y)
+
+    def __len__(self):
+        return len(self._x)
+
+    @property
+    def nodes(self):
+        return self._x
+
+    @property
+    def values(self):
+        return self._y
+
+    def add_point(self, month, balance):
+        """Add a data point; the spline system is re-solved in O(n)"""
+        self.__init__(np.append(self._x, month), np.append(self._y, balance))
+
+    def evaluate(self, target_month):
+        """
+        Evaluate the spline; targets outside the nodes use the end segments.
+
+        Args:
+            target_month (float or array-like): Month(s) to interpolate
+
+        Returns:
+            float or numpy.ndarray: Interpolated balance value(s)
+        """
+        if len(self._x) < 2:
+            raise ValueError("A cubic spline needs at least 2 data points")
+        targets = np.asarray(target_month, dtype=float)
+        segment = np.clip(np.searchsorted(self._x, targets, side='right') - 1, 0, len(self._x) - 2)
+        result = _spline_segment_values(self._x, self._y, self._second_derivatives, segment, targets)
+        return float(result) if result.ndim == 0 else result
+
+    __call__ = evaluate
+
+
+def _natural_spline_second_derivatives(months, balances):
+    """
+    Solve the natural cubic spline system for the second derivatives.
+
+    Uses the Thomas algorithm on the tridiagonal system. Leading axes are
+    treated as a batch of point sets and solved together.
+    """
+    months = np.asarray(months, dtype=float)
+    balances = np.asarray(balances, dtype=float)
+    n = months.shape[-1]
+    second = np.zeros(np.broadcast_shapes(months.shape, balances.shape))
+    if n < 3:
+        return second
+
+    h = np.diff(months, axis=-1)
+    slopes = np.diff(balances, axis=-1) / h
+    rhs = 6 * (slopes[..., 1:] - slopes[..., :-1])
+    diagonal = 2 * (h[..., :-1] + h[..., 1:])
+    off_diagonal = h[..., 1:-1]
+
+    # Forward sweep
+    c_prime = np.zeros(rhs.shape)
+    d_prime = np.zeros(rhs.shape)
+    c_prime[..., 0] = (off_diagonal[..., 0] / diagonal[..., 0]) if n > 3 else 0
+    d_prime[..., 0] = rhs[..., 0] / diagonal[..., 0]
+    for i in range(1, n - 2):
+        denominator = diagonal[..., i] - off_diagonal[..., i - 1] * c_prime[..., i - 1]
+        if i < n - 3:
+            c_prime[..., i] = off_diagonal[..., i] / denominator
+        d_prime[..., i] = (rhs[..., i] - off_diagonal[..., i - 1] * d_prime[..., i - 1]) / denominator
+
+    # Back substitution (natural end conditions keep the outer values at 0)
+    second[..., n - 2] = d_prime[..., n - 3]
+    for i in range(n - 4, -1, -1):
+        second[..., i + 1] = d_prime[..., i] - c_prime[..., i] * second[..., i + 2]
+    return second
+
+
+def _spline_segment_values(months, balances, second, segment, targets):
+    """Evaluate cubic spline segments; ``segment`` indexes the left node of each target"""
+    take = lambda values, index: np.take_along_axis(values, index, axis=-1) if values.ndim > 1 else values[index]
+    x0, x1 = take(months, segment), take(months, segment + 1)
+    y0, y1 = take(balances, segment), take(balances, segment + 1)
+    m0, m1 = take(second, segment), take(second, segment + 1)
+    h = x1 - x0
+    a = x1 - targets
+    b = targets - x0
+    return (m0 * a ** 3 + m1 * b ** 3) / (6 * h) + (y0 / h - m0 * h / 6) * a + (y1 / h - m1 * h / 6) * b
+
+
+INTERPOLATION_ENGINES = {
+    'newton': NewtonInterpolator,
+    'barycentric': BarycentricInterpolator,
+    'spline': CubicSplineInterpolator,
+}
+
+
+def create_interpolator(months, balances, engine='newton'):
+    """
+    Build an interpolator using the chosen engine.
+
+    Args:
+        months (list): Month values (x-coordinates)
+        balances (list): Balance values (y-coordinates)
+        engine (str): 'newton', 'barycentric' or 'spline'
+
+    Returns:
+        Interpolator object with evaluate(), add_point(), nodes and values
+    """
+    try:
+        engine_class = INTERPOLATION_ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Unknown interpolation engine: {engine!r}") from None
+    return engine_class(months, balances)
+
+
+def _batched_search(nodes, targets):
+    """
+    Row-wise np.searchsorted(side='right') as one vectorized binary search.
+
+    Args:
+        nodes (numpy.ndarray): Sorted nodes, shape (rows, n)
+        targets (numpy.ndarray): Targets, shape (rows, m)
+
+    Returns:
+        numpy.ndarray: Number of nodes at or below each target, shape (rows, m)
+    """
+    low = np.zeros(targets.shape, dtype=np.intp)
+    high = np.full(targets.shape, nodes.shape[-1], dtype=np.intp)
+    # Each halving step is one gather over rows x targets: O(m log n) per row
+    for _ in range(nodes.shape[-1].bit_length()):
+        middle = (low + high) // 2
+        at_or_below = np.take_along_axis(nodes, np.minimum(middle, nodes.shape[-1] - 1), axis=-1) <= targets
+        searching = low < high
+        low = np.where(searching & at_or_below, middle + 1, low)
+        high = np.where(searching & ~at_or_below, middle, high)
+    return low
+
+
+@timed()
+def interpolate_batch(months, balances, targets, engine='newton', max_block_elements=1 << 22):
+    """
+    Interpolate many point sets at many targets with the chosen engine.
+
+    Args:
+        months (array-like): Month values, shape (batch, n)
+        balances (array-like): Balance values, shape (batch, n)
+        targets (array-like): Target months, shape (m,) or (batch, m)
+        engine (str): 'newton', 'barycentric' or 'spline'
+        max_block_elements (int): Upper bound on temporary (rows x targets x points)
+            arrays; larger batches are processed in blocks of rows
+
+    Returns:
+        numpy.ndarray: Interpolated balances, shape (batch, m)
+    """
+    months = np.atleast_2d(np.asarray(months, dtype=float))
+    balances = np.atleast_2d(np.asarray(balances, dtype=float))
+    targets = np.asarray(targets, dtype=float)
+
+    if engine == 'newton':
+        return newton_interpolate_batch(months, balances, targets)
+    if engine not in INTERPOLATION_ENGINES:
+        raise ValueError(f"Unknown interpolation engine: {engine!r}")
+
+    batch, n = months.shape
+    shared_targets = targets.ndim <= 1
+    m = np.atleast_1d(targets).shape[-1]
+    rows_per_block = max(1, max_block_elements // max(1, m * n))
+    result = np.empty((batch, m))
+
+    for start in range(0, batch, rows_per_block):
+        block = slice(start, start + rows_per_block)
+        x, y = months[block], balances[block]
+        t = np.atleast_1d(targets) if shared_targets else targets[block]
+        if engine == 'barycentric':
+            result[block] = _barycentric_evaluate(x, y, _barycentric_weights(x), t)
+        else:
+            order = np.argsort(x, axis=-1, kind='stable')
+            x = np.take_along_axis(x, order, axis=-1)
+            y = np.take_along_axis(y, order, axis=-1)
+            second = _natural_spline_second_derivatives(x, y)
+            t = np.broadcast_to(t, (len(x), m))
+            segment = np.clip(_batched_search(x, t) - 1, 0, n - 2)
+            result[block] = _spline_segment_values(x, y, second, segment, t)
+
+    return result
+
+
+@timed()
+def analyze_interpolation_error(interpolator, months, balances):
+    """
+    Compare an interpolator against exact balances at every month in one pass.
+
+    Errors are also broken down per segment, where a segment is the span
+    between two consecutive interpolation points.
+
+    Args:
+        interpolator: Fitted interpolator (any engine)
+        months (array-like): Months with known balances, in ascending order
+        balances (array-like): Exact balances at those months
+
+    Returns:
+        dict: 'max_error', 'rms_error', 'max_error_month', 'predicted',
+            'errors' and 'segments' (list of dicts with 'start', 'end',
+            'max_error' and 'rms_error')
+    """
+    months = np.asarray(months, dtype=float)
+    balances = np.asarray(balances, dtype=float)
+    predicted = np.asarray(interpolator.evaluate(months), dtype=float)
+    errors = predicted - balances
+    absolute = np.abs(errors)
+
+    nodes = np.sort(interpolator.nodes)
+    segment_ids = np.clip(np.searchsorted(nodes, months, side='right') - 1, 0, max(len(nodes) - 2, 0))
+    starts = np.flatnonzero(np.r_[True, np.diff(segment_ids) != 0])
+    counts = np.diff(np.r_[starts, len(months)])
+    segment_max = np.maximum.reduceat(absolute, starts)
+    segment_rms = np.sqrt(np.add.reduceat(errors ** 2, starts) / counts)
+
+    segments = []
+    for segment, max_error, rms_error in zip(segment_ids[starts].tolist(), segment_max.tolist(), segment_rms.tolist()):
+        end = nodes[segment + 1] if segment + 1 < len(nodes) else months[-1]
+        segments.append({'start': float(nodes[segment]), 'end': float(end),
+                         'max_error': max_error, 'rms_error': rms_error})
+
+    worst = int(np.argmax(absolute))
+    return {
+        'max_error': float(absolute[worst]),
+        'rms_error': float(np.sqrt(np.mean(errors ** 2))),
+        'max_error_month': float(months[worst]),
+        'predicted': predicted,
+        'errors': errors,
+        'segments': segments,
+    }
+
+
+@timed()
+def rank_sampling_densities(months, balances, steps=(6, 12, 24), engine='newton', tolerance=None, progress=None):
+    """
+    Rank point selections by accuracy against cost.
+
+    For each step the first month plus every ``step``-th month is used as the
+    interpolation points (like the amortization tab's auto-select), the chosen
+    engine is fitted, and the error is measured against every month.
+
+    Args:
+        months (array-like): Months with known balances, starting at month 0
+        balances (array-like): Exact balances at those months
+        steps (iterable): Sampling intervals to compare
+        engine (str): 'newton', 'barycentric' or 'spline'
+        tolerance (float): Maximum acceptable error; when given, the cheapest
+            selection within tolerance is ranked first
+        progress (callable): Called with the completed fraction after each
+            step; an exception raised by it stops the ranking
+
+    Returns:
+        list: One dict per step with 'step', 'points', 'max_error', 'rms_error',
+            'seconds' and 'meets_target', ordered from best to worst choice
+    """
+    months = np.asarray(months, dtype=float)
+    balances = np.asarray(balances, dtype=float)
+
+    steps = list(steps)
+    candidates = []
+    for index, step in enumerate(steps):
+        sample = np.r_[0, np.arange(step, len(months), step)]
+        start_time = time.perf_counter()
+        interpolator = create_interpolator(months[sample], balances[sample], engine)
+        analysis = analyze_interpolation_error(interpolator, months, balances)
+        seconds = time.perf_counter() - start_time
+        candidates.append({
+            'step': step,
+            'points': len(sample),
+            'max_error': analysis['max_error'],
+            'rms_error': analysis['rms_error'],
+            'seconds': seconds,
+            'meets_target': tolerance is None or analysis['max_error'] <= tolerance,
+        })
+        if progress is not None:
+            progress((index + 1) / len(steps))
+
+    if tolerance is None:
+        return sorted(candidates, key=lambda candidate: candidate['max_error'])
+    # Cheapest selection that meets the target first, then the rest by error
+    return sorted(candidates, key=lambda candidate: (not candidate['meets_target'],
+                                                     candidate['points'] if candidate['meets_target'] else 0,
+                                                     candidate['max_error']))
+
+
+@timed()
 def format_newton_polynomial(dd_table, months):
     """
     Format the Newton polynomial equation as a string.
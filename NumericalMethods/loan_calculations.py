@@ -3,20 +3,108 @@ Loan Calculations Module
 Contains functions for calculating loan payments and amortization schedules
 """
 
-def calculate_monthly_payment(principal, annual_rate, years):
+from itertools import islice
+import numpy as np
+from NumericalMethods.schedule import AmortizationSchedule, SCHEDULE_COLUMNS
+from NumericalMethods.profiling import timed
+
+# Payments per year for the supported payment frequencies
+PAYMENT_FREQUENCIES = {'monthly': 12, 'semi-monthly': 24, 'bi-weekly': 26, 'weekly': 52}
+
+# Interest accrual conventions: 'nominal' charges annual_rate / payments_per_year
+# each period; the daily-accrual conventions charge annual_rate / basis per
+# day for the actual days in a period (see period_days)
+DAY_COUNT_BASES = {'nominal': None, 'actual/365': 365, 'actual/360': 360}
+
+# Frequencies whose periods are a whole number of days. Schedules carry no
+# calendar dates, so monthly and semi-monthly periods accrue for the average
+# 365 / payments_per_year days, which makes actual/365 equal to nominal there.
+PERIOD_DAYS = {52: 7, 26: 14}
+
+
+def periodic_rate(annual_rates, payments_per_year=12, day_count='nominal'):
+    """
+    Convert annual percentage rates into interest rates per payment period.
+
+    Args:
+        annual_rates (float or array-like): Annual interest rates as percentages
+        payments_per_year (int or array-like): Payments per year (12 = monthly)
+        day_count (str): One of DAY_COUNT_BASES
+
+    Returns:
+        float or numpy.ndarray: Periodic rates as fractions
+    """
+    try:
+        basis = DAY_COUNT_BASES[day_count]
+    except KeyError:
+        raise ValueError(f"Unknown day count {day_count!r}; expected one of {', '.join(DAY_COUNT_BASES)}") from None
+    if basis is None:
+        return annual_rates / 100 / payments_per_year
+    if np.ndim(payments_per_year):
+        payments_per_year = np.asarray(payments_per_year, dtype=float)
+        days = 365 / payments_per_year
+        for frequency, whole_days in PERIOD_DAYS.items():
+            days = np.where(payments_per_year == frequency, whole_days, days)
+    else:
+        days = period_days(payments_per_year)
+    return annual_rates / 100 * days / basis
+
+
+def period_days(payments_per_year=12):
+    """
+    Days of interest accrued per payment period under the daily conventions.
+
+    Args:
+        payments_per_year (int): Payments per year
+
+    Returns:
+        float: 7 for weekly and 14 for bi-weekly payments, otherwise the
+            average period length 365 / payments_per_year
+    """
+    return PERIOD_DAYS.get(payments_per_year, 365 / payments_per_year)
+
+
+def period_label(payments_per_year=12):
+    """Column heading for payment numbers: 'Month' for monthly schedules, 'Period' otherwise"""
+    return 'Month' if payments_per_year == 12 else 'Period'
+
+
+def count_payments(years, payments_per_year=12):
+    """
+    Number of payments in a term, rounded to a whole payment.
+
+    Args:
+        years (float or array-like): Loan terms in years (may be fractional)
+        payments_per_year (int or array-like): Payments per year
+
+    Returns:
+        int or numpy.ndarray: Number of payments
+    """
+    if np.ndim(years) == 0 and np.ndim(payments_per_year) == 0:
+        return int(round(years * payments_per_year))
+    return np.rint(np.asarray(years, dtype=float) * payments_per_year).astype(np.int64)
+
+
+@timed()
+def calculate_monthly_payment(principal, annual_rate, years, payments_per_year=12, day_count='nominal'):
     """
     Calculate the monthly payment for a loan using the standard amortization formula.
 
+    With another payment frequency the result is the payment per period
+    (e.g. the weekly payment for payments_per_year=52).
+
     Args:
         principal (float): Loan amount
         annual_rate (float): Annual interest rate as percentage
-        years (int): Loan term in years
+        years (float): Loan term in years, rounded to a whole number of payments
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
 
     Returns:
         float: Monthly payment amount
     """
-    monthly_rate = annual_rate / 100 / 12
-    num_payments = years * 12
+    monthly_rate = periodic_rate(annual_rate, payments_per_year, day_count)
+    num_payments = count_payments(years, payments_per_year)
 
     if monthly_rate == 0:
         return principal / num_payments
@@ -25,58 +113,556 @@ def calculate_monthly_payment(principal, annual_rate, years):
            ((1 + monthly_rate)**num_payments - 1)
 
 
-def generate_amortization_schedule(principal, annual_rate, years):
+@timed()
+def generate_amortization_schedule(principal, annual_rate, years, payments_per_year=12, day_count='nominal'):
     """
     Generate a complete amortization schedule for a loan.
 
     Args:
         principal (float): Loan amount
         annual_rate (float): Annual interest rate as percentage
-        years (int): Loan term in years
+        years (float): Loan term in years
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
 
     Returns:
-        list: List of dictionaries containing monthly payment details
+        AmortizationSchedule: Column-oriented schedule; rows support
+            row['month'], row['payment'], row['interest'], row['principal']
+            and row['balance'] access ('month' is the payment period number)
     """
-    monthly_payment = calculate_monthly_payment(principal, annual_rate, years)
-    monthly_rate = annual_rate / 100 / 12
-    num_payments = years * 12
+    batch = generate_amortization_schedule_batch([principal], [annual_rate], [years], payments_per_year, day_count)
+    return AmortizationSchedule.from_batch(batch, 0)
 
-    amortization_data = []
-    balance = principal
 
-    for month in range(1, num_payments + 1):
-        interest_payment = balance * monthly_rate
-        principal_payment = monthly_payment - interest_payment
-        balance -= principal_payment
+@timed()
+def calculate_loan_totals(principal, annual_rate, years, payments_per_year=12, day_count='nominal'):
+    """
+    Calculate total amounts paid and total interest for a loan.
 
-        if balance < 0:
-            balance = 0
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate as percentage
+        years (float): Loan term in years
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
 
-        amortization_data.append({
-            'month': month,
-            'payment': monthly_payment,
-            'interest': interest_payment,
-            'principal': principal_payment,
-            'balance': balance
-        })
+    Returns:
+        tuple: (monthly_payment, total_paid, total_interest)
+    """
+    monthly_payment = calculate_monthly_payment(principal, annual_rate, years, payments_per_year, day_count)
+    total_paid = monthly_payment * count_payments(years, payments_per_year)
+    total_interest = total_paid - principal
 
-    return amortization_data
+    return monthly_payment, total_paid, total_interest
 
 
-def calculate_loan_totals(principal, annual_rate, years):
+@timed()
+def calculate_monthly_payment_batch(principals, annual_rates, years, payments_per_year=12, day_count='nominal'):
     """
-    Calculate total amounts paid and total interest for a loan.
+    Calculate monthly payments for many loans at once.
+
+    Inputs are broadcast against each other, so a scalar rate or term can be
+    combined with an array of principals.
+
+    Args:
+        principals (array-like): Loan amounts
+        annual_rates (array-like): Annual interest rates as percentages
+        years (array-like): Loan terms in years
+        payments_per_year (int or array-like): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        numpy.ndarray: Payment per period for each loan
+    """
+    principals = np.asarray(principals, dtype=float)
+    monthly_rates = periodic_rate(np.asarray(annual_rates, dtype=float), payments_per_year, day_count)
+    num_payments = np.rint(np.asarray(years, dtype=float) * payments_per_year)
+
+    growth = (1 + monthly_rates) ** num_payments
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payments = principals * monthly_rates * growth / (growth - 1)
+
+    return np.where(monthly_rates == 0, principals / num_payments, payments)
+
+
+@timed()
+def generate_amortization_schedule_batch(principals, annual_rates, years, payments_per_year=12,
+                                         day_count='nominal'):
+    """
+    Generate amortization schedules for many loans in one vectorized pass.
+
+    Each balance is evaluated with the closed-form amortization formula, so no
+    Python loop runs over months or loans. Loans may have different terms;
+    rows past a loan's last payment are padded with zeros. The cost is the
+    same per row at any payment frequency, so a weekly schedule costs what a
+    monthly one of the same number of rows does.
+
+    Args:
+        principals (array-like): Loan amounts
+        annual_rates (array-like): Annual interest rates as percentages
+        years (array-like): Loan terms in years
+        payments_per_year (int or array-like): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        dict: Schedule columns with keys
+            'month' (numpy.ndarray): Month numbers 1..max_payments, shape (max_payments,)
+            'payment', 'interest', 'principal', 'balance' (numpy.ndarray):
+                Per-month values, shape (n_loans, max_payments)
+            'num_payments' (numpy.ndarray): Number of payments for each loan
+    """
+    principals, annual_rates, years, payments_per_year = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principals, dtype=float)),
+        np.atleast_1d(np.asarray(annual_rates, dtype=float)),
+        np.atleast_1d(np.asarray(years)),
+        np.atleast_1d(np.asarray(payments_per_year)))
+
+    monthly_rates = periodic_rate(annual_rates, payments_per_year, day_count)
+    num_payments = count_payments(years, payments_per_year)
+    monthly_payments = calculate_monthly_payment_batch(principals, annual_rates, years, payments_per_year, day_count)
+
+    max_payments = int(num_payments.max()) if num_payments.size else 0
+    months = np.arange(1, max_payments + 1)
+    elapsed = np.arange(0, max_payments + 1)
+
+    rate = monthly_rates[:, None]
+    balances = _remaining_balance(principals[:, None], rate, monthly_payments[:, None], elapsed[None, :])
+
+    interest = balances[:, :-1] * rate
+    principal_paid = monthly_payments[:, None] - interest
+    balance = balances[:, 1:]
+    payment = np.broadcast_to(monthly_payments[:, None], balance.shape).copy()
+
+    active = months[None, :] <= num_payments[:, None]
+    for column in (payment, interest, principal_paid, balance):
+        column[~active] = 0
+
+    return {
+        'month': months,
+        'payment': payment,
+        'interest': interest,
+        'principal': principal_paid,
+        'balance': balance,
+        'num_payments': num_payments
+    }
+
+
+def _remaining_balance(principal, rate, payment, elapsed):
+    """
+    Evaluate the closed-form balance after a number of level payments.
+
+    B_k = P(1+r)^k - M((1+r)^k - 1)/r, or P - Mk when the rate is zero.
+    All arguments broadcast against each other; negative balances are clamped to 0.
+
+    Args:
+        principal (array-like): Opening balance
+        rate (array-like): Periodic interest rate as a fraction
+        payment (array-like): Level payment per period
+        elapsed (array-like): Number of payments made
+
+    Returns:
+        numpy.ndarray: Remaining balance
+    """
+    growth = (1 + rate) ** elapsed
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accrued = np.where(rate == 0, elapsed, (growth - 1) / rate)
+    return np.maximum(principal * growth - payment * accrued, 0)
+
+
+def calculate_balance_at(principal, annual_rate, years, months, payments_per_year=12, day_count='nominal'):
+    """
+    Calculate the remaining balance after a given number of payments.
+
+    Uses the closed-form amortization formula, so the cost does not depend on
+    how far into the term the month is. Any argument may be an array; they
+    are broadcast against each other.
+
+    Args:
+        principal (float or array-like): Loan amount
+        annual_rate (float or array-like): Annual interest rate as percentage
+        years (float or array-like): Loan term in years
+        months (int or array-like): Month (payment period) number(s); 0 is the loan start
+        payments_per_year (int or array-like): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        float or numpy.ndarray: Remaining balance at each month
+    """
+    return query_amortization(principal, annual_rate, years, months, payments_per_year, day_count)[0]
+
+
+@timed()
+def query_amortization(principal, annual_rate, years, months, payments_per_year=12, day_count='nominal'):
+    """
+    Look up balance and cumulative totals at any month without a schedule.
+
+    Months are clipped to the loan term. Any argument may be an array; they
+    are broadcast against each other.
+
+    Args:
+        principal (float or array-like): Loan amount
+        annual_rate (float or array-like): Annual interest rate as percentage
+        years (float or array-like): Loan term in years
+        months (int or array-like): Month (payment period) number(s); 0 is the loan start
+        payments_per_year (int or array-like): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        tuple: (balance, cumulative_interest, cumulative_principal) at each month
+    """
+    principal = np.asarray(principal, dtype=float)
+    monthly_rate = periodic_rate(np.asarray(annual_rate, dtype=float), payments_per_year, day_count)
+    num_payments = np.rint(np.asarray(years, dtype=float) * payments_per_year)
+    monthly_payment = calculate_monthly_payment_batch(principal, annual_rate, years, payments_per_year, day_count)
+    elapsed = np.clip(np.asarray(months, dtype=float), 0, num_payments)
+
+    balance = _remaining_balance(principal, monthly_rate, monthly_payment, elapsed)
+    # The final payment only covers what is left, mirroring the balance clamp
+    cumulative_principal = principal - balance
+    cumulative_interest = np.maximum(elapsed * monthly_payment - cumulative_principal, 0)
+
+    if balance.ndim == 0:
+        return float(balance), float(cumulative_interest), float(cumulative_principal)
+    return balance, cumulative_interest, cumulative_principal
+
+
+class LazyAmortizationSchedule:
+    """
+    Amortization schedule whose rows are computed on demand.
+
+    Row and column access evaluate the closed-form formulas for just the
+    months requested, so asking for a few checkpoints never builds the full
+    schedule. Rows are returned as dictionaries with the usual schedule keys.
+    With another payment frequency, "month" means the payment period.
+    """
+
+    def __init__(self, principal, annual_rate, years, payments_per_year=12, day_count='nominal'):
+        self.principal = float(principal)
+        self.annual_rate = float(annual_rate)
+        self.years = years
+        self.payments_per_year = payments_per_year
+        self.day_count = day_count
+        self.monthly_rate = periodic_rate(self.annual_rate, payments_per_year, day_count)
+        self.num_payments = count_payments(years, payments_per_year)
+        self.monthly_payment = calculate_monthly_payment(self.principal, self.annual_rate, years, payments_per_year,
+                                                         day_count)
+
+    def __len__(self):
+        return self.num_payments
+
+    def __repr__(self):
+        return f"LazyAmortizationSchedule({self.num_payments} months)"
+
+    def rows_at(self, months):
+        """
+        Compute schedule rows for the given month numbers.
+
+        Args:
+            months (array-like): Month numbers between 1 and the loan term
+
+        Returns:
+            dict: Arrays for 'month', 'payment', 'interest', 'principal' and 'balance'
+        """
+        months = np.asarray(months, dtype=np.int64)
+        if months.size and (months.min() < 1 or months.max() > self.num_payments):
+            raise IndexError("month out of range")
+        opening = _remaining_balance(self.principal, self.monthly_rate, self.monthly_payment, months - 1)
+        closing = _remaining_balance(self.principal, self.monthly_rate, self.monthly_payment, months)
+        interest = opening * self.monthly_rate
+        return {
+            'month': months,
+            'payment': np.full(months.shape, self.monthly_payment),
+            'interest': interest,
+            'principal': self.monthly_payment - interest,
+            'balance': closing
+        }
+
+    def column(self, name):
+        """
+        Compute one full column of the schedule.
+
+        Args:
+            name (str): One of 'month', 'payment', 'interest', 'principal', 'balance'
+
+        Returns:
+            numpy.ndarray: Column values for every month
+        """
+        return self.rows_at(np.arange(1, self.num_payments + 1))[name]
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+        if isinstance(key, slice):
+            months = np.arange(1, self.num_payments + 1)[key]
+            return AmortizationSchedule(**self.rows_at(months))
+        index = int(key)
+        if index < 0:
+            index += self.num_payments
+        row = self.rows_at([index + 1])
+        return {name: values[0].item() for name, values in row.items()}
+
+    def __iter__(self):
+        for index in range(self.num_payments):
+            yield self[index]
+
+    def materialize(self):
+        """
+        Compute every row and return a regular column-oriented schedule.
+
+        Returns:
+            AmortizationSchedule: Fully computed schedule
+        """
+        return self[:]
+
+
+def iter_amortization_schedule(principal, annual_rate, years, chunk_months=120, payments_per_year=12,
+                               day_count='nominal'):
+    """
+    Generate an amortization schedule one month at a time.
+
+    Rows are computed in blocks of ``chunk_months`` with the closed-form
+    formulas, so memory use does not grow with the length of the term.
 
     Args:
         principal (float): Loan amount
         annual_rate (float): Annual interest rate as percentage
+        years (float): Loan term in years
+        chunk_months (int): Number of months (payment periods) computed per block
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Yields:
+        dict: Monthly payment details with the usual schedule keys
+    """
+    lazy = LazyAmortizationSchedule(principal, annual_rate, years, payments_per_year, day_count)
+    for start in range(1, lazy.num_payments + 1, chunk_months):
+        stop = min(start + chunk_months, lazy.num_payments + 1)
+        rows = lazy.rows_at(np.arange(start, stop))
+        for values in zip(*(rows[name].tolist() for name in SCHEDULE_COLUMNS)):
+            yield dict(zip(SCHEDULE_COLUMNS, values))
+
+
+def iter_schedule_batches(loans, loans_per_chunk=1000, payments_per_year=12, day_count='nominal'):
+    """
+    Generate schedules for a stream of loans in fixed-size vectorized chunks.
+
+    Only one chunk is held in memory at a time, so the portfolio can be an
+    arbitrarily long iterable (for example rows read lazily from a file).
+
+    Args:
+        loans (iterable): (principal, annual_rate, years) tuples
+        loans_per_chunk (int): Number of loans computed per vectorized pass
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Yields:
+        tuple: (first_loan_index, batch) where batch is the result of
+            generate_amortization_schedule_batch for that chunk
+    """
+    loans = iter(loans)
+    first_index = 0
+    while True:
+        chunk = list(islice(loans, loans_per_chunk))
+        if not chunk:
+            return
+        principals, annual_rates, years = zip(*chunk)
+        yield first_index, generate_amortization_schedule_batch(principals, annual_rates, years,
+                                                                payments_per_year, day_count)
+        first_index += len(chunk)
+
+
+@timed()
+def calculate_loan_totals_batch(principals, annual_rates, years, payments_per_year=12, day_count='nominal'):
+    """
+    Calculate total amounts paid and total interest for many loans at once.
+
+    Args:
+        principals (array-like): Loan amounts
+        annual_rates (array-like): Annual interest rates as percentages
+        years (array-like): Loan terms in years
+        payments_per_year (int or array-like): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        tuple: (monthly_payments, total_paid, total_interest) as numpy arrays
+    """
+    principals = np.asarray(principals, dtype=float)
+    monthly_payments = calculate_monthly_payment_batch(principals, annual_rates, years, payments_per_year, day_count)
+    total_paid = monthly_payments * np.rint(np.asarray(years, dtype=float) * payments_per_year)
+    total_interest = total_paid - principals
+
+    return monthly_payments, total_paid, total_interest
+
+
+@timed()
+def calculate_sensitivity_grid(principals, annual_rates, years, payments_per_year=12, day_count='nominal'):
+    """
+    Calculate payment, total paid and total interest over a principal x rate x term grid.
+
+    The grid is evaluated with one broadcast call to the batch formulas, so
+    every combination is computed without a Python loop.
+
+    Args:
+        principals (array-like): Loan amounts (grid axis 0)
+        annual_rates (array-like): Annual interest rates as percentages (grid axis 1)
+        years (array-like): Loan terms in years (grid axis 2)
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        dict: 'principal', 'rate', 'term' axis arrays and 'payment', 'total_paid',
+            'total_interest' arrays of shape (n_principals, n_rates, n_terms)
+    """
+    principals = np.atleast_1d(np.asarray(principals, dtype=float))
+    annual_rates = np.atleast_1d(np.asarray(annual_rates, dtype=float))
+    years = np.atleast_1d(np.asarray(years, dtype=float))
+
+    payment, total_paid, total_interest = calculate_loan_totals_batch(
+        principals[:, None, None], annual_rates[None, :, None], years[None, None, :], payments_per_year, day_count)
+
+    shape = (len(principals), len(annual_rates), len(years))
+    return {
+        'principal': principals,
+        'rate': annual_rates,
+        'term': years,
+        'payment': np.broadcast_to(payment, shape),
+        'total_paid': np.broadcast_to(total_paid, shape),
+        'total_interest': np.broadcast_to(total_interest, shape),
+    }
+
+
+def _parse_step_events(events, num_payments, name):
+    """
+    Normalize {month: value} or [(month, value), ...] into a sorted list of
+    (int month, float value), rejecting months outside 1..num_payments.
+    """
+    if not events:
+        return []
+    items = events.items() if isinstance(events, dict) else events
+    parsed = sorted((int(month), float(value)) for month, value in items)
+    outside = [month for month, _ in parsed if not 1 <= month <= num_payments]
+    if outside:
+        raise ValueError(f"{name} month {outside[0]} is outside the loan term (1 to {num_payments})")
+    return parsed
+
+
+@timed()
+def generate_event_schedule(principal, annual_rate, years, extra_payments=None, lump_sums=None,
+                            rate_changes=None, payments_per_year=12, day_count='nominal'):
+    """
+    Generate a schedule with extra payments, lump-sum prepayments and rate resets.
+
+    The term is split into segments where the rate and payment are constant.
+    Each segment is evaluated with the closed-form balance formula over all of
+    its months at once, so the only Python loop is over events, never months.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Initial annual interest rate as percentage
         years (int): Loan term in years
+        extra_payments (dict or list): (start_month, amount) pairs; from each
+            start month on, ``amount`` is added to every regular payment
+            (a later entry replaces the earlier amount, 0 stops it)
+        lump_sums (dict or list): (month, amount) one-off prepayments made
+            together with that month's payment
+        rate_changes (dict or list): (month, annual_rate) resets; from that
+            month on interest accrues at the new rate and the regular payment
+            is recalculated to amortize the balance over the remaining term
+            (e.g. a 5/1 ARM resets at months 61, 73, 85, ...)
+        payments_per_year (int): Payments per year (12 = monthly); event
+            months are then payment period numbers, from 1 to the last
+            payment (others raise ValueError)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
 
     Returns:
-        tuple: (monthly_payment, total_paid, total_interest)
+        dict: 'schedule' (AmortizationSchedule), 'payoff_month', 'total_interest',
+            'baseline_interest' (same rate path without prepayments),
+            'interest_saved' and 'months_saved'
     """
-    monthly_payment = calculate_monthly_payment(principal, annual_rate, years)
-    total_paid = monthly_payment * years * 12
-    total_interest = total_paid - principal
+    num_payments = count_payments(years, payments_per_year)
+    extra_payments = _parse_step_events(extra_payments, num_payments, "Extra payment")
+    lump_sums = _parse_step_events(lump_sums, num_payments, "Lump sum")
+    rate_changes = _parse_step_events(rate_changes, num_payments, "Rate change")
+
+    lump_by_month = {}
+    for month, amount in lump_sums:
+        lump_by_month[month] = lump_by_month.get(month, 0.0) + amount
+
+    boundaries = {1, num_payments + 1}
+    boundaries.update(month for month, _ in extra_payments + rate_changes)
+    boundaries.update(month + 1 for month in lump_by_month)
+    boundaries = sorted(boundaries)
+
+    columns = {name: [] for name in ('month', 'payment', 'interest', 'principal', 'balance')}
+    balance = float(principal)
+    monthly_rate = periodic_rate(annual_rate, payments_per_year, day_count)
+    level_payment = calculate_monthly_payment(balance, annual_rate, years, payments_per_year, day_count)
+    extra = 0.0
+    payoff_month = num_payments
+
+    for start, stop in zip(boundaries[:-1], boundaries[1:]):
+        for month, rate in rate_changes:
+            if month == start:
+                monthly_rate = periodic_rate(rate, payments_per_year, day_count)
+                remaining = num_payments - start + 1
+                level_payment = calculate_monthly_payment(balance, rate, remaining / payments_per_year,
+                                                          payments_per_year, day_count)
+        for month, amount in extra_payments:
+            if month == start:
+                extra = amount
+
+        payment = level_payment + extra
+        elapsed = np.arange(1, stop - start + 1)
+        closing = _remaining_balance(balance, monthly_rate, payment, elapsed)
+        opening = np.r_[balance, closing[:-1]]
+        interest = opening * monthly_rate
+        principal_paid = np.full(len(elapsed), payment) - interest
+
+        # Last segment of the term, or a segment where the balance reaches zero early
+        paid_off = np.flatnonzero(closing <= 0)
+        last_row = paid_off[0] if len(paid_off) else len(elapsed) - 1
+        is_payoff = len(paid_off) > 0 or stop == num_payments + 1
+        if is_payoff:
+            principal_paid[last_row] = opening[last_row]
+            closing[last_row] = 0.0
+
+        lump = lump_by_month.get(stop - 1, 0.0) if not len(paid_off) else 0.0
+        if lump:
+            lump = min(lump, closing[last_row])
+            principal_paid[last_row] += lump
+            closing[last_row] -= lump
+            is_payoff = is_payoff or closing[last_row] <= 0
+
+        rows = slice(0, last_row + 1)
+        columns['month'].append(np.arange(start, start + last_row + 1))
+        columns['payment'].append(interest[rows] + principal_paid[rows])
+        columns['interest'].append(interest[rows])
+        columns['principal'].append(principal_paid[rows])
+        columns['balance'].append(closing[rows])
+
+        balance = float(closing[last_row])
+        if is_payoff and balance <= 0:
+            payoff_month = start + last_row
+            break
+
+    schedule = AmortizationSchedule(*(np.concatenate(columns[name]) for name in SCHEDULE_COLUMNS))
+    total_interest = float(schedule['interest'].sum())
+
+    if extra_payments or lump_sums:
+        baseline = generate_event_schedule(principal, annual_rate, years, rate_changes=rate_changes,
+                                           payments_per_year=payments_per_year, day_count=day_count)
+        baseline_interest = baseline['total_interest']
+        baseline_months = baseline['payoff_month']
+    else:
+        baseline_interest = total_interest
+        baseline_months = payoff_month
+
+    return {
+        'schedule': schedule,
+        'payoff_month': payoff_month,
+        'total_interest': total_interest,
+        'baseline_interest': baseline_interest,
+        'interest_saved': baseline_interest - total_interest,
+        'months_saved': baseline_months - payoff_month,
+    }
 
-    return monthly_payment, total_paid, total_interest
\ No newline at end of file
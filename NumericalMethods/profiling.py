@@ -0,0 +1,123 @@
+"""
+Profiling Module
+Contains a switchable registry of named timing spans for the calculator's hot paths
+"""
+
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ProfileRegistry:
+    """
+    Collects call counts and wall-clock times per named span.
+
+    Only aggregates are kept (count, total, min, max), so recording costs a
+    dictionary lookup and a lock, and memory does not grow with the number of
+    calls. When disabled, spans and timed functions skip the clock entirely.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._spans = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        """
+        Add one measurement to a span.
+
+        Args:
+            name (str): Span name
+            seconds (float): Elapsed wall-clock time
+        """
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                self._spans[name] = [1, seconds, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                if seconds < stats[2]:
+                    stats[2] = seconds
+                if seconds > stats[3]:
+                    stats[3] = seconds
+
+    @contextmanager
+    def span(self, name):
+        """Time the body of a with-block under the given span name"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name=None):
+        """
+        Decorator that times every call of a function.
+
+        Args:
+            name (str): Span name (default: 'Class.method' for methods and
+                'module.function' for module-level functions)
+
+        Returns:
+            callable: Decorator
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+            if '.' not in span_name:
+                span_name = f"{func.__module__.rsplit('.', 1)[-1]}.{span_name}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(span_name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        """Forget all measurements"""
+        with self._lock:
+            self._spans.clear()
+
+    def snapshot(self):
+        """
+        Current measurements, slowest total first.
+
+        Returns:
+            list: One dict per span with 'name', 'calls', 'total', 'mean',
+                'min' and 'max' (seconds)
+        """
+        with self._lock:
+            items = [(name, list(stats)) for name, stats in self._spans.items()]
+        rows = [{'name': name, 'calls': calls, 'total': total, 'mean': total / calls, 'min': low, 'max': high}
+                for name, (calls, total, low, high) in items]
+        return sorted(rows, key=lambda row: row['total'], reverse=True)
+
+    def dump(self, file_path, extra=None):
+        """
+        Write the measurements to a JSON profile file.
+
+        Args:
+            file_path (str): Destination path
+            extra (dict): Additional sections to include (e.g. cache statistics)
+        """
+        document = {'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'spans': self.snapshot()}
+        document.update(extra or {})
+        with open(file_path, 'w') as f:
+            json.dump(document, f, indent=2)
+
+
+# Shared registry for the calculator; disabled by default so spans cost one attribute check
+profiler = ProfileRegistry(enabled=False)
+span = profiler.span
+timed = profiler.timed
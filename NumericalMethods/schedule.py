@@ -0,0 +1,179 @@
+"""
+Schedule Module
+Contains a compact, column-oriented container for amortization schedules
+"""
+
+import numpy as np
+
+SCHEDULE_COLUMNS = ('month', 'payment', 'interest', 'principal', 'balance')
+
+
+class ScheduleRow:
+    """
+    Lightweight view of a single schedule row.
+
+    Supports the same ``row['balance']`` access as the per-month dictionaries
+    the schedule used to be made of, without copying any data.
+    """
+    __slots__ = ('_schedule', '_index')
+
+    def __init__(self, schedule, index):
+        self._schedule = schedule
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._schedule.column(key)[self._index]
+
+    def __contains__(self, key):
+        return key in SCHEDULE_COLUMNS
+
+    def __iter__(self):
+        return iter(SCHEDULE_COLUMNS)
+
+    def __len__(self):
+        return len(SCHEDULE_COLUMNS)
+
+    def __repr__(self):
+        return f"ScheduleRow({self.as_dict()})"
+
+    def keys(self):
+        return SCHEDULE_COLUMNS
+
+    def get(self, key, default=None):
+        return self[key] if key in SCHEDULE_COLUMNS else default
+
+    def as_dict(self):
+        """
+        Convert the row to a plain dictionary of Python numbers.
+
+        Returns:
+            dict: Row values keyed by column name
+        """
+        return {key: self[key].item() for key in SCHEDULE_COLUMNS}
+
+
+class AmortizationSchedule:
+    """
+    Amortization schedule stored as contiguous NumPy columns.
+
+    Indexing follows the shape of the data:
+        schedule['balance']  -> column array (zero-copy, read-only)
+        schedule[5]          -> ScheduleRow view of the sixth month
+        schedule[12:24]      -> AmortizationSchedule view of those months
+    """
+    __slots__ = ('_columns',)
+
+    def __init__(self, month, payment, interest, principal, balance):
+        columns = {
+            'month': np.ascontiguousarray(month, dtype=np.int32),
+            'payment': np.ascontiguousarray(payment, dtype=np.float64),
+            'interest': np.ascontiguousarray(interest, dtype=np.float64),
+            'principal': np.ascontiguousarray(principal, dtype=np.float64),
+            'balance': np.ascontiguousarray(balance, dtype=np.float64),
+        }
+        length = len(columns['month'])
+        for name, values in columns.items():
+            if values.ndim != 1 or len(values) != length:
+                raise ValueError(f"Column '{name}' must be one-dimensional with {length} entries")
+            values.flags.writeable = False
+        self._columns = columns
+
+    @classmethod
+    def from_batch(cls, batch, index):
+        """
+        Extract one loan's schedule from a batch result without copying.
+
+        Args:
+            batch (dict): Result of generate_amortization_schedule_batch
+            index (int): Position of the loan in the batch
+
+        Returns:
+            AmortizationSchedule: Schedule of the selected loan
+        """
+        n = int(batch['num_payments'][index])
+        return cls(batch['month'][:n],
+                   batch['payment'][index, :n],
+                   batch['interest'][index, :n],
+                   batch['principal'][index, :n],
+                   batch['balance'][index, :n])
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Build a schedule from an iterable of per-month dictionaries.
+
+        Args:
+            records (iterable): Dictionaries with the schedule column keys
+
+        Returns:
+            AmortizationSchedule: Column-oriented copy of the records
+        """
+        records = list(records)
+        return cls(*([record[key] for record in records] for key in SCHEDULE_COLUMNS))
+
+    def copy(self):
+        """
+        Return a schedule that owns its own column arrays.
+
+        Views created by slicing or from_batch keep their parent arrays
+        alive; a copy only holds its own rows.
+
+        Returns:
+            AmortizationSchedule: Independent copy
+        """
+        return AmortizationSchedule(*(self._columns[name].copy() for name in SCHEDULE_COLUMNS))
+
+    def column(self, name):
+        """
+        Return a column as a read-only NumPy array.
+
+        Args:
+            name (str): One of 'month', 'payment', 'interest', 'principal', 'balance'
+
+        Returns:
+            numpy.ndarray: Column values
+        """
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise KeyError(f"Unknown schedule column: {name!r}") from None
+
+    @property
+    def columns(self):
+        return dict(self._columns)
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self._columns.values())
+
+    def __len__(self):
+        return len(self._columns['month'])
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+        if isinstance(key, slice):
+            return AmortizationSchedule(*(self._columns[name][key] for name in SCHEDULE_COLUMNS))
+        index = int(key)
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("schedule index out of range")
+        return ScheduleRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ScheduleRow(self, index)
+
+    def __repr__(self):
+        return f"AmortizationSchedule({len(self)} months)"
+
+    def to_records(self):
+        """
+        Convert the schedule to a list of per-month dictionaries.
+
+        Returns:
+            list: List of dictionaries containing monthly payment details
+        """
+        return [row.as_dict() for row in self]
@@ -0,0 +1,169 @@
+"""
+Inverse Loan Solvers Module
+Contains vectorized solvers for the rate, term or principal implied by a monthly payment
+"""
+
+import numpy as np
+from NumericalMethods.loan_calculations import calculate_monthly_payment_batch, periodic_rate
+from NumericalMethods.profiling import timed
+
+
+def _as_result(*arrays):
+    """Return plain floats for scalar inputs, arrays otherwise"""
+    if arrays[0].ndim == 0:
+        return tuple(a.item() for a in arrays) if len(arrays) > 1 else arrays[0].item()
+    return arrays if len(arrays) > 1 else arrays[0]
+
+
+def _payment_and_slope(principals, monthly_rates, num_payments):
+    """
+    Monthly payment and its derivative with respect to the monthly rate.
+
+    Args:
+        principals (numpy.ndarray): Loan amounts
+        monthly_rates (numpy.ndarray): Monthly rates as fractions, all > 0
+        num_payments (numpy.ndarray): Number of monthly payments
+
+    Returns:
+        tuple: (payments, d_payment / d_rate) as numpy arrays
+    """
+    discount = (1 + monthly_rates) ** -num_payments
+    annuity = 1 - discount
+    payments = principals * monthly_rates / annuity
+    slope = principals * (annuity - monthly_rates * num_payments * discount / (1 + monthly_rates)) / annuity ** 2
+    return payments, slope
+
+
+@timed()
+def solve_annual_rate(principals, payments, years, tolerance=1e-10, max_iterations=100, payments_per_year=12,
+                      day_count='nominal'):
+    """
+    Find the annual rate at which each loan's payment equals the given payment.
+
+    Uses Newton's method safeguarded by a bisection bracket per loan: a step
+    that leaves the bracket is replaced by the midpoint. The payment is
+    increasing in the rate, so the bracket [0, payment / principal] always
+    contains the root. Only loans that have not converged are updated in each
+    iteration.
+
+    Args:
+        principals (array-like): Loan amounts
+        payments (array-like): Monthly payments
+        years (array-like): Loan terms in years
+        tolerance (float): Convergence tolerance on the monthly rate
+        max_iterations (int): Iteration limit
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        tuple: (annual_rates, converged) - rates as percentages (nan when the
+            payment is below principal / months and no rate fits) and a boolean
+            convergence mask; plain values for scalar inputs
+    """
+    principals, payments, years = np.broadcast_arrays(np.asarray(principals, dtype=float),
+                                                      np.asarray(payments, dtype=float),
+                                                      np.asarray(years, dtype=float))
+    num_payments = np.rint(years * payments_per_year)
+    # The periodic rate is proportional to the annual rate under every convention
+    percent_per_unit = 1 / periodic_rate(1.0, payments_per_year, day_count)
+    shape = principals.shape
+    principals, payments, num_payments = principals.ravel(), payments.ravel(), num_payments.ravel()
+
+    rates = np.full(principals.shape, np.nan)
+    converged = np.zeros(principals.shape, dtype=bool)
+
+    # Zero-rate loans and payments too small to ever amortize the loan
+    zero_payment = principals / num_payments
+    at_zero = np.isclose(payments, zero_payment, rtol=1e-12, atol=0)
+    rates[at_zero] = 0.0
+    converged[at_zero] = True
+    active = np.flatnonzero((payments > zero_payment) & ~at_zero)
+
+    low = np.zeros(len(active))
+    high = payments[active] / principals[active]
+    # Start from the rate of a perpetuity-style guess blended with the bracket midpoint
+    guess = np.clip(high - 1 / num_payments[active], 0, None)
+    guess = np.where((guess > low) & (guess < high), guess, (low + high) / 2)
+
+    for _ in range(max_iterations):
+        if not len(active):
+            break
+        p, m, n = principals[active], payments[active], num_payments[active]
+        value, slope = _payment_and_slope(p, guess, n)
+        residual = value - m
+
+        # Shrink the bracket around the root
+        too_high = residual > 0
+        high = np.where(too_high, guess, high)
+        low = np.where(too_high, low, guess)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = guess - residual / slope
+        outside = ~np.isfinite(step) | (step < low) | (step > high)
+        step = np.where(outside, (low + high) / 2, step)
+
+        # An exact hit keeps the current guess; otherwise stop once the step stalls
+        exact = np.abs(residual) <= tolerance * m
+        step = np.where(exact, guess, step)
+        done = exact | (np.abs(step - guess) <= tolerance * np.maximum(guess, 1e-12))
+        rates[active[done]] = step[done] * percent_per_unit
+        converged[active[done]] = True
+
+        keep = ~done
+        active, guess, low, high = active[keep], step[keep], low[keep], high[keep]
+
+    # Best estimate for anything that ran out of iterations
+    rates[active] = guess * percent_per_unit
+
+    return _as_result(rates.reshape(shape), converged.reshape(shape))
+
+
+@timed()
+def solve_term(principals, annual_rates, payments, payments_per_year=12, day_count='nominal'):
+    """
+    Find the term needed to repay each loan with the given monthly payment.
+
+    Solved in closed form: n = -log(1 - P r / M) / log(1 + r), or P / M at a
+    zero rate. The result is fractional; the last payment is a partial one.
+
+    Args:
+        principals (array-like): Loan amounts
+        annual_rates (array-like): Annual interest rates as percentages
+        payments (array-like): Monthly payments
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        numpy.ndarray or float: Terms in years (inf when the payment does not
+            cover the first month's interest)
+    """
+    principals = np.asarray(principals, dtype=float)
+    monthly_rates = periodic_rate(np.asarray(annual_rates, dtype=float), payments_per_year, day_count)
+    payments = np.asarray(payments, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        coverage = 1 - principals * monthly_rates / payments
+        months = np.where(coverage > 0, -np.log(np.where(coverage > 0, coverage, 1)) / np.log1p(monthly_rates), np.inf)
+        months = np.where(monthly_rates == 0, principals / payments, months)
+
+    return _as_result(months / payments_per_year)
+
+
+@timed()
+def solve_principal(payments, annual_rates, years, payments_per_year=12, day_count='nominal'):
+    """
+    Find the largest loan amount that a monthly payment can repay.
+
+    Args:
+        payments (array-like): Monthly payments
+        annual_rates (array-like): Annual interest rates as percentages
+        years (array-like): Loan terms in years
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        numpy.ndarray or float: Affordable principal for each payment
+    """
+    # The payment is linear in the principal, so one forward evaluation gives the answer
+    unit_payments = np.asarray(calculate_monthly_payment_batch(1.0, annual_rates, years, payments_per_year, day_count))
+    return _as_result(np.asarray(payments, dtype=float) / unit_payments)
@@ -0,0 +1,269 @@
+"""
+Headless batch processing for the Loan Calculator
+Prices whole portfolios from the command line without importing tkinter
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+import numpy as np
+from NumericalMethods.loan_calculations import calculate_loan_totals_batch, count_payments, periodic_rate, period_label
+from NumericalMethods.cache import cached_amortization_schedule_batch
+from NumericalMethods.fixed_point import generate_amortization_schedule_cents_batch
+from NumericalMethods.solvers import solve_annual_rate, solve_term, solve_principal
+from data_io import (CSV_BUFFER_SIZE, PORTFOLIO_CSV_HEADER, ScheduleStoreWriter, flatten_schedule_batch,
+                     format_schedule_batch_csv)
+
+PORTFOLIO_COLUMNS = {
+    'principal': ('principal', 'amount', 'loan_amount'),
+    'rate': ('rate', 'annual_rate', 'interest_rate'),
+    'term': ('term', 'years', 'term_years'),
+    'payment': ('payment', 'monthly_payment'),
+}
+# Input columns needed for each solve-for mode
+SOLVE_INPUTS = {
+    'payment': ('principal', 'rate', 'term'),
+    'rate': ('principal', 'payment', 'term'),
+    'term': ('principal', 'rate', 'payment'),
+    'principal': ('payment', 'rate', 'term'),
+}
+RESULT_CSV_HEADER = ['Loan', 'Principal', 'Rate', 'Term', 'Payment', 'TotalPaid', 'TotalInterest']
+
+
+def iter_portfolio(file_path, columns=('principal', 'rate', 'term'), chunk_size=5000):
+    """
+    Read a portfolio CSV file a chunk of rows at a time.
+
+    The header row is matched case-insensitively against the aliases in
+    PORTFOLIO_COLUMNS, e.g. 'amount', 'annual_rate' and 'years'.
+
+    Args:
+        file_path (str): Path to the portfolio CSV file
+        columns (tuple): Columns to read, in order (keys of PORTFOLIO_COLUMNS)
+        chunk_size (int): Number of rows per chunk
+
+    Yields:
+        tuple: One numpy array per requested column, at most chunk_size long
+    """
+    with open(file_path, newline='') as portfolio_file:
+        usecols = _portfolio_usecols(portfolio_file.readline(), columns)
+        while True:
+            lines = list(islice(portfolio_file, chunk_size))
+            if not lines:
+                return
+            data = np.loadtxt(lines, delimiter=',', usecols=usecols, ndmin=2)
+            if len(data):
+                yield tuple(data[:, i] for i in range(len(columns)))
+
+
+def _portfolio_usecols(header_line, columns):
+    """Positions of the requested columns in a portfolio header row"""
+    header = [name.strip().lower() for name in header_line.split(',')]
+    usecols = []
+    for column in columns:
+        aliases = PORTFOLIO_COLUMNS[column]
+        matches = [i for i, name in enumerate(header) if name in aliases]
+        if not matches:
+            raise ValueError(f"Portfolio file is missing a '{column}' column")
+        usecols.append(matches[0])
+    return usecols
+
+
+def process_chunk(task):
+    """
+    Price one chunk of a portfolio. Runs inside a worker process.
+
+    Args:
+        task (tuple): (first_index, principals, annual_rates, years, include_schedules,
+            rounding, solve_for, payments, payments_per_year, day_count,
+            include_store); in a solve mode the unknown column is None
+
+    Returns:
+        tuple: (results_csv_text, schedules_csv_text, schedule_rows, unsolved_loans,
+            store_chunk) where store_chunk is None, or the arguments of
+            ScheduleStoreWriter.append for the chunk's loans
+    """
+    (first_index, principals, annual_rates, years, include_schedules, rounding, solve_for, payments,
+     payments_per_year, day_count, include_store) = task
+    frequency = {'payments_per_year': payments_per_year, 'day_count': day_count}
+    if solve_for == 'payment':
+        payments, total_paid, total_interest = calculate_loan_totals_batch(principals, annual_rates, years, **frequency)
+        unsolved = 0
+    else:
+        if solve_for == 'rate':
+            solved, converged = solve_annual_rate(principals, payments, years, **frequency)
+        else:
+            if solve_for == 'term':
+                solved = solve_term(principals, annual_rates, payments, **frequency)
+            else:
+                solved = solve_principal(payments, annual_rates, years, **frequency)
+            converged = np.isfinite(solved)
+        solved = np.where(converged, solved, np.nan)
+        principals, annual_rates, years = (solved if column == solve_for else values for column, values in
+                                           (('principal', principals), ('rate', annual_rates), ('term', years)))
+        # Same whole-payment count as calculate_loan_totals_batch; loans without a solution get nan throughout
+        total_paid = np.where(converged, payments * count_payments(np.where(converged, years, 0), payments_per_year),
+                              np.nan)
+        total_interest = total_paid - principals
+        unsolved = int(np.count_nonzero(~converged))
+
+    loan_ids = np.arange(first_index, first_index + len(principals))
+    rows = np.column_stack([loan_ids, principals, annual_rates, years, payments, total_paid, total_interest])
+    row_format = "%d,%.2f,%.4f,%g,%.2f,%.2f,%.2f\r\n"
+    results_text = (row_format * len(rows)) % tuple(rows.ravel().tolist())
+
+    schedules_text, schedule_rows, store_chunk = "", 0, None
+    if include_schedules or include_store:
+        if rounding is None:
+            # Duplicate products are scheduled once and shared through the schedule cache
+            batch = cached_amortization_schedule_batch(principals, annual_rates, years, **frequency)
+        else:
+            batch = generate_amortization_schedule_cents_batch(principals, annual_rates, years, rounding, **frequency)
+            for column in ('payment', 'interest', 'principal', 'balance'):
+                batch[column] = batch[column] / 100
+        if include_schedules:
+            schedules_text, schedule_rows = format_schedule_batch_csv(batch, first_index)
+        if include_store:
+            store_chunk = (principals, annual_rates, years, batch['num_payments'], flatten_schedule_batch(batch))
+
+    return results_text, schedules_text, schedule_rows, unsolved, store_chunk
+
+
+def _ordered_results(executor, tasks, window):
+    """
+    Run tasks on a process pool and yield their results in task order.
+
+    At most `window` chunks are queued or running at once; the next task is
+    only read and submitted after the oldest result has been taken, so
+    results never pile up ahead of the writer.
+    """
+    pending = deque()
+    for task in tasks:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(process_chunk, task))
+    while pending:
+        yield pending.popleft().result()
+
+
+def run_batch(input_path, output_path, schedules_path=None, workers=None, chunk_size=5000, rounding=None,
+              solve_for='payment', store_path=None, payments_per_year=12, day_count='nominal'):
+    """
+    Price every loan of a portfolio file and write the results to disk.
+
+    The input is read a chunk at a time and chunks are distributed across a
+    process pool, with at most two per worker in flight, and written back in
+    input order as they complete; memory use depends on the chunk size and
+    worker count, not on the portfolio size. With a schedule store, one extra
+    pass over the term column sizes the file before the chunks fill it.
+
+    Args:
+        input_path (str): Portfolio CSV file with principal, rate and term columns
+        output_path (str): Destination CSV for payments and totals
+        schedules_path (str): Optional destination CSV for full schedules
+        workers (int): Number of worker processes (None uses all CPUs, 1 runs inline)
+        chunk_size (int): Number of loans per scheduled chunk
+        rounding (str): None for exact schedules, or 'half_even'/'half_up' for
+            cent-exact schedules from the integer-cents engine
+        solve_for (str): Column to compute: 'payment' (default), or 'rate',
+            'term' or 'principal' from a portfolio that has a payment column
+            instead; schedules are only available for 'payment'
+        store_path (str): Optional destination for every schedule in the binary
+            schedule store format (exact schedules only)
+        payments_per_year (int): Payment frequency of every loan (12 = monthly);
+            payments in the input and output are per period
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        dict: Run statistics ('loans', 'schedule_rows', 'store_rows', 'unsolved',
+            'seconds', 'rows_per_second', 'schedule_rows_per_second')
+    """
+    if solve_for not in SOLVE_INPUTS:
+        raise ValueError(f"Unknown solve mode '{solve_for}', expected one of {', '.join(SOLVE_INPUTS)}")
+    if solve_for != 'payment' and (schedules_path is not None or store_path is not None):
+        raise ValueError("Schedules can only be written when solving for the payment")
+    if rounding is not None and store_path is not None:
+        raise ValueError("The schedule store holds exact schedules; drop the rounding option")
+    periodic_rate(0.0, payments_per_year, day_count)  # rejects unknown day counts before any work
+
+    start_time = time.perf_counter()
+    input_columns = SOLVE_INPUTS[solve_for]
+
+    def read_chunks(columns):
+        for values in iter_portfolio(input_path, columns, chunk_size):
+            for column, column_values in zip(columns, values):
+                if np.any(column_values < 0) or (column != 'rate' and np.any(column_values == 0)):
+                    raise ValueError("Portfolio rows need a positive principal, term and payment "
+                                     "and a non-negative rate")
+            yield dict(zip(columns, values))
+
+    store = None
+    if store_path is not None:
+        # The store is sized up front from a pass over the term column alone
+        n_loans = n_rows = 0
+        for chunk in read_chunks(('term',)):
+            n_loans += len(chunk['term'])
+            n_rows += int(count_payments(chunk['term'], payments_per_year).sum())
+        store = ScheduleStoreWriter(store_path, n_loans, n_rows)
+
+    include_schedules = schedules_path is not None
+    loan_count = 0
+
+    def make_tasks():
+        nonlocal loan_count
+        for chunk in read_chunks(input_columns):
+            start = loan_count
+            loan_count += len(next(iter(chunk.values())))
+            yield (start, chunk.get('principal'), chunk.get('rate'), chunk.get('term'), include_schedules, rounding,
+                   solve_for, chunk.get('payment'), payments_per_year, day_count, store is not None)
+
+    workers = workers or os.cpu_count() or 1
+    tasks = make_tasks()
+    first_tasks = list(islice(tasks, 2))
+    tasks = chain(first_tasks, tasks)
+    schedule_rows = unsolved = store_rows = 0
+    schedules_file = open(schedules_path, 'w', newline='', buffering=CSV_BUFFER_SIZE) if include_schedules else None
+    try:
+        with open(output_path, 'w', newline='', buffering=CSV_BUFFER_SIZE) as results_file:
+            results_file.write(",".join(RESULT_CSV_HEADER) + "\r\n")
+            if schedules_file:
+                header = ['Loan', period_label(payments_per_year)] + PORTFOLIO_CSV_HEADER[2:]
+                schedules_file.write(",".join(header) + "\r\n")
+
+            if workers == 1 or len(first_tasks) <= 1:
+                outputs = map(process_chunk, tasks)
+                executor = None
+            else:
+                executor = ProcessPoolExecutor(max_workers=workers)
+                outputs = _ordered_results(executor, tasks, 2 * workers)
+
+            try:
+                for results_text, schedules_text, rows, chunk_unsolved, store_chunk in outputs:
+                    results_file.write(results_text)
+                    if schedules_file:
+                        schedules_file.write(schedules_text)
+                    if store_chunk is not None:
+                        store.append(*store_chunk, payments_per_year=payments_per_year, day_count=day_count)
+                    schedule_rows += rows
+                    unsolved += chunk_unsolved
+            finally:
+                if executor:
+                    executor.shutdown(cancel_futures=True)
+        if store is not None:
+            store_rows = store.close()
+    finally:
+        if schedules_file:
+            schedules_file.close()
+
+    seconds = time.perf_counter() - start_time
+    return {
+        'loans': loan_count,
+        'schedule_rows': schedule_rows,
+        'store_rows': store_rows,
+        'unsolved': unsolved,
+        'seconds': seconds,
+        'rows_per_second': loan_count / seconds if seconds > 0 else float('inf'),
+        'schedule_rows_per_second': schedule_rows / seconds if seconds > 0 else float('inf'),
+    }
@@ -0,0 +1,270 @@
+"""
+Benchmark Suite for the Loan Calculator
+Contains scaling benchmarks for the numerical core, CSV export and the amortization table
+
+Run all benchmarks and compare against a saved baseline:
+    python benchmarks.py --save baseline.json
+    python benchmarks.py --compare baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from NumericalMethods.loan_calculations import (calculate_monthly_payment, calculate_monthly_payment_batch,
+                                                generate_amortization_schedule,
+                                                generate_amortization_schedule_batch)
+from NumericalMethods.interpolation import newton_divided_difference_interpolation, get_divided_difference_table
+from data_io import write_schedule_csv
+
+SCHEDULE_MONTHS = (120, 360, 1200, 6000)
+PORTFOLIO_SIZES = (1000, 10000, 100000)
+SCHEDULED_PORTFOLIO_SIZES = (100, 1000, 5000)
+INTERPOLATION_POINTS = (5, 10, 20, 40)
+QUICK_SCALE = {'schedule': SCHEDULE_MONTHS[:2], 'portfolio': PORTFOLIO_SIZES[:2],
+               'scheduled_portfolio': SCHEDULED_PORTFOLIO_SIZES[:2], 'points': INTERPOLATION_POINTS[:2]}
+
+
+def _portfolio(size, seed=0):
+    """Random but reproducible (principals, annual_rates, years) arrays"""
+    rng = np.random.default_rng(seed)
+    return rng.uniform(10000, 1000000, size), rng.uniform(1, 12, size), rng.integers(5, 31, size).astype(float)
+
+
+def _interpolation_points(count):
+    """Evenly spaced (months, balances) samples of a 30-year schedule"""
+    schedule = generate_amortization_schedule(250000, 5.5, 30)
+    months = np.linspace(0, 359, count).astype(int)
+    balances = np.r_[250000.0, schedule['balance']][months]
+    return months.tolist(), balances.tolist()
+
+
+def bench_monthly_payment(size):
+    """Scalar calculate_monthly_payment called once per loan"""
+    principals, rates, years = (values.tolist() for values in _portfolio(size))
+    return lambda: [calculate_monthly_payment(p, r, y) for p, r, y in zip(principals, rates, years)], size
+
+
+def bench_monthly_payment_batch(size):
+    """Vectorized payments for a whole portfolio"""
+    principals, rates, years = _portfolio(size)
+    return lambda: calculate_monthly_payment_batch(principals, rates, years), size
+
+
+def bench_schedule(months):
+    """One schedule of the given length"""
+    return lambda: generate_amortization_schedule(250000, 5.5, months / 12), months
+
+
+def bench_schedule_weekly(rows):
+    """One weekly daily-accrual schedule with the given number of rows"""
+    return lambda: generate_amortization_schedule(250000, 5.5, rows / 52, 52, 'actual/365'), rows
+
+
+def bench_schedule_batch(size):
+    """Schedules for a whole portfolio in one call"""
+    principals, rates, years = _portfolio(size)
+    return lambda: generate_amortization_schedule_batch(principals, rates, years), size
+
+
+def bench_newton_interpolation(points):
+    """newton_divided_difference_interpolation at 100 targets"""
+    months, balances = _interpolation_points(points)
+    targets = np.linspace(1, 359, 100).tolist()
+    return lambda: [newton_divided_difference_interpolation(months, balances, t) for t in targets], 100
+
+
+def bench_divided_difference_table(points):
+    """Full divided difference table"""
+    months, balances = _interpolation_points(points)
+    return lambda: get_divided_difference_table(months, balances), points * points
+
+
+def bench_export_csv(months):
+    """write_schedule_csv, the export_to_csv writer"""
+    schedule = generate_amortization_schedule(250000, 5.5, months / 12)
+    fd, path = tempfile.mkstemp(suffix='.csv', prefix='loan_benchmark_')
+    os.close(fd)
+    return lambda: write_schedule_csv(path, schedule), months, lambda: os.remove(path)
+
+
+def bench_populate_table(months):
+    """populate_amortization_table plus rendering the visible rows; needs a display"""
+    import tkinter as tk
+    from loan_calculator import LoanCalculator
+
+    root = tk.Tk()
+    root.withdraw()
+    app = LoanCalculator(root, lazy_tabs=False)
+    app.amortization_data = generate_amortization_schedule(250000, 5.5, months / 12)
+
+    def run():
+        app.populate_amortization_table()
+        root.update_idletasks()
+    # Closing the app stops its worker pools and destroys the root once this size is timed
+    return run, months, app.close
+
+
+# name -> (benchmark factory, scaling axis, unit of work); a factory returns
+# (callable, work units) plus an optional cleanup called after measuring
+BENCHMARKS = {
+    'calculate_monthly_payment': (bench_monthly_payment, 'portfolio', 'loans'),
+    'calculate_monthly_payment_batch': (bench_monthly_payment_batch, 'portfolio', 'loans'),
+    'generate_amortization_schedule': (bench_schedule, 'schedule', 'rows'),
+    'generate_amortization_schedule_weekly': (bench_schedule_weekly, 'schedule', 'rows'),
+    'generate_amortization_schedule_batch': (bench_schedule_batch, 'scheduled_portfolio', 'loans'),
+    'newton_divided_difference_interpolation': (bench_newton_interpolation, 'points', 'evaluations'),
+    'get_divided_difference_table': (bench_divided_difference_table, 'points', 'cells'),
+    'export_to_csv': (bench_export_csv, 'schedule', 'rows'),
+    'populate_amortization_table': (bench_populate_table, 'schedule', 'rows'),
+}
+SCALES = {'schedule': SCHEDULE_MONTHS, 'portfolio': PORTFOLIO_SIZES,
+          'scheduled_portfolio': SCHEDULED_PORTFOLIO_SIZES, 'points': INTERPOLATION_POINTS}
+
+
+def measure(func, min_time=0.2, max_repeat=50):
+    """
+    Time a callable and record its peak traced memory.
+
+    Timing takes the best of several runs; memory is measured in a separate
+    run because tracemalloc slows allocation-heavy code down.
+
+    Args:
+        func (callable): Benchmark body
+        min_time (float): Keep repeating until this much time has been spent
+        max_repeat (int): Upper bound on timed repetitions
+
+    Returns:
+        dict: 'seconds' (best run), 'repeats' and 'peak_bytes'
+    """
+    func()  # warm-up
+    best, spent, repeats = float('inf'), 0.0, 0
+    while repeats < max_repeat and (spent < min_time or repeats < 3):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best, spent, repeats = min(best, elapsed), spent + elapsed, repeats + 1
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': best, 'repeats': repeats, 'peak_bytes': peak}
+
+
+def run_benchmarks(names=None, quick=False, min_time=0.2, log=print):
+    """
+    Run the benchmark suite.
+
+    Args:
+        names (list): Benchmarks to run (default: all)
+        quick (bool): Use only the smallest sizes of each scaling axis
+        min_time (float): Minimum timing budget per size
+        log (callable): Progress output, or None for silence
+
+    Returns:
+        dict: {benchmark: {size: measurement}} where each measurement also has
+            'throughput' (work units per second) and 'unit'; benchmarks that
+            cannot run here (e.g. no display) have a 'skipped' reason instead
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        factory, axis, unit = BENCHMARKS[name]
+        results[name] = {}
+        for size in (QUICK_SCALE if quick else SCALES)[axis]:
+            try:
+                func, work, *cleanup = factory(size)
+            except Exception as e:
+                results[name] = {'skipped': f"{type(e).__name__}: {e}"}
+                if log:
+                    log(f"{name:<42} skipped ({results[name]['skipped']})")
+                break
+            try:
+                measurement = measure(func, min_time)
+            finally:
+                for done in cleanup:
+                    done()
+            measurement['throughput'] = work / measurement['seconds']
+            measurement['unit'] = unit
+            results[name][str(size)] = measurement
+            if log:
+                log(f"{name:<42} {axis}={size:<7} {measurement['seconds'] * 1000:>10.3f} ms "
+                    f"{measurement['throughput']:>14,.0f} {unit}/s {measurement['peak_bytes'] / 1024:>10,.0f} KiB")
+    return results
+
+
+def save_results(file_path, results):
+    """Write results with enough environment detail to judge comparisons"""
+    document = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(file_path, 'w') as f:
+        json.dump(document, f, indent=2)
+
+
+def find_regressions(results, baseline, threshold=0.25):
+    """
+    Compare results against a baseline.
+
+    Args:
+        results (dict): Output of run_benchmarks
+        baseline (dict): 'results' of a saved baseline file
+        threshold (float): Allowed relative slowdown or memory growth (0.25 = 25%)
+
+    Returns:
+        list: (benchmark, size, metric, baseline_value, current_value) for every
+            time or peak-memory figure that got worse by more than the threshold
+    """
+    regressions = []
+    for name, sizes in results.items():
+        for size, current in sizes.items():
+            previous = baseline.get(name, {}).get(size)
+            if not isinstance(current, dict) or not isinstance(previous, dict):
+                continue
+            for metric in ('seconds', 'peak_bytes'):
+                if previous[metric] > 0 and current[metric] > previous[metric] * (1 + threshold):
+                    regressions.append((name, size, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Loan Calculator benchmark suite")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument('--quick', action='store_true', help="Smallest sizes only")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Timing budget per size in seconds")
+    parser.add_argument('--save', metavar='FILE', help="Write results to a JSON baseline")
+    parser.add_argument('--compare', metavar='FILE', help="Compare against a JSON baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Relative slowdown or memory growth counted as a regression (default: 0.25)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run_benchmarks(args.only, args.quick, args.min_time)
+
+    if args.save:
+        save_results(args.save, results)
+        print(f"Results saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = find_regressions(results, baseline, args.threshold)
+        for name, size, metric, before, after in regressions:
+            print(f"REGRESSION {name} [{size}] {metric}: {before:.6g} -> {after:.6g} ({after / before - 1:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
@@ -0,0 +1,115 @@
+"""
+Cents Engine Check for the Loan Calculator
+Compares the vectorized integer-cents engine with a one-loan-at-a-time Decimal reference
+
+Check every rounding rule, frequency and day count on random loans:
+    python check_cents.py
+    python check_cents.py --samples 1000 --seed 7
+"""
+
+import argparse
+import sys
+from decimal import Decimal, ROUND_HALF_EVEN, ROUND_HALF_UP
+import numpy as np
+from NumericalMethods.loan_calculations import (DAY_COUNT_BASES, PAYMENT_FREQUENCIES, PERIOD_DAYS,
+                                                calculate_monthly_payment_batch, count_payments)
+from NumericalMethods.fixed_point import (RATE_DECIMALS, ROUNDING_MODES, generate_amortization_schedule_cents_batch,
+                                          to_cents)
+
+
+def reference_schedule_cents(principal, annual_rate, years, rounding='half_even', payments_per_year=12,
+                             day_count='nominal'):
+    """
+    Decimal, one-loan-at-a-time version of the cents engine, for checking it.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate as percentage
+        years (float): Loan term in years
+        rounding (str): 'half_even' or 'half_up'
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        list: (payment, interest, principal, balance) tuples in integer cents
+    """
+    mode = {'half_even': ROUND_HALF_EVEN, 'half_up': ROUND_HALF_UP}[rounding]
+    basis = DAY_COUNT_BASES[day_count]
+    rate = Decimal(repr(round(float(annual_rate), RATE_DECIMALS)))
+    if basis is None:
+        period_fraction = Decimal(payments_per_year)
+    elif payments_per_year in PERIOD_DAYS:
+        period_fraction = Decimal(basis) / PERIOD_DAYS[payments_per_year]
+    else:
+        period_fraction = Decimal(payments_per_year * basis) / 365
+    num_payments = count_payments(years, payments_per_year)
+    level = int(to_cents([calculate_monthly_payment_batch(principal, annual_rate, years, payments_per_year,
+                                                          day_count)], rounding)[0])
+
+    balance, rows = int(to_cents([principal], rounding)[0]), []
+    for period in range(num_payments):
+        # Multiply before dividing so only the final division is inexact
+        interest = int((balance * rate / (100 * period_fraction)).quantize(Decimal(1), rounding=mode))
+        principal_part = balance if period == num_payments - 1 else min(level - interest, balance)
+        balance -= principal_part
+        rows.append((principal_part + interest, interest, principal_part, balance))
+    return rows
+
+
+def check_cents_engine(samples=300, seed=0, rounding_modes=tuple(ROUNDING_MODES), payments_per_year=12,
+                       day_count='nominal'):
+    """
+    Compare the vectorized cents engine with reference_schedule_cents on random loans.
+
+    Args:
+        samples (int): Number of random loans
+        seed (int): Random seed
+        rounding_modes (tuple): Rounding rules to check
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        list: (rounding, principal, annual_rate, years) of every loan whose
+            schedule differs from the reference; empty when all match
+    """
+    rng = np.random.default_rng(seed)
+    principals = np.round(rng.uniform(100, 1000000, samples), 2)
+    annual_rates = np.round(rng.uniform(0.5, 15, samples), 3)
+    years = rng.integers(1, 31, samples).astype(float)
+
+    mismatches = []
+    for rounding in rounding_modes:
+        batch = generate_amortization_schedule_cents_batch(principals, annual_rates, years, rounding,
+                                                           payments_per_year, day_count)
+        for i in range(samples):
+            n = int(batch['num_payments'][i])
+            engine = list(zip(*(batch[column][i, :n].tolist()
+                                for column in ('payment', 'interest', 'principal', 'balance'))))
+            reference = reference_schedule_cents(principals[i], annual_rates[i], years[i], rounding,
+                                                 payments_per_year, day_count)
+            if engine != reference:
+                mismatches.append((rounding, float(principals[i]), float(annual_rates[i]), float(years[i])))
+    return mismatches
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check the integer-cents engine against a Decimal reference")
+    parser.add_argument('--samples', type=int, default=300, help="Random loans per combination (default: 300)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    failed = False
+    for payments_per_year in PAYMENT_FREQUENCIES.values():
+        for day_count in DAY_COUNT_BASES:
+            mismatches = check_cents_engine(args.samples, args.seed, payments_per_year=payments_per_year,
+                                            day_count=day_count)
+            label = f"{payments_per_year} payments/year, {day_count}"
+            if mismatches:
+                failed = True
+                print(f"✗ {label}: {len(mismatches)} mismatches, e.g. {mismatches[0]}")
+            else:
+                print(f"✓ {label}")
+    sys.exit(1 if failed else 0)
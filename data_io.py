@@ -0,0 +1,459 @@
+"""
+Data import/export helpers for the Loan Calculator
+Writes amortization schedules to disk in bulk without per-row Python objects,
+as CSV text or as a memory-mapped binary schedule store
+"""
+
+import struct
+import numpy as np
+from NumericalMethods.loan_calculations import (iter_schedule_batches, generate_amortization_schedule_batch,
+                                                count_payments, period_label, DAY_COUNT_BASES)
+from NumericalMethods.schedule import AmortizationSchedule, SCHEDULE_COLUMNS
+
+CSV_HEADER = ['Month', 'Payment', 'Interest', 'Principal', 'Balance']
+PORTFOLIO_CSV_HEADER = ['Loan'] + CSV_HEADER
+SENSITIVITY_CSV_HEADER = ['Principal', 'Rate', 'Term', 'Payment', 'TotalPaid', 'TotalInterest']
+CSV_BUFFER_SIZE = 1 << 20
+
+# Binary schedule store: a 64-byte header, one STORE_LOAN_DTYPE record per
+# loan, then each schedule column for all loans back to back (little-endian,
+# every section 8-byte aligned)
+STORE_MAGIC = b'LOANSTOR'
+STORE_VERSION = 1
+STORE_HEADER = struct.Struct('<8sIIQQ')  # magic, version, reserved, n_loans, n_rows
+STORE_HEADER_SIZE = 64
+# day_count is an index into STORE_DAY_COUNTS
+STORE_LOAN_DTYPE = np.dtype([('principal', '<f8'), ('annual_rate', '<f8'), ('years', '<f8'),
+                             ('first_row', '<i8'), ('num_rows', '<i8'),
+                             ('payments_per_year', '<i8'), ('day_count', '<i8')])
+STORE_DAY_COUNTS = tuple(DAY_COUNT_BASES)
+STORE_COLUMN_DTYPES = {'month': np.dtype('<i4'), 'payment': np.dtype('<f8'), 'interest': np.dtype('<f8'),
+                       'principal': np.dtype('<f8'), 'balance': np.dtype('<f8')}
+
+
+def _format_rows(rows, row_format):
+    """
+    Format a 2-D block of numbers as CSV text with a single string operation.
+
+    Args:
+        rows (numpy.ndarray): Values to write, one schedule row per array row
+        row_format (str): printf-style format for one row, including the line ending
+
+    Returns:
+        str: Formatted CSV text for the whole block
+    """
+    if len(rows) == 0:
+        return ""
+    return (row_format * len(rows)) % tuple(rows.ravel().tolist())
+
+
+def write_schedule_csv(file_path, schedule, chunk_rows=10000, lineterminator='\r\n', payments_per_year=12):
+    """
+    Write a single amortization schedule to a CSV file.
+
+    Args:
+        file_path (str): Destination path
+        schedule (AmortizationSchedule): Schedule to export
+        chunk_rows (int): Number of rows formatted per write
+        lineterminator (str): Line ending, matching csv.writer by default
+        payments_per_year (int): Payment frequency; names the first column
+            'Month' for monthly schedules and 'Period' otherwise
+
+    Returns:
+        int: Number of schedule rows written
+    """
+    columns = np.column_stack([schedule[name] for name in ('month', 'payment', 'interest', 'principal', 'balance')])
+    row_format = "%d,%.2f,%.2f,%.2f,%.2f" + lineterminator
+
+    header = [period_label(payments_per_year)] + CSV_HEADER[1:]
+
+    with open(file_path, 'w', newline='', buffering=CSV_BUFFER_SIZE) as csvfile:
+        csvfile.write(",".join(header) + lineterminator)
+        for start in range(0, len(columns), chunk_rows):
+            csvfile.write(_format_rows(columns[start:start + chunk_rows], row_format))
+
+    return len(columns)
+
+
+def export_portfolio_schedules_csv(file_path, loans, loans_per_chunk=1000, lineterminator='\r\n',
+                                   payments_per_year=12, day_count='nominal'):
+    """
+    Stream the amortization schedules of many loans into one CSV file.
+
+    Loans are consumed lazily and scheduled in vectorized chunks, so memory
+    use stays constant no matter how many loans or rows are exported.
+
+    Args:
+        file_path (str): Destination path
+        loans (iterable): (principal, annual_rate, years) tuples
+        loans_per_chunk (int): Number of loans scheduled and written per chunk
+        lineterminator (str): Line ending, matching csv.writer by default
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        int: Number of schedule rows written
+    """
+    total_rows = 0
+    header = ['Loan', period_label(payments_per_year)] + PORTFOLIO_CSV_HEADER[2:]
+
+    with open(file_path, 'w', newline='', buffering=CSV_BUFFER_SIZE) as csvfile:
+        csvfile.write(",".join(header) + lineterminator)
+        for first_index, batch in iter_schedule_batches(loans, loans_per_chunk, payments_per_year, day_count):
+            text, rows = format_schedule_batch_csv(batch, first_index, lineterminator)
+            csvfile.write(text)
+            total_rows += rows
+
+    return total_rows
+
+
+def flatten_schedule_batch(batch):
+    """
+    Keep only the rows of a schedule batch that belong to a loan.
+
+    Args:
+        batch (dict): Result of generate_amortization_schedule_batch
+
+    Returns:
+        dict: One 1-D array per schedule column, each loan's rows back to back
+    """
+    active = batch['month'][None, :] <= batch['num_payments'][:, None]
+    columns = {'month': np.broadcast_to(batch['month'][None, :], active.shape)[active]}
+    for name in ('payment', 'interest', 'principal', 'balance'):
+        columns[name] = batch[name][active]
+    return columns
+
+
+def format_schedule_batch_csv(batch, first_index=0, lineterminator='\r\n'):
+    """
+    Format a batch of schedules as CSV rows prefixed with a loan number.
+
+    Args:
+        batch (dict): Result of generate_amortization_schedule_batch
+        first_index (int): Loan number of the first loan in the batch
+        lineterminator (str): Line ending
+
+    Returns:
+        tuple: (csv_text, number_of_rows)
+    """
+    num_payments = batch['num_payments']
+    active = batch['month'][None, :] <= num_payments[:, None]
+    loan_ids = np.arange(first_index, first_index + len(num_payments))
+
+    rows = np.column_stack([
+        np.broadcast_to(loan_ids[:, None], active.shape)[active],
+        np.broadcast_to(batch['month'][None, :], active.shape)[active],
+        batch['payment'][active],
+        batch['interest'][active],
+        batch['principal'][active],
+        batch['balance'][active],
+    ])
+    return _format_rows(rows, "%d,%d,%.2f,%.2f,%.2f,%.2f" + lineterminator), len(rows)
+
+
+def write_sensitivity_grid_csv(file_path, grid, lineterminator='\r\n'):
+    """
+    Write a sensitivity grid to CSV, one row per principal/rate/term combination.
+
+    Args:
+        file_path (str): Destination path
+        grid (dict): Result of calculate_sensitivity_grid
+        lineterminator (str): Line ending, matching csv.writer by default
+
+    Returns:
+        int: Number of rows written
+    """
+    principal, rate, term = np.meshgrid(grid['principal'], grid['rate'], grid['term'], indexing='ij')
+    rows = np.column_stack([principal.ravel(), rate.ravel(), term.ravel(), grid['payment'].ravel(),
+                            grid['total_paid'].ravel(), grid['total_interest'].ravel()])
+
+    with open(file_path, 'w', newline='', buffering=CSV_BUFFER_SIZE) as csvfile:
+        csvfile.write(",".join(SENSITIVITY_CSV_HEADER) + lineterminator)
+        csvfile.write(_format_rows(rows, "%.2f,%.4f,%g,%.2f,%.2f,%.2f" + lineterminator))
+
+    return len(rows)
+
+
+def _store_layout(n_loans, n_rows):
+    """
+    Byte offsets of each section of a schedule store.
+
+    Args:
+        n_loans (int): Number of loans
+        n_rows (int): Total schedule rows over all loans
+
+    Returns:
+        tuple: ({section: offset} for 'loans' and every column, total file size)
+    """
+    offsets = {'loans': STORE_HEADER_SIZE}
+    position = STORE_HEADER_SIZE + n_loans * STORE_LOAN_DTYPE.itemsize
+    for name in SCHEDULE_COLUMNS:
+        offsets[name] = position
+        position += -(-n_rows * STORE_COLUMN_DTYPES[name].itemsize // 8) * 8
+    return offsets, position
+
+
+def _create_store(file_path, n_loans, n_rows):
+    """Write the header, size the file, and map the loan table and every column for writing"""
+    offsets, size = _store_layout(n_loans, n_rows)
+
+    with open(file_path, 'wb') as f:
+        f.write(STORE_HEADER.pack(STORE_MAGIC, STORE_VERSION, 0, n_loans, n_rows).ljust(STORE_HEADER_SIZE, b'\0'))
+        f.truncate(size)
+
+    loans = (np.memmap(file_path, dtype=STORE_LOAN_DTYPE, mode='r+', offset=offsets['loans'], shape=(n_loans,))
+             if n_loans else np.zeros(0, STORE_LOAN_DTYPE))
+    columns = {name: (np.memmap(file_path, dtype=STORE_COLUMN_DTYPES[name], mode='r+', offset=offsets[name],
+                                shape=(n_rows,))
+                      if n_rows else np.zeros(0, STORE_COLUMN_DTYPES[name]))
+               for name in SCHEDULE_COLUMNS}
+    return loans, columns
+
+
+def _flush_store(loans, columns):
+    """Write the mapped loan table and columns back to disk"""
+    for array in (loans, *columns.values()):
+        if isinstance(array, np.memmap):
+            array.flush()
+
+
+def _day_count_code(day_count):
+    """Index of a day count convention in STORE_DAY_COUNTS"""
+    try:
+        return STORE_DAY_COUNTS.index(day_count)
+    except ValueError:
+        raise ValueError(f"Unknown day count {day_count!r}") from None
+
+
+def _loan_table(principals, annual_rates, years, num_rows, payments_per_year=12, day_counts='nominal'):
+    """Build the per-loan index records with each loan's first row"""
+    num_rows = np.asarray(num_rows, dtype=np.int64)
+    if isinstance(day_counts, str):
+        day_count_codes = _day_count_code(day_counts)
+    else:
+        # Look up each distinct convention once and scatter the codes back
+        names, inverse = np.unique(np.asarray(day_counts, dtype=str), return_inverse=True)
+        day_count_codes = np.array([_day_count_code(str(name)) for name in names], dtype=np.int64)[inverse]
+    table = np.zeros(len(num_rows), dtype=STORE_LOAN_DTYPE)
+    table['principal'] = principals
+    table['annual_rate'] = annual_rates
+    table['years'] = years
+    table['payments_per_year'] = payments_per_year
+    table['day_count'] = day_count_codes
+    table['num_rows'] = num_rows
+    table['first_row'] = np.cumsum(num_rows) - num_rows
+    return table
+
+
+def write_schedule_store(file_path, schedules, loans):
+    """
+    Write one or more schedules to a binary schedule store.
+
+    Args:
+        file_path (str): Destination path
+        schedules (AmortizationSchedule or list): Schedule(s) to store
+        loans (tuple or list): (principal, annual_rate, years) or
+            (principal, annual_rate, years, payments_per_year, day_count)
+            for each schedule; the short form means monthly and 'nominal'
+
+    Returns:
+        int: Number of schedule rows written
+    """
+    if isinstance(schedules, AmortizationSchedule):
+        schedules, loans = [schedules], [loans]
+
+    loans = [tuple(loan) + (12, 'nominal')[len(loan) - 3:] for loan in loans]
+    principals, annual_rates, years, payments_per_year, day_counts = zip(*loans) if loans else ([],) * 5
+    table = _loan_table(principals, annual_rates, years, [len(schedule) for schedule in schedules],
+                        payments_per_year, day_counts)
+    n_rows = int(table['num_rows'].sum())
+    loans, columns = _create_store(file_path, len(table), n_rows)
+
+    loans[:] = table
+    for name, column in columns.items():
+        if len(column):
+            np.concatenate([schedule[name] for schedule in schedules], out=column)
+    _flush_store(loans, columns)
+
+    return n_rows
+
+
+def export_portfolio_schedules_store(file_path, principals, annual_rates, years, loans_per_chunk=1000,
+                                     payments_per_year=12, day_count='nominal'):
+    """
+    Schedule a whole portfolio straight into a binary schedule store.
+
+    Row counts are known from the terms, so the file is sized up front and
+    each vectorized chunk of schedules is copied into its place through a
+    memory map; memory use depends only on the chunk size.
+
+    Args:
+        file_path (str): Destination path
+        principals (array-like): Loan amounts
+        annual_rates (array-like): Annual interest rates as percentages
+        years (array-like): Loan terms in years
+        loans_per_chunk (int): Number of loans scheduled per chunk
+        payments_per_year (int): Payments per year (12 = monthly)
+        day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+
+    Returns:
+        int: Number of schedule rows written
+    """
+    principals, annual_rates, years = (np.atleast_1d(np.asarray(values, dtype=float))
+                                       for values in (principals, annual_rates, years))
+    writer = ScheduleStoreWriter(file_path, len(principals), int(count_payments(years, payments_per_year).sum()))
+
+    for start in range(0, len(principals), loans_per_chunk):
+        stop = start + loans_per_chunk
+        batch = generate_amortization_schedule_batch(principals[start:stop], annual_rates[start:stop], years[start:stop],
+                                                     payments_per_year, day_count)
+        writer.append(principals[start:stop], annual_rates[start:stop], years[start:stop], batch['num_payments'],
+                      flatten_schedule_batch(batch), payments_per_year, day_count)
+
+    return writer.close()
+
+
+class ScheduleStoreWriter:
+    """
+    Fills a binary schedule store chunk by chunk, in loan order.
+
+    The store is sized from the loan and row counts up front; each append
+    copies one chunk's loan records and flattened schedule rows into place
+    through memory maps, so memory use depends only on the chunk size.
+
+        writer = ScheduleStoreWriter('portfolio.loans', n_loans, n_rows)
+        writer.append(principals, annual_rates, years, num_rows, flatten_schedule_batch(batch))
+        writer.close()
+    """
+
+    def __init__(self, file_path, n_loans, n_rows):
+        self.file_path = file_path
+        self.n_loans = n_loans
+        self.n_rows = n_rows
+        self.loans, self.columns = _create_store(file_path, n_loans, n_rows)
+        self.loans_written = 0
+        self.rows_written = 0
+
+    def append(self, principals, annual_rates, years, num_rows, columns, payments_per_year=12, day_count='nominal'):
+        """
+        Store the next chunk of loans.
+
+        Args:
+            principals (array-like): Loan amounts
+            annual_rates (array-like): Annual interest rates as percentages
+            years (array-like): Loan terms in years
+            num_rows (array-like): Schedule length of each loan
+            columns (dict): The loans' schedules as flat columns (flatten_schedule_batch)
+            payments_per_year (int): Payments per year (12 = monthly)
+            day_count (str): Interest accrual convention, one of DAY_COUNT_BASES
+        """
+        table = _loan_table(principals, annual_rates, years, num_rows, payments_per_year, day_count)
+        n_rows = int(table['num_rows'].sum())
+        if self.loans_written + len(table) > self.n_loans or self.rows_written + n_rows > self.n_rows:
+            raise ValueError("More loans or rows than the store was sized for")
+
+        table['first_row'] += self.rows_written
+        self.loans[self.loans_written:self.loans_written + len(table)] = table
+        rows = slice(self.rows_written, self.rows_written + n_rows)
+        for name in SCHEDULE_COLUMNS:
+            self.columns[name][rows] = columns[name]
+        self.loans_written += len(table)
+        self.rows_written += n_rows
+
+    def close(self):
+        """
+        Flush the store to disk.
+
+        Returns:
+            int: Number of schedule rows written
+        """
+        _flush_store(self.loans, self.columns)
+        if (self.loans_written, self.rows_written) != (self.n_loans, self.n_rows):
+            raise ValueError(f"Schedule store {self.file_path} is incomplete: {self.loans_written:,} of "
+                             f"{self.n_loans:,} loans written")
+        return self.rows_written
+
+
+class ScheduleStore:
+    """
+    Read-only, memory-mapped view of a binary schedule store.
+
+    Opening a store only reads its header; loan records and rows are paged in
+    by the operating system as they are touched, so any loan of a very large
+    file can be sliced out without parsing the rest.
+
+        store = open_schedule_store('portfolio.loans')
+        store.loans['principal']   -> every loan's principal
+        store[42]                  -> AmortizationSchedule of loan 42 (zero-copy)
+    """
+
+    def __init__(self, file_path):
+        with open(file_path, 'rb') as f:
+            header = f.read(STORE_HEADER_SIZE)
+        if len(header) < STORE_HEADER_SIZE or header[:8] != STORE_MAGIC:
+            raise ValueError(f"{file_path} is not a schedule store")
+        _, version, _, n_loans, n_rows = STORE_HEADER.unpack_from(header)
+        if version != STORE_VERSION:
+            raise ValueError(f"Unsupported schedule store version {version}")
+
+        offsets, _ = _store_layout(n_loans, n_rows)
+        self.file_path = file_path
+        self.num_rows = n_rows
+        self.loans = (np.memmap(file_path, dtype=STORE_LOAN_DTYPE, mode='r', offset=offsets['loans'],
+                                shape=(n_loans,))
+                      if n_loans else np.zeros(0, STORE_LOAN_DTYPE))
+        self.columns = {name: (np.memmap(file_path, dtype=STORE_COLUMN_DTYPES[name], mode='r',
+                                         offset=offsets[name], shape=(n_rows,))
+                               if n_rows else np.zeros(0, STORE_COLUMN_DTYPES[name]))
+                        for name in SCHEDULE_COLUMNS}
+
+    def __len__(self):
+        return len(self.loans)
+
+    def __repr__(self):
+        return f"ScheduleStore({self.file_path!r}, loans={len(self)}, rows={self.num_rows})"
+
+    def loan(self, index):
+        """
+        Return the stored inputs of one loan.
+
+        Args:
+            index (int): Loan position in the store
+
+        Returns:
+            tuple: (principal, annual_rate, years, payments_per_year, day_count)
+        """
+        record = self.loans[index]
+        return (float(record['principal']), float(record['annual_rate']), float(record['years']),
+                int(record['payments_per_year']), STORE_DAY_COUNTS[int(record['day_count'])])
+
+    def schedule(self, index):
+        """
+        Return one loan's schedule as views into the mapped file.
+
+        Args:
+            index (int): Loan position in the store
+
+        Returns:
+            AmortizationSchedule: Schedule backed by the memory map
+        """
+        record = self.loans[index]
+        rows = slice(int(record['first_row']), int(record['first_row'] + record['num_rows']))
+        return AmortizationSchedule(*(self.columns[name][rows] for name in SCHEDULE_COLUMNS))
+
+    __getitem__ = schedule
+
+
+def open_schedule_store(file_path):
+    """
+    Open a binary schedule store for reading.
+
+    Args:
+        file_path (str): Path written by write_schedule_store or
+            export_portfolio_schedules_store
+
+    Returns:
+        ScheduleStore: Memory-mapped store
+    """
+    return ScheduleStore(file_path)
+
@@ -6,17 +6,56 @@ Members: Daniel Jon Santos, John Enzu Inigo, Anjoe Paglinawan
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, filedialog
-import numpy as np
-from datetime import datetime, timedelta
-import csv
+from tkinter import ttk, messagebox, scrolledtext, filedialog, simpledialog
 import os
-from utils import ToolTip
-from NumericalMethods.loan_calculations import calculate_monthly_payment, generate_amortization_schedule, calculate_loan_totals
-from NumericalMethods.interpolation import newton_divided_difference_interpolation, get_divided_difference_table, format_newton_polynomial
+import time
+from utils import ToolTip, VirtualTreeview
+from workers import TaskRunner
+from NumericalMethods.profiling import profiler, span, timed
+
+# NumPy and the numerical modules are imported inside the methods that use
+# them, so the window can appear before they are loaded
 
 class LoanCalculator:
-    def __init__(self, root):
+    # Interpolation engines offered in the interpolation tab
+    INTERPOLATION_ENGINES = {
+        "Newton's Divided Difference": 'newton',
+        "Barycentric Lagrange": 'barycentric',
+        "Natural Cubic Spline": 'spline',
+    }
+    
+    # Schedule rounding modes offered in the calculator tab
+    ROUNDING_OPTIONS = {
+        "None (exact)": None,
+        "Cents - Banker's": 'half_even',
+        "Cents - Half-Up": 'half_up',
+    }
+    
+    # Calculator tab solve-for modes
+    SOLVE_MODES = {
+        "Payment": 'payment',
+        "Interest Rate": 'rate',
+        "Loan Term": 'term',
+        "Loan Amount": 'principal',
+    }
+    
+    # Payment frequencies (payments per year) and interest accrual conventions
+    PAYMENT_FREQUENCIES = {
+        "Monthly": 12,
+        "Semi-monthly": 24,
+        "Bi-weekly": 26,
+        "Weekly": 52,
+    }
+    DAY_COUNTS = {
+        "Nominal (rate / payments per year)": 'nominal',
+        "Daily - Actual/365": 'actual/365',
+        "Daily - Actual/360": 'actual/360',
+    }
+    
+    # Live mode waits this long after the last edit before recalculating
+    LIVE_DELAY_MS = 300
+    
+    def __init__(self, root, lazy_tabs=True):
         self.root = root
         self.root.title("Smart Loan Calculator")
         self.root.geometry("1000x800")
@@ -44,31 +83,140 @@ class LoanCalculator:
         # File menu
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="Open Schedule...", command=self.open_schedule)
+        file_menu.add_command(label="Save Schedule...", command=self.save_schedule)
+        file_menu.add_separator()
+        file_menu.add_command(label="Diagnostics", command=self.show_diagnostics)
         file_menu.add_command(label="About", command=self.show_about)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         
+        # Status bar for background jobs
+        status_frame = ttk.Frame(root)
+        status_frame.pack(side='bottom', fill='x', padx=10, pady=(0, 10))
+        self.status_label = ttk.Label(status_frame, text="Ready")
+        self.status_label.pack(side='left')
+        self.cancel_btn = ttk.Button(status_frame, text="✖ Cancel", command=self.cancel_tasks, state='disabled')
+        self.cancel_btn.pack(side='right')
+        self.progress_bar = ttk.Progressbar(status_frame, mode='determinate', length=200, maximum=1.0)
+        self.progress_bar.pack(side='right', padx=10)
+        
+        # Background worker for calculations; closing the window stops its pools
+        self.tasks = TaskRunner(self.root, on_status=self.update_task_status)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        
         # Create notebook (tabs)
         self.notebook = ttk.Notebook(root)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
         
-        # Create three tabs
+        # Create tabs
         self.tab1 = ttk.Frame(self.notebook)
         self.tab2 = ttk.Frame(self.notebook)
         self.tab3 = ttk.Frame(self.notebook)
+        self.tab4 = ttk.Frame(self.notebook)
         
         self.notebook.add(self.tab1, text="Loan Calculator")
         self.notebook.add(self.tab2, text="Amortization Schedule")
         self.notebook.add(self.tab3, text="Polynomial Interpolation")
+        self.notebook.add(self.tab4, text="Sensitivity Analysis")
         
         # Initialize variables
         self.amortization_data = []
+        self.loan_inputs = None  # (principal, annual_rate, years, payments_per_year, day_count) of amortization_data
+        self.loan_summary = None  # figures behind the summary text, re-rendered on currency changes
+        self.last_loan_request = None  # arguments of the last submitted calculation
+        self.live_after_id = None  # pending debounced live recalculation
         self.selected_points = []
-        
-        # Setup each tab
+        self.interpolator = None
+        self.selection = None  # created with the first schedule
+        self.sensitivity_grid = None
+        
+        # Setup each tab; with lazy_tabs only the first one is built now and
+        # the others when they are first selected
+        self.tab_builders = {
+            str(self.tab2): self.setup_amortization_tab,
+            str(self.tab3): self.setup_interpolation_tab,
+            str(self.tab4): self.setup_sensitivity_tab,
+        }
         self.setup_calculator_tab()
-        self.setup_amortization_tab()
-        self.setup_interpolation_tab()
+        if lazy_tabs:
+            self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        else:
+            for tab in (self.tab2, self.tab3, self.tab4):
+                self.ensure_tab(tab)
+        
+    def ensure_tab(self, tab):
+        """Build a tab's widgets if that has not happened yet"""
+        builder = self.tab_builders.pop(str(tab), None)
+        if builder:
+            with span(f"LoanCalculator.{builder.__name__}"):
+                builder()
+    
+    def on_tab_changed(self, event=None):
+        """Build the newly selected tab on first use"""
+        self.ensure_tab(self.notebook.select())
+    
+    def show_diagnostics(self):
+        """Show timing spans and cache statistics"""
+        from NumericalMethods.cache import cache_stats
+        
+        window = tk.Toplevel(self.root)
+        window.title("Diagnostics - Smart Loan Calculator")
+        window.geometry("760x480")
+        
+        controls = ttk.Frame(window, padding=10)
+        controls.pack(fill='x')
+        
+        enabled_var = tk.BooleanVar(value=profiler.enabled)
+        def toggle_profiling():
+            profiler.enabled = enabled_var.get()
+        ttk.Checkbutton(controls, text="Enable profiling", variable=enabled_var,
+                        command=toggle_profiling).pack(side='left')
+        
+        columns = ('Span', 'Calls', 'Total (ms)', 'Mean (ms)', 'Max (ms)')
+        tree = ttk.Treeview(window, columns=columns, show='headings', height=14)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=360 if col == 'Span' else 90, anchor='w' if col == 'Span' else 'e')
+        tree.pack(fill='both', expand=True, padx=10)
+        
+        cache_label = ttk.Label(window, font=('Consolas', 9))
+        cache_label.pack(fill='x', padx=10, pady=5)
+        
+        def refresh():
+            for item in tree.get_children():
+                tree.delete(item)
+            for row in profiler.snapshot():
+                tree.insert('', 'end', values=(row['name'], row['calls'], f"{row['total'] * 1000:,.2f}",
+                                               f"{row['mean'] * 1000:,.3f}", f"{row['max'] * 1000:,.3f}"))
+            lines = []
+            for name, stats in cache_stats().items():
+                lines.append(f"{name.title()} cache: {stats['entries']} entries, {stats['bytes'] / 1024:,.0f} KiB, "
+                             f"hit rate {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses, "
+                             f"{stats['evictions']} evictions)")
+            cache_label.config(text="\n".join(lines))
+        
+        def reset():
+            profiler.reset()
+            refresh()
+        
+        def save_profile():
+            file_path = filedialog.asksaveasfilename(defaultextension=".json",
+                                                     filetypes=[("Profile files", "*.json")],
+                                                     title="Save Profile")
+            if not file_path:
+                return
+            try:
+                profiler.dump(file_path, {'cache': cache_stats()})
+                messagebox.showinfo("Success", f"Profile saved to {os.path.basename(file_path)}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save profile: {str(e)}")
+        
+        ttk.Button(controls, text="🔄 Refresh", command=refresh).pack(side='left', padx=5)
+        ttk.Button(controls, text="🧹 Reset", command=reset).pack(side='left', padx=5)
+        ttk.Button(controls, text="💾 Save Profile", command=save_profile).pack(side='left', padx=5)
+        
+        refresh()
         
     def show_about(self):
         """Show about dialog"""
@@ -141,22 +289,97 @@ class LoanCalculator:
         self.term_entry = ttk.Entry(frame, width=25)
         self.term_entry.grid(row=2, column=1, pady=10, padx=(10,0))
         self.term_entry.insert(0, "30")
-        ToolTip(self.term_entry, "Enter the loan term in years (e.g., 30)")
-        
-        ttk.Label(frame, text="Currency:").grid(row=3, column=0, sticky='w', pady=10)
+        ToolTip(self.term_entry, "Enter the loan term in years (e.g., 30 or 2.5)")
+        
+        ttk.Label(frame, text="Payment Frequency:").grid(row=3, column=0, sticky='w', pady=10)
+        self.frequency_var = tk.StringVar(value="Monthly")
+        frequency_combo = ttk.Combobox(frame, textvariable=self.frequency_var, 
+                                       values=list(self.PAYMENT_FREQUENCIES), width=23, state='readonly')
+        frequency_combo.grid(row=3, column=1, pady=10, padx=(10,0))
+        ToolTip(frequency_combo, "How often payments are made; schedules have one row per payment")
+        
+        ttk.Label(frame, text="Interest Accrual:").grid(row=4, column=0, sticky='w', pady=10)
+        self.day_count_var = tk.StringVar(value="Nominal (rate / payments per year)")
+        day_count_combo = ttk.Combobox(frame, textvariable=self.day_count_var, 
+                                       values=list(self.DAY_COUNTS), width=23, state='readonly')
+        day_count_combo.grid(row=4, column=1, pady=10, padx=(10,0))
+        ToolTip(day_count_combo, "Nominal charges the annual rate divided by the payments per year;\n"
+                                 "daily accrual charges rate / 365 or rate / 360 per day: 7 days per weekly\n"
+                                 "and 14 per bi-weekly payment. Monthly and semi-monthly periods use the\n"
+                                 "average 365 / payments per year days, so Actual/365 equals nominal there")
+        
+        ttk.Label(frame, text="Currency:").grid(row=5, column=0, sticky='w', pady=10)
         self.currency_var = tk.StringVar(value="USD")
         currency_combo = ttk.Combobox(frame, textvariable=self.currency_var, 
                                       values=["USD", "PHP"], width=23, state='readonly')
-        currency_combo.grid(row=3, column=1, pady=10, padx=(10,0))
+        currency_combo.grid(row=5, column=1, pady=10, padx=(10,0))
+        currency_combo.bind('<<ComboboxSelected>>', self.change_currency)
         ToolTip(currency_combo, "Select the currency for display")
         
-        # Calculate button
-        calc_btn = ttk.Button(frame, text="📊 Calculate Loan", command=self.calculate_loan)
-        calc_btn.grid(row=4, column=0, columnspan=2, pady=25)
+        ttk.Label(frame, text="Rounding:").grid(row=6, column=0, sticky='w', pady=10)
+        self.rounding_var = tk.StringVar(value="None (exact)")
+        rounding_combo = ttk.Combobox(frame, textvariable=self.rounding_var, 
+                                      values=list(self.ROUNDING_OPTIONS), width=23, state='readonly')
+        rounding_combo.grid(row=6, column=1, pady=10, padx=(10,0))
+        ToolTip(rounding_combo, "Round every payment to whole cents like a servicing system;\n"
+                                "the final payment is adjusted to clear the balance")
+        
+        # Solve for any one of payment, rate, term or amount
+        ttk.Label(frame, text="Solve For:").grid(row=7, column=0, sticky='w', pady=10)
+        self.solve_var = tk.StringVar(value="Payment")
+        solve_combo = ttk.Combobox(frame, textvariable=self.solve_var, 
+                                   values=list(self.SOLVE_MODES), width=23, state='readonly')
+        solve_combo.grid(row=7, column=1, pady=10, padx=(10,0))
+        solve_combo.bind('<<ComboboxSelected>>', self.change_solve_mode)
+        ToolTip(solve_combo, "Pick the unknown; the other three values are taken from the form")
+        
+        ttk.Label(frame, text="Payment ($):").grid(row=8, column=0, sticky='w', pady=10)
+        self.payment_entry = ttk.Entry(frame, width=25)
+        self.payment_entry.grid(row=8, column=1, pady=10, padx=(10,0))
+        self.payment_entry.insert(0, "1500")
+        self.payment_entry.config(state='disabled')
+        ToolTip(self.payment_entry, "Budget per payment used when solving for rate, term or amount")
+        
+        # Prepayments and rate resets (all optional); events are numbered by payment,
+        # which is the month for monthly loans
+        ttk.Label(frame, text="Extra per Payment ($):").grid(row=9, column=0, sticky='w', pady=10)
+        self.extra_entry = ttk.Entry(frame, width=25)
+        self.extra_entry.grid(row=9, column=1, pady=10, padx=(10,0))
+        self.extra_entry.insert(0, "0")
+        ToolTip(self.extra_entry, "Extra principal paid with every payment (e.g., 200)")
+        
+        ttk.Label(frame, text="Lump Sums (period:amount):").grid(row=10, column=0, sticky='w', pady=10)
+        self.lump_entry = ttk.Entry(frame, width=25)
+        self.lump_entry.grid(row=10, column=1, pady=10, padx=(10,0))
+        ToolTip(self.lump_entry, "One-off prepayments by payment number, comma separated (e.g., 24:10000, 60:5000)")
+        
+        ttk.Label(frame, text="Rate Resets (period:rate):").grid(row=11, column=0, sticky='w', pady=10)
+        self.reset_entry = ttk.Entry(frame, width=25)
+        self.reset_entry.grid(row=11, column=1, pady=10, padx=(10,0))
+        ToolTip(self.reset_entry, "New annual rate from a payment number on, comma separated;\n"
+                                  "a monthly 5/1 ARM resets at 61, 73, 85, ... (e.g., 61:7.5, 73:8)")
+        
+        # Calculate button and live mode
+        action_frame = ttk.Frame(frame)
+        action_frame.grid(row=12, column=0, columnspan=2, pady=25)
+        calc_btn = ttk.Button(action_frame, text="📊 Calculate Loan", command=self.calculate_loan)
+        calc_btn.pack(side='left', padx=10)
+        self.live_var = tk.BooleanVar(value=False)
+        live_check = ttk.Checkbutton(action_frame, text="⚡ Live Update", variable=self.live_var,
+                                     command=self.schedule_live_update)
+        live_check.pack(side='left', padx=10)
+        ToolTip(live_check, "Recalculate as you type, without pop-ups")
+        
+        # Live mode: any edit (re)starts the debounce timer
+        for entry in (self.amount_entry, self.rate_entry, self.term_entry, self.payment_entry,
+                      self.extra_entry, self.lump_entry, self.reset_entry):
+            entry.bind('<KeyRelease>', self.schedule_live_update, add='+')
+        for combo in (frequency_combo, day_count_combo, rounding_combo, solve_combo):
+            combo.bind('<<ComboboxSelected>>', self.schedule_live_update, add='+')
         
         # Results display
         results_frame = ttk.LabelFrame(frame, text="Calculation Results", padding=10)
-        results_frame.grid(row=5, column=0, columnspan=2, pady=15, sticky='ew')
+        results_frame.grid(row=13, column=0, columnspan=2, pady=15, sticky='ew')
         
         self.result_text = scrolledtext.ScrolledText(results_frame, width=70, height=18, wrap=tk.WORD, font=('Consolas', 10))
         self.result_text.pack(fill='both', expand=True)
@@ -184,13 +407,14 @@ class LoanCalculator:
                   command=self.prepare_interpolation).grid(row=1, column=1, padx=5, pady=5, sticky='ew')
         
         # Info label
-        info_label = ttk.Label(frame, text="📅 Full amortization schedule - scroll to view all months", 
+        info_label = ttk.Label(frame, text="📅 Full amortization schedule - scroll to view every payment", 
                               font=('Segoe UI', 10, 'italic'))
         info_label.pack(pady=5)
         
-        # Treeview for amortization table
+        # Virtual treeview for amortization table: only the rows in view are rendered
         columns = ('Month', 'Payment', 'Interest', 'Principal', 'Balance', 'Select')
-        self.amort_tree = ttk.Treeview(frame, columns=columns, show='headings', height=20)
+        self.amort_table = VirtualTreeview(frame, columns, height=20)
+        self.amort_tree = self.amort_table.tree
         
         for col in columns:
             self.amort_tree.heading(col, text=col)
@@ -201,16 +425,16 @@ class LoanCalculator:
             else:
                 self.amort_tree.column(col, width=120)
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(frame, orient='vertical', command=self.amort_tree.yview)
-        self.amort_tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.amort_tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
+        self.amort_table.pack(fill='both', expand=True)
         
         # Bind click event
         self.amort_tree.bind('<Double-1>', self.toggle_row_selection)
         
+        # A schedule may have been calculated before this tab was built
+        if self.amortization_data:
+            self.amort_tree.heading('Month', text=self.period_label())
+            self.amort_table.set_source(len(self.amortization_data), self.format_amortization_rows)
+        
     def setup_interpolation_tab(self):
         """Tab 3: Polynomial Interpolation"""
         frame = ttk.Frame(self.tab3, padding=20)
@@ -247,157 +471,495 @@ class LoanCalculator:
         ttk.Button(input_frame, text="⚡ Calculate Polynomial", 
                   command=self.calculate_interpolation).pack(side='left', padx=10)
         
+        # Engine selection
+        engine_frame = ttk.Frame(right_frame)
+        engine_frame.pack(fill='x')
+        
+        ttk.Label(engine_frame, text="🧠 Engine:").pack(side='left', padx=5)
+        self.engine_var = tk.StringVar(value="Newton's Divided Difference")
+        engine_combo = ttk.Combobox(engine_frame, textvariable=self.engine_var, 
+                                    values=list(self.INTERPOLATION_ENGINES), width=28, state='readonly')
+        engine_combo.pack(side='left', padx=5)
+        engine_combo.bind('<<ComboboxSelected>>', self.change_interpolation_engine)
+        ToolTip(engine_combo, "Newton and Barycentric fit one polynomial through all points;\n"
+                              "Cubic Spline stays accurate and fast for many points")
+        
+        # Error analysis against the exact schedule
+        analysis_frame = ttk.Frame(right_frame)
+        analysis_frame.pack(fill='x', pady=(10, 0))
+        
+        ttk.Label(analysis_frame, text="📏 Max Error:").pack(side='left', padx=5)
+        self.tolerance_entry = ttk.Entry(analysis_frame, width=10)
+        self.tolerance_entry.pack(side='left', padx=5)
+        self.tolerance_entry.insert(0, "1.00")
+        ToolTip(self.tolerance_entry, "Largest acceptable prediction error, used to rank sampling densities")
+        
+        ttk.Button(analysis_frame, text="🔍 Error Analysis", 
+                  command=self.analyze_interpolation).pack(side='left', padx=10)
+        
         # Results display
         self.interp_result_text = scrolledtext.ScrolledText(right_frame, width=55, height=28, wrap=tk.WORD, font=('Consolas', 9))
         self.interp_result_text.pack(fill='both', expand=True, pady=10)
         
-    def calculate_loan(self):
-        """Calculate monthly payment and generate amortization schedule"""
+    def setup_sensitivity_tab(self):
+        """Tab 4: Rate x Term Sensitivity Analysis"""
+        frame = ttk.Frame(self.tab4, padding=20)
+        frame.pack(fill='both', expand=True)
+        
+        # Grid ranges
+        range_frame = ttk.LabelFrame(frame, text="📐 Grid Ranges", padding=15, style='Card.TLabelframe')
+        range_frame.pack(fill='x')
+        
+        ttk.Label(range_frame, text="From").grid(row=0, column=1)
+        ttk.Label(range_frame, text="To").grid(row=0, column=2)
+        ttk.Label(range_frame, text="Step").grid(row=0, column=3)
+        
+        self.sensitivity_entries = {}
+        ranges = [('rate', "Interest Rate (%):", ("1", "15", "0.25")),
+                  ('term', "Loan Term (Years):", ("5", "40", "5"))]
+        for row, (name, label, defaults) in enumerate(ranges, start=1):
+            ttk.Label(range_frame, text=label).grid(row=row, column=0, sticky='w', pady=5)
+            entries = []
+            for column, default in enumerate(defaults, start=1):
+                entry = ttk.Entry(range_frame, width=10)
+                entry.grid(row=row, column=column, padx=5, pady=5)
+                entry.insert(0, default)
+                entries.append(entry)
+            self.sensitivity_entries[name] = entries
+        
+        ttk.Label(range_frame, text="Loan Amounts ($):").grid(row=3, column=0, sticky='w', pady=5)
+        self.sensitivity_principals_entry = ttk.Entry(range_frame, width=36)
+        self.sensitivity_principals_entry.grid(row=3, column=1, columnspan=3, sticky='w', padx=5, pady=5)
+        self.sensitivity_principals_entry.insert(0, "250000")
+        ToolTip(self.sensitivity_principals_entry, "Comma-separated loan amounts (e.g., 200000, 250000, 300000)")
+        
+        ttk.Button(range_frame, text="📊 Compute Grid", 
+                  command=self.calculate_sensitivity).grid(row=1, column=4, padx=15, pady=5, sticky='ew')
+        ttk.Button(range_frame, text="💾 Export to CSV", 
+                  command=self.export_sensitivity_csv).grid(row=2, column=4, padx=15, pady=5, sticky='ew')
+        
+        # View selection
+        view_frame = ttk.Frame(frame)
+        view_frame.pack(fill='x', pady=10)
+        
+        ttk.Label(view_frame, text="Show:").pack(side='left', padx=5)
+        self.sensitivity_metric_var = tk.StringVar(value="Payment")
+        metric_combo = ttk.Combobox(view_frame, textvariable=self.sensitivity_metric_var, 
+                                    values=["Payment", "Total Paid", "Total Interest"], width=15, state='readonly')
+        metric_combo.pack(side='left', padx=5)
+        metric_combo.bind('<<ComboboxSelected>>', lambda event: self.populate_sensitivity_table())
+        
+        ttk.Label(view_frame, text="Loan Amount:").pack(side='left', padx=5)
+        self.sensitivity_principal_var = tk.StringVar()
+        self.sensitivity_principal_combo = ttk.Combobox(view_frame, textvariable=self.sensitivity_principal_var, 
+                                                        width=15, state='readonly')
+        self.sensitivity_principal_combo.pack(side='left', padx=5)
+        self.sensitivity_principal_combo.bind('<<ComboboxSelected>>', lambda event: self.populate_sensitivity_table())
+        
+        # Grid table: one row per rate, one column per term
+        self.sensitivity_table = VirtualTreeview(frame, ('Rate',), height=15)
+        self.sensitivity_table.pack(fill='both', expand=True)
+        
+    def calculate_loan(self, live=False):
+        """
+        Calculate monthly payment and generate amortization schedule
+        
+        Args:
+            live (bool): Called by live mode: input errors go to the status bar
+                instead of dialogs, and unchanged inputs are not recalculated
+        """
         try:
+            # Fill in the unknown first when solving for something other than the payment
+            solve_note, term_extra = "", 0.0
+            solve_mode = self.SOLVE_MODES[self.solve_var.get()]
+            if solve_mode != 'payment':
+                solved = self.solve_loan_input(solve_mode, live)
+                if solved is None:
+                    return
+                solve_note, term_extra = solved
+            
             # Get inputs
             principal = float(self.amount_entry.get())
             annual_rate = float(self.rate_entry.get())
-            years = int(self.term_entry.get())
-            currency = self.currency_var.get()
-            
-            # Calculate number of payments
-            num_payments = years * 12
+            years = float(self.term_entry.get())
+            payments_per_year, day_count = self.payment_frequency()
+            num_payments = round(years * payments_per_year)
+            rounding = self.ROUNDING_OPTIONS[self.rounding_var.get()]
+            extra = float(self.extra_entry.get() or 0) + term_extra
+            lump_sums = self.parse_event_entry(self.lump_entry.get())
+            rate_changes = self.parse_event_entry(self.reset_entry.get())
             
             # Validate inputs
             if principal <= 0:
-                messagebox.showerror("Invalid Input", "Loan amount must be greater than 0.")
-                self.amount_entry.focus()
+                self.report_input_error("Loan amount must be greater than 0.", self.amount_entry, live)
                 return
             if principal > 10000000:
-                messagebox.showerror("Invalid Input", "Loan amount cannot exceed $10,000,000.")
-                self.amount_entry.focus()
+                self.report_input_error("Loan amount cannot exceed $10,000,000.", self.amount_entry, live)
                 return
             if annual_rate <= 0 or annual_rate > 30:
-                messagebox.showerror("Invalid Input", "Interest rate must be between 0.01% and 30%.")
-                self.rate_entry.focus()
+                self.report_input_error("Interest rate must be between 0.01% and 30%.", self.rate_entry, live)
+                return
+            if num_payments < 1 or years > 50:
+                self.report_input_error("Loan term must be at least one payment and at most 50 years.",
+                                        self.term_entry, live)
                 return
-            if years <= 0 or years > 50:
-                messagebox.showerror("Invalid Input", "Loan term must be between 1 and 50 years.")
-                self.term_entry.focus()
+            if extra < 0 or any(amount < 0 for _, amount in lump_sums):
+                self.report_input_error("Prepayments cannot be negative.", self.extra_entry, live)
+                return
+            if any(not 1 <= period <= num_payments for period, _ in lump_sums + rate_changes):
+                self.report_input_error(f"Event payment numbers must be between 1 and {num_payments}.",
+                                        self.lump_entry, live)
+                return
+            if any(not 0 < rate <= 30 for _, rate in rate_changes):
+                self.report_input_error("Reset rates must be between 0.01% and 30%.", self.reset_entry, live)
                 return
             
-            # Calculate monthly payment
-            monthly_payment = calculate_monthly_payment(principal, annual_rate, years)
-            total_paid = monthly_payment * num_payments
-            total_interest = total_paid - principal
+            events = None
+            if extra or lump_sums or rate_changes:
+                if rounding is not None:
+                    self.report_input_error("Cent rounding is not available with prepayments or rate resets.",
+                                            live=live)
+                    return
+                events = {'extra_payments': [(1, extra)] if extra else None,
+                          'lump_sums': lump_sums, 'rate_changes': rate_changes}
+            
+            # Live edits that end up with the same inputs (e.g. cursor keys) change nothing
+            request = (principal, annual_rate, years, rounding, events, solve_note, payments_per_year, day_count)
+            if live and request == self.last_loan_request:
+                return
+            self.last_loan_request = request
+            started = time.perf_counter()
             
-            # Generate amortization schedule
-            self.amortization_data = generate_amortization_schedule(principal, annual_rate, years)
+            def finish(outcome):
+                self.show_loan_results(outcome, live)
+                # Covers queueing, the worker and showing the results; compute_loan has its own span
+                if profiler.enabled:
+                    profiler.record("LoanCalculator.calculate_loan", time.perf_counter() - started)
             
-            # Display results
-            symbol = "$" if currency == "USD" else "₱"
-            result = f"""
+            self.tasks.submit(self.compute_loan, *request,
+                              on_done=finish,
+                              on_error=self.show_task_error, on_progress=self.update_task_progress,
+                              description="Calculating loan...", key='loan')
+            
+        except ValueError:
+            self.report_input_error("Please enter valid numbers!", live=live, title="Error")
+        except Exception as e:
+            self.report_input_error(f"An error occurred: {str(e)}", live=live, title="Error")
+    
+    def report_input_error(self, message, entry=None, live=False, title="Invalid Input"):
+        """Show an input problem in a dialog, or quietly in the status bar while in live mode"""
+        if live:
+            self.status_label.config(text=f"⚠ {message}")
+            # Returning to the last valid inputs must recalculate, which also replaces this warning
+            self.last_loan_request = None
+            return
+        messagebox.showerror(title, message)
+        if entry is not None:
+            entry.focus()
+    
+    def schedule_live_update(self, event=None):
+        """Restart the live-mode debounce timer after an edit"""
+        if self.live_after_id is not None:
+            self.root.after_cancel(self.live_after_id)
+            self.live_after_id = None
+        if self.live_var.get():
+            self.live_after_id = self.root.after(self.LIVE_DELAY_MS, self.live_recalculate)
+    
+    def live_recalculate(self):
+        """Debounced live-mode calculation"""
+        self.live_after_id = None
+        self.calculate_loan(live=True)
+    
+    def change_currency(self, event=None):
+        """Re-render the summary and the visible table rows in the new currency; nothing is recalculated"""
+        if self.loan_summary is not None:
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(1.0, self.format_loan_summary(self.loan_summary))
+        if self.amortization_data and hasattr(self, 'amort_table'):
+            self.amort_table.refresh()
+        if self.sensitivity_grid is not None:
+            self.populate_sensitivity_table()
+    
+    def change_solve_mode(self, event=None):
+        """Disable the entry being solved for and enable the payment entry when it is an input"""
+        solve_mode = self.SOLVE_MODES[self.solve_var.get()]
+        entries = {'rate': self.rate_entry, 'term': self.term_entry, 'principal': self.amount_entry}
+        for mode, entry in entries.items():
+            entry.config(state='disabled' if mode == solve_mode else 'normal')
+        self.payment_entry.config(state='disabled' if solve_mode == 'payment' else 'normal')
+    
+    def payment_frequency(self):
+        """(payments_per_year, day_count) chosen in the calculator tab"""
+        return self.PAYMENT_FREQUENCIES[self.frequency_var.get()], self.DAY_COUNTS[self.day_count_var.get()]
+    
+    def schedule_frequency(self):
+        """Payments per year of the schedule being shown (monthly before the first calculation)"""
+        return self.loan_inputs[3] if self.loan_inputs else 12
+    
+    def period_label(self):
+        """Heading for the payment number column of the current schedule"""
+        from NumericalMethods.loan_calculations import period_label
+        return period_label(self.schedule_frequency())
+    
+    def solve_loan_input(self, solve_mode, live=False):
+        """
+        Solve for the rate, term or amount implied by the payment entry
+        and write the answer into its entry.
+        
+        Args:
+            solve_mode (str): 'rate', 'term' or 'principal'
+            live (bool): Report problems in the status bar instead of dialogs
+        
+        Returns:
+            tuple: (summary_note, extra_payment) or None when there is no solution;
+                extra_payment tops the whole-payment schedule up to the given payment
+                when solving for the term
+        """
+        import numpy as np
+        from NumericalMethods.loan_calculations import calculate_monthly_payment
+        from NumericalMethods.solvers import solve_annual_rate, solve_term, solve_principal
+        
+        payment = float(self.payment_entry.get())
+        if payment <= 0:
+            self.report_input_error("Payment must be greater than 0.", self.payment_entry, live)
+            return None
+        
+        payments_per_year, day_count = self.payment_frequency()
+        frequency = {'payments_per_year': payments_per_year, 'day_count': day_count}
+        extra = 0.0
+        if solve_mode == 'rate':
+            principal, years = float(self.amount_entry.get()), float(self.term_entry.get())
+            annual_rate, converged = solve_annual_rate(principal, payment, years, **frequency)
+            if not converged:
+                self.report_input_error("The payment does not repay the loan within the term at any rate.",
+                                        live=live, title="No Solution")
+                return None
+            entry, value = self.rate_entry, f"{annual_rate:.4f}"
+            note = f"🧮 Solved rate: {annual_rate:.4f}% per year"
+        elif solve_mode == 'term':
+            principal, annual_rate = float(self.amount_entry.get()), float(self.rate_entry.get())
+            years = solve_term(principal, annual_rate, payment, **frequency)
+            if not np.isfinite(years):
+                self.report_input_error("The payment does not cover the interest of one period.",
+                                        live=live, title="No Solution")
+                return None
+            periods = max(1, int(np.ceil(years * payments_per_year - 1e-9)))
+            extra = max(0.0, payment - calculate_monthly_payment(principal, annual_rate, periods / payments_per_year,
+                                                                 **frequency))
+            entry, value = self.term_entry, f"{periods / payments_per_year:g}"
+            note = (f"🧮 Solved term: {years * payments_per_year:.1f} payments ({years:.2f} years), "
+                    f"last payment is number {periods}")
+        else:
+            annual_rate, years = float(self.rate_entry.get()), float(self.term_entry.get())
+            principal = solve_principal(payment, annual_rate, years, **frequency)
+            entry, value = self.amount_entry, f"{principal:.2f}"
+            note = f"🧮 Affordable loan amount: {principal:,.2f}"
+        
+        entry.config(state='normal')
+        entry.delete(0, tk.END)
+        entry.insert(0, value)
+        entry.config(state='disabled')
+        return note + f" at {payment:,.2f} per payment ({self.frequency_var.get().lower()})\n", extra
+    
+    def parse_event_entry(self, text):
+        """Parse 'period:value, period:value' into a list of (int, float) pairs"""
+        events = []
+        for item in text.replace(';', ',').split(','):
+            if item.strip():
+                month, value = item.split(':')
+                events.append((int(month), float(value)))
+        return events
+    
+    @timed()
+    def compute_loan(self, job, principal, annual_rate, years, rounding=None, events=None,
+                     solve_note="", payments_per_year=12, day_count='nominal'):
+        """
+        Worker-side part of calculate_loan: no Tk access allowed here
+        
+        Returns:
+            tuple: (schedule, summary, loan_inputs); summary holds the figures
+                that format_loan_summary renders
+        """
+        from NumericalMethods.cache import cached_monthly_payment, cached_amortization_schedule
+        from NumericalMethods.loan_calculations import generate_event_schedule, count_payments
+        
+        frequency = {'payments_per_year': payments_per_year, 'day_count': day_count}
+        num_payments = count_payments(years, payments_per_year)
+        
+        # Calculate the payment per period
+        monthly_payment = cached_monthly_payment(principal, annual_rate, years, **frequency)
+        total_paid = monthly_payment * num_payments
+        total_interest = total_paid - principal
+        job.report_progress(0.3, "Generating amortization schedule...")
+        
+        # Generate amortization schedule
+        job.check_cancelled()
+        summary = {'principal': principal, 'annual_rate': annual_rate, 'years': years, 'num_payments': num_payments,
+                   'payments_per_year': payments_per_year, 'day_count': day_count, 'solve_note': solve_note,
+                   'rounding': rounding, 'events': None}
+        if events is None:
+            schedule = cached_amortization_schedule(principal, annual_rate, years, rounding, **frequency)
+        else:
+            outcome = generate_event_schedule(principal, annual_rate, years, **events, **frequency)
+            schedule = outcome['schedule']
+            monthly_payment = schedule['payment'][0]
+            total_paid = schedule['payment'].sum()
+            total_interest = outcome['total_interest']
+            summary['events'] = {'payoff_month': outcome['payoff_month'], 'months_saved': outcome['months_saved'],
+                                 'interest_saved': outcome['interest_saved'], 'rate_changes': events['rate_changes']}
+        
+        job.report_progress(0.9, "Summarizing...")
+        if rounding is not None:
+            # Cent-exact totals come from the booked schedule, including the trued-up final payment
+            monthly_payment = schedule['payment'][0]
+            total_paid = schedule['payment'].sum()
+            total_interest = schedule['interest'].sum()
+            summary['final_payment'] = schedule['payment'][-1]
+        
+        summary.update(payment=monthly_payment, total_paid=total_paid, total_interest=total_interest,
+                       schedule_length=len(schedule))
+        return schedule, summary, (principal, annual_rate, years, payments_per_year, day_count)
+    
+    def format_loan_summary(self, summary):
+        """Render a compute_loan summary in the currently selected currency"""
+        from NumericalMethods.loan_calculations import period_days
+        
+        symbol = "$" if self.currency_var.get() == "USD" else "₱"
+        principal, annual_rate, years = summary['principal'], summary['annual_rate'], summary['years']
+        payments_per_year, day_count = summary['payments_per_year'], summary['day_count']
+        num_payments = summary['num_payments']
+        monthly_payment, total_paid, total_interest = summary['payment'], summary['total_paid'], summary['total_interest']
+        frequency_name = next(name for name, count in self.PAYMENT_FREQUENCIES.items() if count == payments_per_year)
+        unit = "month" if payments_per_year == 12 else "period"
+        solve_note = summary['solve_note']
+        
+        event_note = ""
+        events = summary['events']
+        if events is not None:
+            event_note = (f"🏁 Paid off in {unit} {events['payoff_month']} "
+                          f"({events['months_saved']} {unit}s early); "
+                          f"interest saved {symbol}{events['interest_saved']:,.2f}\n")
+            if events['rate_changes']:
+                event_note += f"🔁 Rate resets: {', '.join(f'{unit} {m} → {r:.2f}%' for m, r in events['rate_changes'])}\n"
+        
+        rounding_note = ""
+        if summary['rounding'] is not None:
+            rounding_name = "banker's rounding" if summary['rounding'] == 'half_even' else "round half up"
+            rounding_note = f"🪙 Rounded to cents ({rounding_name}); final payment {symbol}{summary['final_payment']:,.2f}\n"
+        
+        frequency_note = ""
+        if day_count != 'nominal':
+            basis = day_count.split('/')[1]
+            frequency_note = (f"📅 Interest accrues daily at the annual rate / {basis} "
+                              f"({period_days(payments_per_year):.4g} days per payment)\n")
+        term = f"{years:g} years ({num_payments} {'months' if payments_per_year == 12 else 'payments'})"
+        payment_label = f"{frequency_name} Payment:"
+        
+        result = f"""
 ╔{'═'*68}╗
 ║{' '*20}🏠 LOAN SUMMARY {' '*30}║
 ╠{'═'*68}╣
 ║  💰 Loan Amount:          {symbol}{principal:>12,.2f} {' '*20}║
 ║  📈 Interest Rate:        {annual_rate:>12.2f}% per year {' '*14}║
-║  ⏰ Loan Term:            {years:>12.0f} years ({num_payments:>3.0f} months){' '*8}║
+║  ⏰ Loan Term:            {term:>31}{' '*8}║
 ╠{'═'*68}╣
-║  💳 Monthly Payment:      {symbol}{monthly_payment:>12,.2f} {' '*20}║
+║  💳 {payment_label:<22}{symbol}{monthly_payment:>12,.2f} {' '*20}║
 ║  💸 Total Amount Paid:    {symbol}{total_paid:>12,.2f} {' '*20}║
 ║  📊 Total Interest Paid:  {symbol}{total_interest:>12,.2f} {' '*20}║
 ╚{'═'*68}╝
 
-✅ Calculation complete!
-📊 Amortization schedule generated ({num_payments} months)
+{solve_note}{frequency_note}{rounding_note}{event_note}✅ Calculation complete!
+📊 Amortization schedule generated ({summary['schedule_length']} {unit}s)
 📈 Go to "Amortization Schedule" tab to view details
 🎯 Select data points for polynomial interpolation
 """
-            
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(1.0, result)
-            
-            # Populate amortization table (show first 12 and last 12 months)
-            self.populate_amortization_table()
-            
+        return result
+    
+    def show_loan_results(self, outcome, live=False):
+        """Apply a finished loan calculation to the widgets"""
+        self.amortization_data, self.loan_summary, self.loan_inputs = outcome
+        
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(1.0, self.format_loan_summary(self.loan_summary))
+        
+        # Populate amortization table; live updates keep the scroll position so
+        # only the rows whose values changed are redrawn
+        self.populate_amortization_table(keep_view=live)
+        
+        if not live:
             messagebox.showinfo("Success", "Loan calculated successfully!")
-            
-        except ValueError:
-            messagebox.showerror("Error", "Please enter valid numbers!")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
     
-    def populate_amortization_table(self):
-        """Populate the amortization table with all months"""
+    @timed()
+    def populate_amortization_table(self, keep_view=False):
+        """
+        Point the amortization table at the current schedule
+        
+        Args:
+            keep_view (bool): Keep the scroll position, and the row selection
+                when the new schedule has the same number of rows
+        """
+        from selection import SelectionModel
+        
+        if not (keep_view and self.selection is not None and len(self.selection) == len(self.amortization_data)):
+            self.selection = SelectionModel(len(self.amortization_data))
         try:
-            # Clear existing data
-            for item in self.amort_tree.get_children():
-                self.amort_tree.delete(item)
+            amort_table = self.amort_table
         except AttributeError:
-            # amort_tree not created yet
-            return
-        
-        if not self.amortization_data:
+            # amort_table not created yet
             return
         
+        self.amort_tree.heading('Month', text=self.period_label())
+        amort_table.set_source(len(self.amortization_data), self.format_amortization_rows, keep_position=keep_view)
+    
+    @timed()
+    def format_amortization_rows(self, start, stop):
+        """Format schedule rows [start, stop) for display in the amortization table"""
         currency = "$" if self.currency_var.get() == "USD" else "₱"
-        
-        # Show all months
-        for data in self.amortization_data:
-            self.amort_tree.insert('', 'end', values=(
-                data['month'],
-                f"{currency}{data['payment']:,.2f}",
-                f"{currency}{data['interest']:,.2f}",
-                f"{currency}{data['principal']:,.2f}",
-                f"{currency}{data['balance']:,.2f}",
-                "☐"  # Modern checkbox symbol
-            ), tags=('selectable',))
-        
-        # Bind click event
-        self.amort_tree.bind('<Double-1>', self.toggle_row_selection)
+        window = self.amortization_data[start:stop]
+        
+        rows = []
+        for month, payment, interest, principal, balance, selected in zip(
+                window['month'].tolist(), window['payment'].tolist(), window['interest'].tolist(),
+                window['principal'].tolist(), window['balance'].tolist(), self.selection.mask[start:stop].tolist()):
+            rows.append((
+                month,
+                f"{currency}{payment:,.2f}",
+                f"{currency}{interest:,.2f}",
+                f"{currency}{principal:,.2f}",
+                f"{currency}{balance:,.2f}",
+                "☑" if selected else "☐"
+            ))
+        return rows
     
     def toggle_row_selection(self, event):
         """Toggle row selection for interpolation"""
-        if not self.amort_tree.selection():
-            return
-        item = self.amort_tree.selection()[0]
-        values = list(self.amort_tree.item(item, 'values'))
-        
-        if values[0] == '...':
+        index = self.amort_table.selected_index()
+        if index is None:
             return
         
-        # Toggle selection marker
-        if values[5] == "☐":
-            values[5] = "☑"
-        else:
-            values[5] = "☐"
-        
-        self.amort_tree.item(item, values=values)
+        self.selection.toggle(index)
+        self.amort_table.refresh_rows([index])
     
     def auto_select_points(self):
-        """Auto-select every 12 months for interpolation"""
+        """Auto-select every 12 months (one payment per year) for interpolation"""
         if not self.amortization_data:
             messagebox.showwarning("Warning", "Generate loan calculation first!")
             return
         
         self.clear_selection()
         
-        # Select every 12 months starting from 0
-        selected_months = list(range(0, len(self.amortization_data) + 1, 12))
-        
-        count = 0
-        for item in self.amort_tree.get_children():
-            values = list(self.amort_tree.item(item, 'values'))
-            if values[0] != '...' and int(values[0]) in selected_months:
-                values[5] = "☑"
-                self.amort_tree.item(item, values=values)
-                count += 1
+        # Select the last payment of every year (row index 11 is month 12 of a monthly loan)
+        count = self.selection.select_every(self.schedule_frequency())
+        self.amort_table.refresh()
         
         messagebox.showinfo("Success", f"Auto-selected {count} data points")
     
     def clear_selection(self):
         """Clear all selections"""
-        for item in self.amort_tree.get_children():
-            values = list(self.amort_tree.item(item, 'values'))
-            if values[0] != '...':
-                values[5] = "☐"
-                self.amort_tree.item(item, values=values)
+        if self.selection is None:
+            return
+        self.selection.clear()
+        self.amort_table.refresh()
     
     def export_to_csv(self):
         """Export amortization schedule to CSV"""
@@ -412,34 +974,102 @@ class LoanCalculator:
             return
         
         try:
-            with open(file_path, 'w', newline='') as csvfile:
-                fieldnames = ['Month', 'Payment', 'Interest', 'Principal', 'Balance']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                for data in self.amortization_data:
-                    writer.writerow({
-                        'Month': data['month'],
-                        'Payment': f"{data['payment']:.2f}",
-                        'Interest': f"{data['interest']:.2f}",
-                        'Principal': f"{data['principal']:.2f}",
-                        'Balance': f"{data['balance']:.2f}"
-                    })
+            from data_io import write_schedule_csv
+            with span("LoanCalculator.export_to_csv"):
+                write_schedule_csv(file_path, self.amortization_data, payments_per_year=self.schedule_frequency())
             messagebox.showinfo("Success", f"Amortization schedule exported to {os.path.basename(file_path)}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export: {str(e)}")
     
+    def save_schedule(self):
+        """Save the current schedule to a binary schedule store"""
+        if not self.amortization_data:
+            messagebox.showwarning("Warning", "Generate loan calculation first!")
+            return
+        
+        file_path = filedialog.asksaveasfilename(defaultextension=".loans",
+                                                filetypes=[("Schedule stores", "*.loans")],
+                                                title="Save Schedule")
+        if not file_path:
+            return
+        
+        try:
+            from data_io import write_schedule_store
+            with span("LoanCalculator.save_schedule"):
+                write_schedule_store(file_path, self.amortization_data, self.loan_inputs)
+            messagebox.showinfo("Success", f"Schedule saved to {os.path.basename(file_path)}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save: {str(e)}")
+    
+    def open_schedule(self):
+        """Open a schedule store and load one of its loans into the amortization and interpolation tabs"""
+        file_path = filedialog.askopenfilename(filetypes=[("Schedule stores", "*.loans"), ("All files", "*.*")],
+                                              title="Open Schedule")
+        if not file_path:
+            return
+        
+        try:
+            from data_io import open_schedule_store
+            store = open_schedule_store(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open: {str(e)}")
+            return
+        
+        if not len(store):
+            messagebox.showerror("Error", "The file does not contain any schedules.")
+            return
+        
+        index = 0
+        if len(store) > 1:
+            index = simpledialog.askinteger("Open Schedule", f"Loan number to open (0 - {len(store) - 1}):",
+                                            minvalue=0, maxvalue=len(store) - 1, parent=self.root)
+            if index is None:
+                return
+        
+        self.load_schedule(store.schedule(index), store.loan(index), os.path.basename(file_path))
+    
+    def load_schedule(self, schedule, loan_inputs, source):
+        """Show a stored schedule as if it had just been calculated"""
+        principal, annual_rate, years, payments_per_year, day_count = loan_inputs
+        
+        # Put the stored inputs back into the form
+        self.solve_var.set("Payment")
+        self.change_solve_mode()
+        self.frequency_var.set(next(name for name, count in self.PAYMENT_FREQUENCIES.items()
+                                    if count == payments_per_year))
+        self.day_count_var.set(next(name for name, value in self.DAY_COUNTS.items() if value == day_count))
+        for entry, value in ((self.amount_entry, f"{principal:.2f}"), (self.rate_entry, f"{annual_rate:g}"),
+                             (self.term_entry, f"{years:g}")):
+            entry.delete(0, tk.END)
+            entry.insert(0, value)
+        
+        self.amortization_data = schedule
+        self.loan_inputs = loan_inputs
+        self.loan_summary = self.last_loan_request = None
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(1.0, f"\n📂 Opened {source}: {len(schedule)} {self.frequency_var.get().lower()} payments, "
+                                     f"loan amount {principal:,.2f} at {annual_rate:g}% over {years:g} years\n")
+        self.populate_amortization_table()
+        
+        # Preload yearly points for interpolation when there are enough of them
+        if len(schedule) >= 3 * payments_per_year:
+            self.selection.select_every(payments_per_year)
+            if hasattr(self, 'amort_table'):
+                self.amort_table.refresh()
+            self.prepare_interpolation()
+        else:
+            messagebox.showinfo("Success", f"Opened {len(schedule)} payments from {source}")
+    
     def prepare_interpolation(self):
         """Prepare selected points for interpolation"""
         self.selected_points = []
         
-        # Get selected rows
-        for item in self.amort_tree.get_children():
-            values = self.amort_tree.item(item, 'values')
-            if values[5] == "☑":
-                month = int(values[0])
-                # Get balance from original data
-                balance = self.amortization_data[month - 1]['balance'] if month > 0 else float(self.amount_entry.get())
-                self.selected_points.append((month, balance))
+        # Get selected rows straight from the schedule columns
+        if self.amortization_data:
+            with span("LoanCalculator.prepare_interpolation.extract"):
+                months, balances = self.selection.extract(self.amortization_data['month'],
+                                                          self.amortization_data['balance'])
+                self.selected_points = list(zip(months.tolist(), balances.tolist()))
         
         # Add month 0 if not included
         if self.selected_points and self.selected_points[0][0] != 0:
@@ -451,51 +1081,88 @@ class LoanCalculator:
                                "Tip: Use 'Auto-Select Every 12 Months' button")
             return
         
-        # Populate points tree
-        for item in self.points_tree.get_children():
-            self.points_tree.delete(item)
-        
-        currency = "$" if self.currency_var.get() == "USD" else "₱"
-        for i, (month, balance) in enumerate(self.selected_points):
-            self.points_tree.insert('', 'end', values=(i + 1, month, f"{currency}{balance:,.2f}"))
+        with span("LoanCalculator.prepare_interpolation.load"):
+            self.ensure_tab(self.tab3)
+            
+            # Fit the interpolator once; targets are evaluated against the cached fit
+            self.build_interpolator()
+            
+            # Populate points tree
+            for item in self.points_tree.get_children():
+                self.points_tree.delete(item)
+            
+            currency = "$" if self.currency_var.get() == "USD" else "₱"
+            for i, (month, balance) in enumerate(self.selected_points):
+                self.points_tree.insert('', 'end', values=(i + 1, month, f"{currency}{balance:,.2f}"))
         
         # Switch to interpolation tab
         self.notebook.select(self.tab3)
         messagebox.showinfo("Success", f"Loaded {len(self.selected_points)} data points for interpolation!")
     
+    def build_interpolator(self):
+        """Fit the selected interpolation engine to the loaded data points"""
+        from NumericalMethods.interpolation import create_interpolator
+        
+        months, balances = zip(*self.selected_points)
+        engine = self.INTERPOLATION_ENGINES[self.engine_var.get()]
+        self.interpolator = create_interpolator(months, balances, engine)
+    
+    def change_interpolation_engine(self, event=None):
+        """Refit the loaded points when a different engine is chosen"""
+        if len(self.selected_points) >= 4:
+            self.build_interpolator()
+    
+    @timed()
     def calculate_interpolation(self):
         """Calculate polynomial interpolation using Newton's Divided Difference"""
-        if len(self.selected_points) < 4:
+        if len(self.selected_points) < 4 or self.interpolator is None:
             messagebox.showerror("Error", "Need at least 4 data points!")
             return
         
         try:
             target_month = float(self.target_month_entry.get())
-            
-            # Extract x and y values
-            months = np.array([point[0] for point in self.selected_points])
-            balances = np.array([point[1] for point in self.selected_points])
-            
-            # Calculate polynomial value at target month
-            result = newton_divided_difference_interpolation(months, balances, target_month)
-            
-            # Build divided difference table for display
-            dd_table = get_divided_difference_table(months, balances)
-            
-            # Display results
-            currency = "$" if self.currency_var.get() == "USD" else "₱"
-            n = len(self.selected_points)
-            degree = n - 1
-            
-            output = f"""
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid target month!")
+            return
+        
+        currency = "$" if self.currency_var.get() == "USD" else "₱"
+        self.tasks.submit(self.compute_interpolation, self.interpolator, list(self.selected_points), target_month, currency,
+                          on_done=self.show_interpolation_results, on_error=self.show_task_error,
+                          on_progress=self.update_task_progress,
+                          description="Calculating polynomial...", key='interpolation')
+    
+    @timed()
+    def compute_interpolation(self, job, interpolator, points, target_month, currency):
+        """Worker-side part of calculate_interpolation: no Tk access allowed here"""
+        from NumericalMethods.interpolation import NewtonInterpolator, CubicSplineInterpolator, format_newton_polynomial
+        
+        is_newton = isinstance(interpolator, NewtonInterpolator)
+        is_spline = isinstance(interpolator, CubicSplineInterpolator)
+        
+        # Calculate value at target month from the cached fit
+        with span("LoanCalculator.compute_interpolation.evaluate"):
+            result = interpolator.evaluate(target_month)
+        
+        # Display results
+        n = len(points)
+        degree = n - 1
+        title = f"{interpolator.method_name.upper()} INTERPOLATION"
+        
+        output = f"""
 {'='*70}
-           NEWTON'S DIVIDED DIFFERENCE INTERPOLATION
+{title:^70}
 {'='*70}
 
 DATA POINTS ({n} points):
 """
-            for i, (month, balance) in enumerate(self.selected_points):
-                output += f"  Point {i + 1}: Month {month:>3}, Balance {currency}{balance:>12,.2f}\n"
+        for i, (month, balance) in enumerate(points):
+            job.check_cancelled()
+            output += f"  Point {i + 1}: Month {month:>3}, Balance {currency}{balance:>12,.2f}\n"
+        
+        if is_newton:
+            # Cached x values and divided difference table
+            months = interpolator.nodes
+            dd_table = interpolator.table
             
             output += f"\n{'='*70}\nDIVIDED DIFFERENCE TABLE:\n{'='*70}\n"
             output += f"{'Point':<8} {'Month':<8} {'f(x)':<15}"
@@ -504,6 +1171,7 @@ DATA POINTS ({n} points):
             output += "\n" + "-" * 70 + "\n"
             
             for i in range(n):
+                job.check_cancelled()
                 output += f"{i:<8} {months[i]:<8.0f} {dd_table[i, 0]:<15,.2f}"
                 for j in range(1, min(5, n - i)):
                     output += f" {dd_table[i, j]:<10,.4f}"
@@ -511,31 +1179,239 @@ DATA POINTS ({n} points):
             
             output += f"\n{'='*70}\nPOLYNOMIAL EQUATION (Newton Form):\n{'='*70}\n"
             output += format_newton_polynomial(dd_table, months)
-            
-            output += f"\n{'='*70}\n"
-            output += f"Polynomial Degree: {degree}{'st' if degree == 1 else 'nd' if degree == 2 else 'rd' if degree == 3 else 'th'} degree"
-            output += f"\nNumber of Data Points: {n}"
-            output += f"\n{'='*70}\n\n"
-            
-            output += f"""╔{'='*68}╗
+        
+        if is_spline:
+            degree_text = f"Piecewise cubic ({n - 1} segments)"
+        else:
+            degree_text = f"{degree}{'st' if degree == 1 else 'nd' if degree == 2 else 'rd' if degree == 3 else 'th'} degree"
+        
+        output += f"\n{'='*70}\n"
+        output += f"Polynomial Degree: {degree_text}"
+        output += f"\nNumber of Data Points: {n}"
+        output += f"\n{'='*70}\n\n"
+        
+        output += f"""╔{'='*68}╗
 ║{' '*20}PREDICTION RESULT{' '*30}║
 ╠{'='*68}╣
 ║  Target Month:        {target_month:<45.0f} ║
 ║  Predicted Balance:   {currency}{result:<43,.2f} ║
-║  Polynomial Degree:   {degree}{'st' if degree == 1 else 'nd' if degree == 2 else 'rd' if degree == 3 else 'th'} degree{' ' * (43 - len(str(degree)) - 9)} ║
-║  Method Used:         Newton's Divided Difference{' ' * 18} ║
+║  Polynomial Degree:   {degree_text:<45} ║
+║  Method Used:         {interpolator.method_name:<45} ║
 ╚{'='*68}╝
 
-✓ Polynomial passes through all {n} data points
+✓ {'Spline' if is_spline else 'Polynomial'} passes through all {n} data points
 ✓ Prediction calculated successfully
 """
-            
-            self.interp_result_text.delete(1.0, tk.END)
-            self.interp_result_text.insert(1.0, output)
-            
-            messagebox.showinfo("Success", f"Predicted balance at month {target_month}: {currency}{result:,.2f}")
-            
+        
+        return target_month, result, currency, output
+    
+    def show_interpolation_results(self, outcome):
+        """Apply a finished interpolation to the widgets"""
+        target_month, result, currency, output = outcome
+        
+        self.interp_result_text.delete(1.0, tk.END)
+        self.interp_result_text.insert(1.0, output)
+        
+        messagebox.showinfo("Success", f"Predicted balance at month {target_month}: {currency}{result:,.2f}")
+    
+    def update_task_status(self, description):
+        """Reflect whether a background job is running in the status bar"""
+        if description:
+            self.status_label.config(text=description)
+            self.cancel_btn.config(state='normal')
+        else:
+            self.status_label.config(text="Ready")
+            self.cancel_btn.config(state='disabled')
+            self.progress_bar.config(value=0)
+    
+    def update_task_progress(self, fraction, message):
+        self.progress_bar.config(value=fraction)
+        if message:
+            self.status_label.config(text=message)
+    
+    def close(self):
+        """Cancel pending work, shut the worker pools down and close the window"""
+        if self.live_after_id is not None:
+            self.root.after_cancel(self.live_after_id)
+            self.live_after_id = None
+        self.tasks.shutdown()
+        self.root.destroy()
+    
+    def cancel_tasks(self):
+        """Cancel running background jobs; their results are discarded"""
+        self.tasks.cancel_all()
+        self.update_task_status(None)
+    
+    def show_task_error(self, error):
+        messagebox.showerror("Error", f"An error occurred: {str(error)}")
+    
+    def analyze_interpolation(self):
+        """Measure the fitted interpolator against every month of the exact schedule"""
+        import numpy as np
+        
+        if self.interpolator is None or not self.amortization_data:
+            messagebox.showerror("Error", "Load data points for interpolation first!")
+            return
+        
+        try:
+            tolerance = float(self.tolerance_entry.get())
         except ValueError:
-            messagebox.showerror("Error", "Please enter a valid target month!")
+            messagebox.showerror("Error", "Please enter a valid maximum error!")
+            return
+        
+        # Exact balances for month 0 (opening balance) through the last month
+        schedule = self.amortization_data
+        opening_balance = schedule['balance'][0] + schedule['principal'][0]
+        months = np.r_[0, schedule['month']]
+        balances = np.r_[opening_balance, schedule['balance']]
+        
+        currency = "$" if self.currency_var.get() == "USD" else "₱"
+        engine = self.INTERPOLATION_ENGINES[self.engine_var.get()]
+        self.tasks.submit(self.compute_error_analysis, self.interpolator, months, balances, engine, tolerance, currency,
+                          self.schedule_frequency(), on_done=self.show_error_analysis, on_error=self.show_task_error,
+                          on_progress=self.update_task_progress,
+                          description="Analyzing interpolation error...", key='interpolation')
+    
+    def compute_error_analysis(self, job, interpolator, months, balances, engine, tolerance, currency,
+                               payments_per_year=12):
+        """Worker-side part of analyze_interpolation: no Tk access allowed here"""
+        from NumericalMethods.interpolation import analyze_interpolation_error, rank_sampling_densities
+        from NumericalMethods.loan_calculations import period_label
+        
+        unit = period_label(payments_per_year).lower()
+        analysis = analyze_interpolation_error(interpolator, months, balances)
+        job.report_progress(0.5, "Ranking sampling densities...")
+        ranking = rank_sampling_densities(months, balances, steps=(6, 12, 24, 36, 60),
+                                          engine=engine, tolerance=tolerance,
+                                          progress=lambda fraction: job.report_progress(0.5 + fraction / 2))
+        
+        output = f"""
+{'='*70}
+{'INTERPOLATION ERROR ANALYSIS':^70}
+{'='*70}
+
+Method: {interpolator.method_name} ({len(interpolator)} points)
+Compared against the exact balance at all {len(months)} {unit}s
+
+  Max Error:    {currency}{analysis['max_error']:>14,.2f}  ({unit} {analysis['max_error_month']:.0f})
+  RMS Error:    {currency}{analysis['rms_error']:>14,.2f}
+
+{'='*70}
+ERROR BY SEGMENT:
+{'='*70}
+{'Segment':<20} {'Max Error':>20} {'RMS Error':>20}
+{'-'*70}
+"""
+        for segment in analysis['segments']:
+            month_range = f"{segment['start']:.0f} - {segment['end']:.0f}"
+            output += f"{month_range:<20} {currency}{segment['max_error']:>19,.2f} {currency}{segment['rms_error']:>19,.2f}\n"
+        
+        output += f"""
+{'='*70}
+SAMPLING DENSITY RANKING (target max error {currency}{tolerance:,.2f}):
+{'='*70}
+{'Every':<10} {'Points':>8} {'Max Error':>18} {'RMS Error':>16} {'Time (ms)':>10}  OK
+{'-'*70}
+"""
+        for candidate in ranking:
+            output += (f"{candidate['step']:<3} {unit + 's':<6} {candidate['points']:>8} "
+                       f"{currency}{candidate['max_error']:>17,.2f} {currency}{candidate['rms_error']:>15,.2f} "
+                       f"{candidate['seconds'] * 1000:>10.2f}  {'✓' if candidate['meets_target'] else '✗'}\n")
+        
+        best = ranking[0]
+        if best['meets_target']:
+            output += f"\n✓ Cheapest selection within target: every {best['step']} {unit}s ({best['points']} points)\n"
+        else:
+            output += "\n✗ No sampling density meets the target with this engine\n"
+        
+        return output
+    
+    def show_error_analysis(self, output):
+        self.interp_result_text.delete(1.0, tk.END)
+        self.interp_result_text.insert(1.0, output)
+    
+    def calculate_sensitivity(self):
+        """Compute the principal x rate x term grid in one broadcast operation"""
+        import numpy as np
+        from NumericalMethods.loan_calculations import calculate_sensitivity_grid
+        
+        try:
+            rate_from, rate_to, rate_step = (float(entry.get()) for entry in self.sensitivity_entries['rate'])
+            term_from, term_to, term_step = (float(entry.get()) for entry in self.sensitivity_entries['term'])
+            principals = [float(value) for value in self.sensitivity_principals_entry.get().split(',') if value.strip()]
+        except ValueError:
+            messagebox.showerror("Error", "Please enter valid numbers!")
+            return
+        
+        if rate_step <= 0 or term_step <= 0 or rate_from > rate_to or term_from > term_to:
+            messagebox.showerror("Invalid Input", "Ranges need From <= To and a positive Step.")
+            return
+        if not principals or min(principals) <= 0 or rate_from < 0 or term_from <= 0:
+            messagebox.showerror("Invalid Input", "Loan amounts and terms must be greater than 0.")
+            return
+        
+        # Inclusive ranges (half a step of slack absorbs floating point error)
+        rates = np.arange(rate_from, rate_to + rate_step / 2, rate_step)
+        terms = np.arange(term_from, term_to + term_step / 2, term_step)
+        if len(principals) * len(rates) * len(terms) > 5_000_000:
+            messagebox.showerror("Invalid Input", "Grid is too large (limit is 5,000,000 combinations).")
+            return
+        
+        payments_per_year, day_count = self.payment_frequency()
+        self.tasks.submit(lambda job: calculate_sensitivity_grid(principals, rates, terms, payments_per_year, day_count),
+                          on_done=self.show_sensitivity_grid, on_error=self.show_task_error,
+                          description="Computing sensitivity grid...", key='sensitivity')
+    
+    def show_sensitivity_grid(self, grid):
+        self.sensitivity_grid = grid
+        labels = [f"{principal:,.2f}" for principal in grid['principal'].tolist()]
+        self.sensitivity_principal_combo.config(values=labels)
+        self.sensitivity_principal_var.set(labels[0])
+        self.populate_sensitivity_table()
+    
+    def populate_sensitivity_table(self):
+        """Show one principal's rate x term slice of the grid for the chosen metric"""
+        grid = self.sensitivity_grid
+        if grid is None:
+            return
+        
+        labels = [f"{principal:,.2f}" for principal in grid['principal'].tolist()]
+        principal_index = labels.index(self.sensitivity_principal_var.get()) if self.sensitivity_principal_var.get() in labels else 0
+        metric = {"Payment": 'payment', "Total Paid": 'total_paid', "Total Interest": 'total_interest'}[self.sensitivity_metric_var.get()]
+        values = grid[metric][principal_index]
+        
+        columns = ['Rate'] + [f"{term:g} yrs" for term in grid['term'].tolist()]
+        tree = self.sensitivity_table.tree
+        tree.configure(columns=columns)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=70 if col == 'Rate' else 110)
+        
+        currency = "$" if self.currency_var.get() == "USD" else "₱"
+        rates = grid['rate'].tolist()
+        
+        def get_rows(start, stop):
+            return [(f"{rate:.2f}%",) + tuple(f"{currency}{value:,.2f}" for value in row)
+                    for rate, row in zip(rates[start:stop], values[start:stop].tolist())]
+        
+        self.sensitivity_table.set_source(len(rates), get_rows)
+    
+    def export_sensitivity_csv(self):
+        """Export the full sensitivity grid to CSV"""
+        if self.sensitivity_grid is None:
+            messagebox.showwarning("Warning", "Compute the sensitivity grid first!")
+            return
+        
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", 
+                                                filetypes=[("CSV files", "*.csv")],
+                                                title="Save Sensitivity Grid")
+        if not file_path:
+            return
+        
+        try:
+            from data_io import write_sensitivity_grid_csv
+            rows = write_sensitivity_grid_csv(file_path, self.sensitivity_grid)
+            messagebox.showinfo("Success", f"{rows:,} grid rows exported to {os.path.basename(file_path)}")
         except Exception as e:
-            messagebox.showerror("Error", f"Calculation error: {str(e)}")
\ No newline at end of file
+            messagebox.showerror("Error", f"Failed to export: {str(e)}")
+
@@ -3,12 +3,94 @@ Smart Loan Calculator - Main Entry Point
 CPE 3108 Programming Project
 Members: Daniel Jon Santos, John Enzu Inigo, Anjoe Paglinawan
 
+Run without arguments to start the GUI, or with --batch for headless mode:
+    python main.py --batch portfolio.csv --output results.csv [--schedules schedules.csv]
+    python main.py --batch quotes.csv --solve-for rate   (principal,payment,term columns)
+    python main.py --batch portfolio.csv --frequency bi-weekly --day-count actual/365
+    python main.py --measure-startup                     (print time to first interaction and exit)
 """
 
-import tkinter as tk
-from loan_calculator import LoanCalculator
+import time
+
+# Taken before anything else is imported so startup measurements include imports
+START_TIME = time.perf_counter()
+
+import argparse
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Smart Loan Calculator")
+    parser.add_argument('--batch', metavar='PORTFOLIO',
+                        help="Price a portfolio CSV (principal,rate,term) without starting the GUI")
+    parser.add_argument('--output', metavar='FILE', default='results.csv',
+                        help="Where to write payments and totals in batch mode (default: results.csv)")
+    parser.add_argument('--schedules', metavar='FILE',
+                        help="Also write every loan's full amortization schedule to this CSV")
+    parser.add_argument('--store', metavar='FILE',
+                        help="Also write every loan's schedule to a memory-mapped binary schedule store")
+    parser.add_argument('--rounding', choices=['half_even', 'half_up'],
+                        help="Round schedules to whole cents with this rule (final payment is trued up)")
+    parser.add_argument('--solve-for', choices=['payment', 'rate', 'term', 'principal'], default='payment',
+                        help="Column to compute in batch mode; rate, term and principal read a payment column")
+    parser.add_argument('--frequency', choices=['monthly', 'semi-monthly', 'bi-weekly', 'weekly'], default='monthly',
+                        help="Payment frequency of the portfolio in batch mode (default: monthly)")
+    parser.add_argument('--day-count', choices=['nominal', 'actual/365', 'actual/360'], default='nominal',
+                        help="Interest accrual: nominal (rate / payments per year) or daily accrual on 7-day "
+                             "(weekly) or 14-day (bi-weekly) periods; other periods average 365 / payments per year days")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: all CPUs, 1 runs inline)")
+    parser.add_argument('--chunk-size', type=int, default=5000,
+                        help="Loans per work chunk (default: 5000)")
+    parser.add_argument('--eager-tabs', action='store_true',
+                        help="Build every GUI tab at startup instead of on first selection")
+    parser.add_argument('--measure-startup', action='store_true',
+                        help="Print the GUI's time to first interaction and exit")
+    return parser.parse_args(argv)
+
+
+def run_gui(eager_tabs=False, measure_startup=False):
+    import tkinter as tk
+    from loan_calculator import LoanCalculator
+    from NumericalMethods.profiling import profiler
 
-if __name__ == "__main__":
     root = tk.Tk()
-    app = LoanCalculator(root)
-    root.mainloop()
\ No newline at end of file
+    app = LoanCalculator(root, lazy_tabs=not eager_tabs)
+
+    def first_interaction():
+        # Runs once the event loop has drawn the window and is waiting for input
+        seconds = time.perf_counter() - START_TIME
+        profiler.record('startup.time_to_first_interaction', seconds)
+        if measure_startup:
+            print(f"Time to first interaction: {seconds * 1000:.0f} ms")
+            root.destroy()
+
+    root.after_idle(first_interaction)
+    root.mainloop()
+
+
+def run_headless(args):
+    from batch import run_batch
+    from NumericalMethods.loan_calculations import PAYMENT_FREQUENCIES
+
+    stats = run_batch(args.batch, args.output, schedules_path=args.schedules,
+                      workers=args.workers, chunk_size=args.chunk_size, rounding=args.rounding,
+                      solve_for=args.solve_for, store_path=args.store,
+                      payments_per_year=PAYMENT_FREQUENCIES[args.frequency], day_count=args.day_count)
+    print(f"Processed {stats['loans']:,} loans in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:,.0f} rows/s)")
+    if stats['unsolved']:
+        print(f"{stats['unsolved']:,} loans have no solution; their solved value and totals were written as nan")
+    if args.schedules:
+        print(f"Wrote {stats['schedule_rows']:,} schedule rows to {args.schedules} "
+              f"({stats['schedule_rows_per_second']:,.0f} rows/s)")
+    if args.store:
+        print(f"Stored {stats['store_rows']:,} schedule rows in {args.store}")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.batch:
+        run_headless(args)
+    else:
+        run_gui(args.eager_tabs, args.measure_startup)
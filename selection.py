@@ -0,0 +1,113 @@
+"""
+Row selection model for the Loan Calculator
+Tracks which schedule rows are selected independently of any widget
+"""
+
+import numpy as np
+
+
+class SelectionModel:
+    """
+    Selection state over schedule rows, stored as a boolean mask.
+
+    Rows are addressed by their zero-based index in the schedule. Toggling a
+    row is O(1) and rule-based selections are single array operations, so
+    nothing has to be read back from the Treeview.
+    """
+    def __init__(self, size=0):
+        self.mask = np.zeros(size, dtype=bool)
+
+    def reset(self, size):
+        """Forget the current selection and resize to a new number of rows"""
+        self.mask = np.zeros(size, dtype=bool)
+
+    def __len__(self):
+        return len(self.mask)
+
+    def __contains__(self, index):
+        return bool(self.mask[index])
+
+    @property
+    def count(self):
+        return int(np.count_nonzero(self.mask))
+
+    def toggle(self, index):
+        """
+        Flip the selection state of one row.
+
+        Args:
+            index (int): Row index
+
+        Returns:
+            bool: True if the row is now selected
+        """
+        self.mask[index] = not self.mask[index]
+        return bool(self.mask[index])
+
+    def set(self, index, selected=True):
+        self.mask[index] = selected
+
+    def clear(self):
+        self.mask[:] = False
+
+    def select_every(self, step, start=None):
+        """
+        Select every ``step``-th row.
+
+        Args:
+            step (int): Spacing between selected rows
+            start (int): First row index to select (defaults to step - 1, so
+                a step of 12 selects months 12, 24, 36, ...)
+
+        Returns:
+            int: Number of rows selected by this rule
+        """
+        if step < 1:
+            raise ValueError("Selection step must be at least 1")
+        start = step - 1 if start is None else start
+        rows = self.mask[start::step]
+        newly_selected = len(rows) - int(np.count_nonzero(rows))
+        self.mask[start::step] = True
+        return newly_selected
+
+    def select_range(self, start, stop, step=1):
+        """
+        Select rows in [start, stop) with an optional spacing.
+
+        Args:
+            start (int): First row index
+            stop (int): Row index after the last one
+            step (int): Spacing between selected rows
+
+        Returns:
+            int: Number of rows selected by this rule
+        """
+        rows = self.mask[start:stop:step]
+        newly_selected = len(rows) - int(np.count_nonzero(rows))
+        self.mask[start:stop:step] = True
+        return newly_selected
+
+    def select_indices(self, indices, selected=True):
+        """Set the selection state of many rows at once"""
+        self.mask[np.asarray(indices, dtype=np.intp)] = selected
+
+    def indices(self):
+        """
+        Return the selected row indices in ascending order.
+
+        Returns:
+            numpy.ndarray: Sorted row indices
+        """
+        return np.flatnonzero(self.mask)
+
+    def extract(self, *columns):
+        """
+        Pull the selected rows out of one or more schedule columns.
+
+        Args:
+            *columns (numpy.ndarray): Columns with one entry per row
+
+        Returns:
+            tuple: The selected values of each column, in row order
+        """
+        return tuple(np.asarray(column)[self.mask] for column in columns)
@@ -0,0 +1,470 @@
+"""
+Local HTTP/JSON service for the Loan Calculator
+Shares one warm calculation engine between local tools without importing tkinter
+
+Start the service:
+    python service.py --port 8765 --workers 4
+
+Endpoints (JSON bodies, POST unless noted):
+    GET  /health        status and counters
+    POST /payment       {"principal", "annual_rate", "years"} or {"loans": [[p, r, y], ...]}
+    POST /totals        same inputs as /payment
+    POST /schedule      {"principal", "annual_rate", "years"}; rows are streamed in chunks
+    POST /interpolate   {"months", "balances", "target_month"} or {"targets": [...]}
+    POST /batch         {"requests": [{"op": "payment" | "totals" | "interpolate", ...}, ...]}
+
+Loans are monthly with nominal interest; requests asking for another
+"payments_per_year" or "day_count" are rejected.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from NumericalMethods.loan_calculations import (calculate_monthly_payment_batch, calculate_loan_totals_batch,
+                                                count_payments, LazyAmortizationSchedule)
+from NumericalMethods.interpolation import NewtonInterpolator
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+SCHEDULE_CHUNK_ROWS = 5000
+MAX_BODY_BYTES = 16 << 20
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    """A client error reported back as a JSON error response"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _loan_arrays(loans):
+    """
+    Validate (principal, annual_rate, years) triples and split them into arrays.
+
+    Args:
+        loans (list): [[principal, annual_rate, years], ...]
+
+    Returns:
+        tuple: (principals, annual_rates, years) as numpy arrays
+    """
+    try:
+        values = np.array(loans, dtype=float).reshape(-1, 3)
+    except (TypeError, ValueError):
+        raise RequestError("'loans' must be a list of [principal, annual_rate, years] triples") from None
+    principals, annual_rates, years = values.T
+    if np.any(principals <= 0) or np.any(annual_rates < 0) or np.any(years <= 0):
+        raise RequestError("Loans need a positive principal and term and a non-negative rate")
+    return principals, annual_rates, years
+
+
+def _check_monthly(payload):
+    """Reject requests for loans the service does not price (non-monthly or daily accrual)"""
+    if payload.get('payments_per_year', 12) != 12 or payload.get('day_count', 'nominal') != 'nominal':
+        raise RequestError("The service prices monthly loans with nominal interest only "
+                           "(payments_per_year 12, day_count 'nominal')")
+
+
+def _single_loan(payload):
+    """
+    Read and validate one loan from a request body.
+
+    Runs on the event loop before the loan joins a coalesced batch, so an
+    invalid loan is rejected on its own instead of failing its whole batch.
+    """
+    _check_monthly(payload)
+    try:
+        principal, annual_rate, years = (float(payload['principal']), float(payload['annual_rate']),
+                                         float(payload['years']))
+    except KeyError as e:
+        raise RequestError(f"Missing field {e.args[0]!r}") from None
+    except (TypeError, ValueError):
+        raise RequestError("principal, annual_rate and years must be numbers") from None
+    if not (principal > 0 and annual_rate >= 0 and years > 0):
+        raise RequestError("Loans need a positive principal and term and a non-negative rate")
+    return [principal, annual_rate, years]
+
+
+def _interpolation_request(payload):
+    """
+    Read and validate an interpolation request body.
+
+    Returns:
+        tuple: (months, balances, targets, single), where ``single`` is True
+        when the request asked for one ``target_month`` rather than a list
+        of ``targets``.
+    """
+    try:
+        months, balances = payload['months'], payload['balances']
+    except KeyError as e:
+        raise RequestError(f"Missing field {e.args[0]!r}") from None
+    if not isinstance(months, list) or not isinstance(balances, list):
+        raise RequestError("months and balances must be lists")
+    if 'targets' in payload:
+        targets, single = payload['targets'], False
+        if not isinstance(targets, list):
+            raise RequestError("targets must be a list")
+    elif 'target_month' in payload:
+        targets, single = [payload['target_month']], True
+    else:
+        raise RequestError("Missing field 'target_month' or 'targets'")
+    if not all(isinstance(t, (int, float)) and not isinstance(t, bool) and math.isfinite(t) for t in targets):
+        raise RequestError("Interpolation targets must be finite numbers")
+    return months, balances, targets, single
+
+
+# Worker-side functions: these run in the process pool and must stay picklable
+
+def compute_payments(loans):
+    """Monthly payments for a list of loans"""
+    return calculate_monthly_payment_batch(*_loan_arrays(loans)).tolist()
+
+
+def compute_totals(loans):
+    """Payment, total paid and total interest for a list of loans"""
+    payments, total_paid, total_interest = calculate_loan_totals_batch(*_loan_arrays(loans))
+    return [{'monthly_payment': p, 'total_paid': t, 'total_interest': i}
+            for p, t, i in zip(payments.tolist(), total_paid.tolist(), total_interest.tolist())]
+
+
+def compute_schedule_chunk(principal, annual_rate, years, start, stop):
+    """
+    Format schedule rows [start, stop) as comma-separated JSON arrays.
+
+    Rows come from the closed-form lazy schedule, so each chunk costs the same
+    no matter where in the schedule it starts.
+    """
+    window = LazyAmortizationSchedule(principal, annual_rate, years)[start:stop]
+    columns = [window[name].tolist() for name in ('month', 'payment', 'interest', 'principal', 'balance')]
+    rows = [value for row in zip(*columns) for value in row]
+    return ",".join(["[%d,%r,%r,%r,%r]"] * len(window)) % tuple(rows)
+
+
+def compute_interpolation(months, balances, targets):
+    """Evaluate the Newton interpolating polynomial at every target"""
+    try:
+        interpolator = NewtonInterpolator(months, balances)
+        return np.atleast_1d(interpolator.evaluate(np.asarray(targets, dtype=float))).tolist()
+    except (TypeError, ValueError) as e:
+        raise RequestError(f"Invalid interpolation points: {e}") from None
+
+
+class PaymentBatcher:
+    """
+    Coalesces single-loan payment requests into one vectorized computation.
+
+    Requests that arrive within ``max_delay`` seconds of each other (or until
+    ``max_batch`` are waiting) are priced together in one process-pool call,
+    so many small clients cost about as much as one batch client.
+    """
+
+    def __init__(self, service, max_batch=1024, max_delay=0.002):
+        self.service = service
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending = []
+        self._timer = None
+        self._running = set()
+        self.batches = 0
+
+    async def submit(self, loan):
+        """
+        Queue one loan and wait for its payment.
+
+        Args:
+            loan (list): [principal, annual_rate, years]
+
+        Returns:
+            float: Monthly payment
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((loan, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            self.batches += 1
+            task = asyncio.ensure_future(self._run(pending))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, pending):
+        try:
+            payments = await self.service.run(compute_payments, [loan for loan, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), payment in zip(pending, payments):
+            if not future.done():
+                future.set_result(payment)
+
+
+class LoanService:
+    """
+    asyncio HTTP/1.1 server exposing the calculation engine as JSON endpoints.
+
+    CPU-bound work runs in a process pool; a semaphore bounds how many jobs
+    are in flight so a burst of clients queues instead of oversubscribing the
+    machine. Schedules are streamed with chunked transfer encoding, one chunk
+    of rows at a time, so large schedules never sit in memory as one response.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, max_concurrency=None,
+                 batch_delay=0.002):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or 2 * self.workers
+        self.batch_delay = batch_delay
+        self.requests = 0
+        self.started = None
+        self._server = None
+        self._pool = None
+        self._limit = None
+        self.batcher = None
+        self.routes = {
+            '/payment': self.handle_payment,
+            '/totals': self.handle_totals,
+            '/schedule': self.handle_schedule,
+            '/interpolate': self.handle_interpolate,
+            '/batch': self.handle_batch,
+        }
+
+    async def start(self):
+        """Start the process pool and begin accepting connections"""
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._limit = asyncio.Semaphore(self.max_concurrency)
+        self.batcher = PaymentBatcher(self, max_delay=self.batch_delay)
+        self._server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.started = time.time()
+        # Warm every worker so the first real request does not pay for imports
+        await asyncio.gather(*(self.run(compute_payments, [[1000, 5, 1]]) for _ in range(self.workers)))
+
+    async def close(self):
+        """Stop accepting connections and shut the process pool down"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Loan service listening on http://{self.host}:{self.port} ({self.workers} workers)")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def run(self, func, *args):
+        """Run a worker-side function in the process pool, within the concurrency limit"""
+        async with self._limit:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it"""
+        try:
+            while True:
+                request = await self.read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self.requests += 1
+                try:
+                    await self.dispatch(method, path, body, writer, keep_alive)
+                except RequestError as e:
+                    await self.send_json(writer, {'error': str(e)}, e.status, keep_alive)
+                except Exception as e:
+                    await self.send_json(writer, {'error': f"{type(e).__name__}: {e}"}, 500, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        """
+        Read one HTTP request.
+
+        Returns:
+            tuple: (method, path, headers, body) or None at end of stream
+        """
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, path, _ = request_line.decode('latin-1').split()
+        except ValueError:
+            raise ConnectionError("Malformed request line") from None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length', 0) or 0)
+        if length > MAX_BODY_BYTES:
+            raise ConnectionError("Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), path.split('?', 1)[0], headers, body
+
+    async def dispatch(self, method, path, body, writer, keep_alive):
+        """Route a request to its handler"""
+        if path == '/health':
+            await self.send_json(writer, {'status': 'ok', 'workers': self.workers,
+                                          'max_concurrency': self.max_concurrency, 'requests': self.requests,
+                                          'payment_batches': self.batcher.batches,
+                                          'uptime': time.time() - self.started}, keep_alive=keep_alive)
+            return
+        handler = self.routes.get(path)
+        if handler is None:
+            raise RequestError(f"Unknown endpoint {path}", 404)
+        if method != 'POST':
+            raise RequestError(f"{path} expects POST", 405)
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise RequestError("Request body is not valid JSON") from None
+        if not isinstance(payload, dict):
+            raise RequestError("Request body must be a JSON object")
+        await handler(payload, writer, keep_alive)
+
+    async def handle_payment(self, payload, writer, keep_alive):
+        _check_monthly(payload)
+        if 'loans' in payload:
+            result = {'monthly_payments': await self.run(compute_payments, payload['loans'])}
+        else:
+            result = {'monthly_payment': await self.batcher.submit(_single_loan(payload))}
+        await self.send_json(writer, result, keep_alive=keep_alive)
+
+    async def handle_totals(self, payload, writer, keep_alive):
+        _check_monthly(payload)
+        loans = payload['loans'] if 'loans' in payload else [_single_loan(payload)]
+        totals = await self.run(compute_totals, loans)
+        await self.send_json(writer, {'totals': totals} if 'loans' in payload else totals[0], keep_alive=keep_alive)
+
+    async def handle_schedule(self, payload, writer, keep_alive):
+        principal, annual_rate, years = _single_loan(payload)
+        num_payments = count_payments(years)
+
+        # Headers go out first; rows follow chunk by chunk as the pool formats them
+        self.write_head(writer, 200, {'Content-Type': 'application/json', 'Transfer-Encoding': 'chunked'}, keep_alive)
+        self.write_chunk(writer, '{"columns":["month","payment","interest","principal","balance"],"rows":[')
+        try:
+            for start in range(0, num_payments, SCHEDULE_CHUNK_ROWS):
+                stop = min(start + SCHEDULE_CHUNK_ROWS, num_payments)
+                text = await self.run(compute_schedule_chunk, principal, annual_rate, years, start, stop)
+                self.write_chunk(writer, ("," if start else "") + text)
+                await writer.drain()
+        except Exception as e:
+            # The status line is already sent; dropping the connection is the only way to signal failure
+            raise ConnectionError(f"Schedule stream aborted: {e}") from e
+        self.write_chunk(writer, f'],"num_payments":{num_payments}}}')
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    async def handle_interpolate(self, payload, writer, keep_alive):
+        months, balances, targets, single = _interpolation_request(payload)
+        values = await self.run(compute_interpolation, months, balances, targets)
+        result = {'value': values[0]} if single else {'values': values}
+        await self.send_json(writer, result, keep_alive=keep_alive)
+
+    async def handle_batch(self, payload, writer, keep_alive):
+        """
+        Answer many requests in one round trip. Payment and totals requests
+        are each priced in a single vectorized call; interpolations run
+        concurrently in the pool.
+        """
+        requests = payload.get('requests')
+        if not isinstance(requests, list):
+            raise RequestError("'requests' must be a list")
+
+        # Validate and group every request before any work is started
+        groups = {'payment': [], 'totals': []}
+        interpolations = []
+        for index, request in enumerate(requests):
+            op = request.get('op') if isinstance(request, dict) else None
+            if op in groups:
+                groups[op].append((index, _single_loan(request)))
+            elif op == 'interpolate':
+                try:
+                    months, balances, targets, single = _interpolation_request(request)
+                except RequestError as e:
+                    raise RequestError(f"Request {index}: {e}") from None
+                interpolations.append((index, single, (months, balances, targets)))
+            else:
+                raise RequestError(f"Request {index}: unknown op {op!r}")
+
+        results = [None] * len(requests)
+        jobs = [self.run(compute_payments, [loan for _, loan in groups['payment']]),
+                self.run(compute_totals, [loan for _, loan in groups['totals']])]
+        jobs += [self.run(compute_interpolation, *arguments) for _, _, arguments in interpolations]
+        payments, totals, *values = await asyncio.gather(*jobs)
+
+        for (index, _), payment in zip(groups['payment'], payments):
+            results[index] = {'monthly_payment': payment}
+        for (index, _), total in zip(groups['totals'], totals):
+            results[index] = total
+        for (index, single, _), value in zip(interpolations, values):
+            results[index] = {'value': value[0]} if single else {'values': value}
+        await self.send_json(writer, {'results': results}, keep_alive=keep_alive)
+
+    def write_head(self, writer, status, headers, keep_alive):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+
+    def write_chunk(self, writer, text):
+        data = text.encode()
+        writer.write(b'%x\r\n%s\r\n' % (len(data), data))
+
+    async def send_json(self, writer, obj, status=200, keep_alive=True):
+        body = json.dumps(obj).encode()
+        self.write_head(writer, status, {'Content-Type': 'application/json', 'Content-Length': len(body)}, keep_alive)
+        writer.write(body)
+        await writer.drain()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Loan Calculator JSON service")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument('--max-concurrency', type=int, default=None,
+                        help="Jobs allowed in flight at once (default: twice the workers)")
+    parser.add_argument('--batch-delay', type=float, default=0.002,
+                        help="Seconds single payment requests wait to be batched (default: 0.002)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    service = LoanService(args.host, args.port, args.workers, args.max_concurrency, args.batch_delay)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
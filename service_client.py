@@ -0,0 +1,203 @@
+"""
+Test client for the Loan Calculator JSON service
+Uses only the standard library, so other tools can copy it as-is
+
+Check a running service:
+    python service_client.py --url http://127.0.0.1:8765
+Or start a private service on a free port and check that:
+    python service_client.py --start-server
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+class LoanServiceClient:
+    """Small blocking client; one keep-alive connection per instance"""
+
+    def __init__(self, url='http://127.0.0.1:8765', timeout=30):
+        parsed = urlparse(url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self._connection = None
+
+    def _request(self, method, path, payload=None):
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body else {}
+        try:
+            self._connection.request(method, path, body=body, headers=headers)
+            response = self._connection.getresponse()
+            data = json.loads(response.read())
+        except (ConnectionError, http.client.HTTPException):
+            self.close()
+            raise
+        if response.status != 200:
+            raise RuntimeError(f"{path}: HTTP {response.status}: {data.get('error')}")
+        return data
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def health(self):
+        return self._request('GET', '/health')
+
+    def payment(self, principal, annual_rate, years):
+        return self._request('POST', '/payment', {'principal': principal, 'annual_rate': annual_rate,
+                                                  'years': years})['monthly_payment']
+
+    def payments(self, loans):
+        return self._request('POST', '/payment', {'loans': loans})['monthly_payments']
+
+    def totals(self, principal, annual_rate, years):
+        return self._request('POST', '/totals', {'principal': principal, 'annual_rate': annual_rate, 'years': years})
+
+    def schedule(self, principal, annual_rate, years):
+        return self._request('POST', '/schedule', {'principal': principal, 'annual_rate': annual_rate,
+                                                   'years': years})
+
+    def interpolate(self, months, balances, targets):
+        return self._request('POST', '/interpolate', {'months': months, 'balances': balances,
+                                                      'targets': targets})['values']
+
+    def batch(self, requests):
+        return self._request('POST', '/batch', {'requests': requests})['results']
+
+
+def start_local_service(workers=2):
+    """
+    Run a LoanService on a free port in a background thread.
+
+    Returns:
+        tuple: (url, stop) where stop() shuts the service down
+    """
+    import asyncio
+    from service import LoanService
+
+    ready = threading.Event()
+    state = {}
+
+    def serve():
+        loop = asyncio.new_event_loop()
+        service = LoanService(port=0, workers=workers)
+        loop.run_until_complete(service.start())
+        state.update(loop=loop, service=service)
+        ready.set()
+        loop.run_forever()
+        loop.run_until_complete(service.close())
+        loop.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        state['loop'].call_soon_threadsafe(state['loop'].stop)
+        thread.join()
+
+    return f"http://127.0.0.1:{state['service'].port}", stop
+
+
+def check_service(url, clients=32, requests_per_client=50):
+    """
+    Exercise every endpoint, compare against the local engine and print the results.
+
+    Returns:
+        bool: True when every check passed
+    """
+    from NumericalMethods.loan_calculations import (calculate_monthly_payment, calculate_loan_totals,
+                                                    generate_amortization_schedule)
+    from NumericalMethods.interpolation import newton_divided_difference_interpolation
+
+    client = LoanServiceClient(url)
+    results = []
+
+    def check(name, passed):
+        results.append(passed)
+        print(f"{'✓' if passed else '✗'} {name}")
+
+    check("health", client.health()['status'] == 'ok')
+    check("payment", abs(client.payment(250000, 5.5, 30) - calculate_monthly_payment(250000, 5.5, 30)) < 1e-9)
+    check("payments (list)", len(client.payments([[250000, 5.5, 30], [100000, 0, 10]])) == 2)
+    totals = client.totals(250000, 5.5, 30)
+    check("totals", abs(totals['total_interest'] - calculate_loan_totals(250000, 5.5, 30)[2]) < 1e-6)
+
+    schedule = client.schedule(250000, 5.5, 30)
+    local = generate_amortization_schedule(250000, 5.5, 30)
+    check("schedule (streamed)", len(schedule['rows']) == len(local)
+          and abs(schedule['rows'][-1][4] - local['balance'][-1]) < 1e-6)
+    long_schedule = client.schedule(250000, 5.5, 1000)
+    check("long schedule (multiple chunks)", len(long_schedule['rows']) == 12000)
+
+    months = [0, 60, 120, 180, 240, 300, 360]
+    balances = [250000.0] + [float(local['balance'][m - 1]) for m in months[1:]]
+    values = client.interpolate(months, balances, [90, 200])
+    expected = newton_divided_difference_interpolation(months, balances, 90)
+    check("interpolate", abs(values[0] - expected) < 1e-6)
+
+    batch = client.batch([{'op': 'payment', 'principal': 250000, 'annual_rate': 5.5, 'years': 30},
+                          {'op': 'totals', 'principal': 100000, 'annual_rate': 4, 'years': 15},
+                          {'op': 'interpolate', 'months': months, 'balances': balances, 'target_month': 90}])
+    check("batch", len(batch) == 3 and abs(batch[2]['value'] - expected) < 1e-6)
+
+    try:
+        client.payment(-1, 5, 30)
+        check("rejects invalid input", False)
+    except RuntimeError:
+        check("rejects invalid input", True)
+
+    try:
+        client.batch([{'op': 'interpolate', 'months': months, 'balances': balances}])
+        check("rejects batch interpolation without a target", False)
+    except RuntimeError:
+        check("rejects batch interpolation without a target", True)
+
+    # Many concurrent single-payment clients exercise request batching
+    def hammer(seed):
+        own = LoanServiceClient(url)
+        try:
+            return all(abs(own.payment(100000 + seed + i, 5.0, 30)
+                           - calculate_monthly_payment(100000 + seed + i, 5.0, 30)) < 1e-9
+                       for i in range(requests_per_client))
+        finally:
+            own.close()
+
+    before = client.health()['payment_batches']
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        passed = all(pool.map(hammer, range(0, clients * 1000, 1000)))
+    seconds = time.perf_counter() - start
+    batches = client.health()['payment_batches'] - before
+    total = clients * requests_per_client
+    check(f"{total:,} concurrent payments in {seconds:.2f}s ({total / seconds:,.0f} req/s, "
+          f"{batches:,} engine batches)", passed)
+
+    client.close()
+    return all(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check a Loan Calculator JSON service")
+    parser.add_argument('--url', default='http://127.0.0.1:8765', help="Service address")
+    parser.add_argument('--start-server', action='store_true', help="Start a private service on a free port")
+    args = parser.parse_args()
+
+    stop = None
+    url = args.url
+    if args.start_server:
+        url, stop = start_local_service()
+    try:
+        ok = check_service(url)
+    finally:
+        if stop:
+            stop()
+    raise SystemExit(0 if ok else 1)
@@ -3,6 +3,7 @@ Utility classes and functions for the Loan Calculator
 """
 
 import tkinter as tk
+from tkinter import ttk
 
 class ToolTip:
     """A simple tooltip class for Tkinter widgets"""
@@ -28,4 +29,199 @@ class ToolTip:
     def hide_tooltip(self, event):
         if self.tooltip:
             self.tooltip.destroy()
-            self.tooltip = None
\ No newline at end of file
+            self.tooltip = None
+
+class VirtualTreeview:
+    """
+    A Treeview that only renders the rows currently in view.
+
+    The widget holds a fixed pool of items that is refilled from a row
+    source as the user scrolls, so the cost of showing a table does not
+    depend on how many rows it has. The row source is a function
+    ``get_rows(start, stop)`` returning the display values for that range.
+    Items whose values have not changed since they were last drawn are not
+    touched, so refreshing after a small change only redraws the rows it affected.
+    The selected row is tracked by row index, so the highlight follows its
+    row rather than the pooled item while scrolling.
+    """
+    def __init__(self, parent, columns, height=20, **tree_options):
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings', height=height, **tree_options)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient='vertical', command=self.yview)
+
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.row_count = 0
+        self.offset = 0
+        self.visible_rows = height
+        self.get_rows = None
+        self.items = []
+        self.rendered = []  # values last drawn in each item
+        self.selected_row = None  # row index of the selection, which may be off screen
+
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(3))
+        self.tree.bind("<Prior>", lambda event: self.scroll(-self.visible_rows))
+        self.tree.bind("<Next>", lambda event: self.scroll(self.visible_rows))
+        self.tree.bind("<Up>", lambda event: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda event: self.move_selection(1))
+        self.tree.bind("<<TreeviewSelect>>", lambda event: self._sync_selection())
+        self.tree.bind("<Configure>", self._on_configure)
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def set_source(self, row_count, get_rows, keep_position=False):
+        """
+        Replace the row source and show the table from the top, or from
+        where it was when keep_position is set.
+
+        Args:
+            row_count (int): Number of rows in the new source
+            get_rows (callable): get_rows(start, stop) -> list of value tuples
+            keep_position (bool): Stay at the current scroll offset (clamped to
+                the new row count) instead of jumping to the first row
+        """
+        self.row_count = row_count
+        self.get_rows = get_rows
+        self.offset = max(0, min(self.offset, row_count - self.visible_rows)) if keep_position else 0
+        if not keep_position:
+            # Columns may have been reconfigured along with the source
+            self.rendered = [None] * len(self.items)
+            self.selected_row = None
+        elif self.selected_row is not None and self.selected_row >= row_count:
+            self.selected_row = None
+        self.refresh()
+
+    def clear(self):
+        self.set_source(0, None)
+
+    def refresh(self):
+        """Re-render the visible window from the row source"""
+        window = min(self.visible_rows, self.row_count)
+        while len(self.items) < window:
+            self.items.append(self.tree.insert('', 'end'))
+            self.rendered.append(None)
+        while len(self.items) > window:
+            self.tree.delete(self.items.pop())
+            self.rendered.pop()
+
+        if window:
+            rows = self.get_rows(self.offset, self.offset + window)
+            for slot, values in enumerate(rows):
+                self._draw(slot, values)
+        self._show_selection()
+        self._update_scrollbar()
+
+    def refresh_rows(self, indices):
+        """Re-render specific rows if they are currently visible"""
+        for index in indices:
+            slot = index - self.offset
+            if 0 <= slot < len(self.items):
+                self._draw(slot, self.get_rows(index, index + 1)[0])
+
+    def _draw(self, slot, values):
+        """Show values in an item unless it already shows exactly these values"""
+        values = tuple(values)
+        if values != self.rendered[slot]:
+            self.tree.item(self.items[slot], values=values)
+            self.rendered[slot] = values
+
+    def index_of(self, item):
+        """Return the absolute row index shown by a tree item, or None"""
+        try:
+            return self.offset + self.items.index(item)
+        except ValueError:
+            return None
+
+    def item_for_index(self, index):
+        """Return the tree item showing a row index, or None if it is off screen"""
+        slot = index - self.offset
+        if 0 <= slot < len(self.items):
+            return self.items[slot]
+        return None
+
+    def selected_index(self):
+        """Return the row index of the selected row, or None"""
+        self._sync_selection()
+        return self.selected_row
+
+    def select_index(self, index):
+        """Select a row by index, scrolling the least needed to show it"""
+        if not self.row_count:
+            return
+        index = max(0, min(int(index), self.row_count - 1))
+        self.selected_row = index
+        if index < self.offset:
+            self.scroll_to(index)
+        elif index >= self.offset + self.visible_rows:
+            self.scroll_to(index - self.visible_rows + 1)
+        self._show_selection()
+
+    def move_selection(self, rows):
+        """Key handler: move the selection, scrolling past the edge of the window"""
+        self._sync_selection()
+        self.select_index(self.offset if self.selected_row is None else self.selected_row + rows)
+        return "break"
+
+    def _expected_selection(self):
+        item = None if self.selected_row is None else self.item_for_index(self.selected_row)
+        return () if item is None else (item,)
+
+    def _show_selection(self):
+        """Highlight the item showing the selected row, if it is on screen"""
+        expected = self._expected_selection()
+        if tuple(self.tree.selection()) != expected:
+            self.tree.selection_set(expected)
+        if expected:
+            self.tree.focus(expected[0])
+
+    def _sync_selection(self):
+        """Adopt a selection the user made with the mouse or the tree's own keys"""
+        selection = tuple(self.tree.selection())
+        if selection and selection != self._expected_selection():
+            self.selected_row = self.index_of(selection[0])
+
+    def scroll_to(self, index):
+        """Scroll so that a row index is the first visible row"""
+        last_offset = max(0, self.row_count - self.visible_rows)
+        offset = max(0, min(int(index), last_offset))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def scroll(self, rows):
+        self.scroll_to(self.offset + rows)
+
+    def yview(self, *args):
+        """Scrollbar command: handles 'moveto' and 'scroll' requests"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.scroll_to(round(float(args[1]) * self.row_count))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self.scroll(amount * self.visible_rows if args[2] == 'pages' else amount)
+
+    def _update_scrollbar(self):
+        if self.row_count:
+            first = self.offset / self.row_count
+            last = min(1.0, (self.offset + self.visible_rows) / self.row_count)
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_configure(self, event):
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        # Leave room for the heading row
+        visible_rows = max(1, (event.height - row_height) // row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.offset = max(0, min(self.offset, self.row_count - visible_rows))
+            self.refresh()
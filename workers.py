@@ -0,0 +1,172 @@
+"""
+Background task execution for the Loan Calculator
+Runs calculations off the Tk main thread and reports back through the event loop
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled"""
+
+
+class Job:
+    """
+    Handle for a submitted task.
+
+    The task function receives the job as its first argument and may call
+    ``report_progress`` and ``check_cancelled`` while it runs. Both are safe
+    to call from the worker thread; nothing here touches Tk directly.
+    """
+    def __init__(self, runner, description="", key=None):
+        self.runner = runner
+        self.description = description
+        self.key = key
+        self._cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Request cancellation; the result of the job will be discarded"""
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check_cancelled(self):
+        """Raise JobCancelled if cancellation was requested"""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def report_progress(self, fraction, message=""):
+        """
+        Post progress back to the UI thread.
+
+        Args:
+            fraction (float): Completed fraction between 0 and 1
+            message (str): Optional status text
+        """
+        self.check_cancelled()
+        self.runner._events.put(('progress', self, fraction, message))
+
+
+class TaskRunner:
+    """
+    Runs jobs on a thread pool.
+
+    Completion, errors and progress are delivered to the callbacks on the Tk
+    main thread by polling a queue with ``root.after``. Submitting a job with
+    the same ``key`` as a running one cancels the older job, so only the
+    latest calculation's results are ever applied.
+
+    Cancellation is cooperative: a job stops at its next ``report_progress``
+    or ``check_cancelled`` call. Call ``shutdown`` when the window closes.
+    """
+    def __init__(self, root, max_workers=2, poll_interval=50, on_status=None):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.on_status = on_status
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="loan-worker")
+        self._events = queue.Queue()
+        self._jobs = []
+        self._polling = False
+
+    def submit(self, func, *args, on_done=None, on_error=None, on_progress=None,
+               description="", key=None, **kwargs):
+        """
+        Run ``func(job, *args, **kwargs)`` in the background.
+
+        Args:
+            func (callable): Task function; receives the Job as first argument
+            on_done (callable): Called with the result on the UI thread
+            on_error (callable): Called with the exception on the UI thread
+            on_progress (callable): Called with (fraction, message) on the UI thread
+            description (str): Status text shown while the job runs
+            key (str): Jobs sharing a key replace each other
+
+        Returns:
+            Job: Handle that can be used to cancel the job
+        """
+        if key is not None:
+            for running in self._jobs:
+                if running.key == key:
+                    running.cancel()
+
+        job = Job(self, description, key)
+        job.callbacks = (on_done, on_error, on_progress)
+
+        job.future = self._threads.submit(self._run, job, func, args, kwargs)
+        job.future.add_done_callback(lambda future: self._events.put(('done', job)))
+
+        self._jobs.append(job)
+        self._notify_status()
+        self._schedule_poll()
+        return job
+
+    @staticmethod
+    def _run(job, func, args, kwargs):
+        job.check_cancelled()
+        return func(job, *args, **kwargs)
+
+    @property
+    def busy(self):
+        return bool(self._jobs)
+
+    def cancel_all(self):
+        for job in list(self._jobs):
+            job.cancel()
+
+    def shutdown(self):
+        """Cancel every job and stop the pool without waiting for running jobs"""
+        self.cancel_all()
+        self._threads.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == 'progress':
+                _, job, fraction, message = event
+                on_progress = job.callbacks[2]
+                if on_progress and not job.cancelled:
+                    on_progress(fraction, message)
+            else:
+                self._finish(event[1])
+
+        if self._jobs:
+            self._schedule_poll()
+
+    def _finish(self, job):
+        if job in self._jobs:
+            self._jobs.remove(job)
+        on_done, on_error, _ = job.callbacks
+
+        if not job.cancelled:
+            try:
+                result = job.future.result()
+            except JobCancelled:
+                pass
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+            else:
+                if on_done:
+                    on_done(result)
+        self._notify_status()
+
+    def _notify_status(self):
+        if self.on_status:
+            active = [job for job in self._jobs if not job.cancelled]
+            self.on_status(active[-1].description if active else None)